@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Banc d'essai : extraction des champs de capteurs, ancienne méthode contre accesseurs compilés
+
+Compare, sur un lot synthétique de capteurs (objets du SDK simulés et payloads
+relus depuis le cache), l'implémentation historique de _safe_get_value aux
+accesseurs précompilés du module extraction, après avoir vérifié que les deux
+produisent exactement les mêmes valeurs.
+
+Usage : python benchmarks/bench_extraction.py [nombre_de_capteurs]
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "scripts", "exploration")
+)
+
+from extraction import compile_accessor, compile_extractor  # noqa: E402
+from response_cache import PayloadDict  # noqa: E402
+
+CHEMINS = ["id", "name", "parameter.name", "parameter.units", "absent.chemin"]
+
+
+def legacy_safe_get_value(obj, attribute_path: str, default="N/A"):
+    """Copie de l'ancienne méthode ExploratorStationsSenegal._safe_get_value (supprimée)."""
+    try:
+        path_parts = attribute_path.split(".")
+        current_obj = obj
+
+        for part in path_parts:
+            if hasattr(current_obj, part):
+                current_obj = getattr(current_obj, part)
+                if current_obj is None:
+                    return default
+            elif isinstance(current_obj, dict) and part in current_obj:
+                current_obj = current_obj[part]
+                if current_obj is None:
+                    return default
+            else:
+                return default
+
+        if current_obj == "" or current_obj == 0:
+            return current_obj
+        elif current_obj is None:
+            return default
+        else:
+            return current_obj
+
+    except Exception:
+        return default
+
+
+def generer_capteurs(nombre: int):
+    """Capteurs synthétiques : objets SDK, payloads du cache et cas dégradés."""
+    capteurs = []
+    for i in range(nombre):
+        parametre = {"id": 2, "name": "pm25", "units": "µg/m³"}
+        if i % 3 == 0:
+            capteurs.append(PayloadDict(id=i, name=f"pm25 {i}", parameter=parametre))
+        elif i % 50 == 0:
+            capteurs.append(SimpleNamespace(id=i, name=None, parameter=None))
+        else:
+            capteurs.append(
+                SimpleNamespace(id=i, name=f"pm25 {i}", parameter=parametre)
+            )
+    return capteurs
+
+
+def chronometrer(fonction, repetitions: int = 3) -> float:
+    """Meilleur temps d'exécution sur plusieurs répétitions, en secondes."""
+    meilleur = float("inf")
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        fonction()
+        meilleur = min(meilleur, time.perf_counter() - debut)
+    return meilleur
+
+
+def main():
+    nombre = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    capteurs = generer_capteurs(nombre)
+    accesseurs = [compile_accessor(chemin) for chemin in CHEMINS]
+    extraire = compile_extractor({chemin: chemin for chemin in CHEMINS})
+
+    # Vérification d'équivalence avant toute mesure
+    for capteur in capteurs:
+        attendu = [legacy_safe_get_value(capteur, chemin) for chemin in CHEMINS]
+        assert [a(capteur) for a in accesseurs] == attendu
+        assert list(extraire(capteur).values()) == attendu
+
+    def ancien():
+        for capteur in capteurs:
+            for chemin in CHEMINS:
+                legacy_safe_get_value(capteur, chemin)
+
+    def compile_par_appel():
+        for capteur in capteurs:
+            for chemin in CHEMINS:
+                compile_accessor(chemin)(capteur)
+
+    def compile_extracteur():
+        for capteur in capteurs:
+            extraire(capteur)
+
+    reference = chronometrer(ancien)
+    print(f"=== EXTRACTION DE {len(CHEMINS)} CHAMPS SUR {nombre} CAPTEURS ===")
+    print(f"_safe_get_value historique : {reference:.3f} s")
+    for libelle, fonction in [
+        ("compile_accessor (cache)  ", compile_par_appel),
+        ("compile_extractor         ", compile_extracteur),
+    ]:
+        duree = chronometrer(fonction)
+        print(f"{libelle} : {duree:.3f} s (x{reference / duree:.1f})")
+
+
+if __name__ == "__main__":
+    main()
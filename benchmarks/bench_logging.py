@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Banc d'essai : coût d'un appel de journalisation, écriture synchrone contre file d'attente
+
+Mesure le temps passé dans logger.info() par la boucle appelante avec la
+configuration historique (FileHandler et StreamHandler appelés directement)
+puis avec celle de logging_setup (QueueHandler, écriture par un QueueListener),
+pour un nombre de lignes équivalent à une exploration de grande taille.
+La console est redirigée vers un fichier temporaire pour ne pas fausser la mesure.
+
+Usage : python benchmarks/bench_logging.py [nombre_de_lignes]
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import os
+import sys
+import time
+import logging
+import tempfile
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "scripts", "exploration")
+)
+
+import logging_setup  # noqa: E402
+
+
+def mesurer(logger: logging.Logger, lignes: int) -> float:
+    """Durée (s) des appels de journalisation, vus de la boucle appelante."""
+    debut = time.perf_counter()
+    for i in range(lignes):
+        logger.info(f"Station explorée: Station {i} (ID: {i})")
+    return time.perf_counter() - debut
+
+
+def reinitialiser_racine():
+    racine = logging.getLogger()
+    for handler in list(racine.handlers):
+        racine.removeHandler(handler)
+        handler.close()
+
+
+def main():
+    lignes = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    logger = logging.getLogger("bench_logging")
+
+    with tempfile.TemporaryDirectory() as repertoire:
+        console = open(os.path.join(repertoire, "console.txt"), "w")
+        stderr, sys.stderr = sys.stderr, console
+        try:
+            logging.basicConfig(
+                level=logging.INFO,
+                format=logging_setup.FORMAT_TEXTE,
+                handlers=[
+                    logging.FileHandler(
+                        os.path.join(repertoire, "synchrone.log"), encoding="utf-8"
+                    ),
+                    logging.StreamHandler(),
+                ],
+            )
+            synchrone = mesurer(logger, lignes)
+            reinitialiser_racine()
+
+            logging_setup.configure_logging(
+                os.path.join(repertoire, "file.log"), level="INFO", phase_levels={}
+            )
+            file_attente = mesurer(logger, lignes)
+            debut = time.perf_counter()
+            logging_setup.stop_logging()
+            vidage = time.perf_counter() - debut
+        finally:
+            sys.stderr = stderr
+            console.close()
+
+    print(f"{lignes} lignes journalisées")
+    print(
+        f"  écriture synchrone : {synchrone:.3f} s ({synchrone / lignes * 1e6:.1f} µs/ligne)"
+    )
+    print(
+        f"  file d'attente     : {file_attente:.3f} s "
+        f"({file_attente / lignes * 1e6:.1f} µs/ligne), "
+        f"puis {vidage:.3f} s de vidage en tâche de fond"
+    )
+    print(f"  gain pour la boucle appelante : x{synchrone / file_attente:.1f}")
+
+
+if __name__ == "__main__":
+    main()
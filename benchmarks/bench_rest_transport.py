@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Banc d'essai : décodage d'une page de mesures, SDK openaq contre transport REST
+
+Une même page JSON de mesures horaires (format de l'API v3) est servie par un
+transport factice au client OpenAQ du SDK et au RestClient ; les mesures
+aplaties par MeasurementCollector._parse_measurement doivent être identiques,
+puis le temps de décodage de chaque client est comparé.
+
+Usage : python benchmarks/bench_rest_transport.py [mesures_par_page] [pages]
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import http.client
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "scripts", "exploration")
+)
+
+from openaq import OpenAQ  # noqa: E402
+from openaq.core.transport import Response  # noqa: E402
+
+from measurement_collector import MeasurementCollector  # noqa: E402
+from rest_transport import DECODEUR_JSON, RestClient  # noqa: E402
+
+CLE_API = "0" * 64
+CAPTEUR = {
+    "capteur_id": 1,
+    "station_id": 1,
+    "parametre_nom": "pm25",
+    "unite_mesure": "µg/m³",
+}
+
+
+def generer_page(nombre: int) -> bytes:
+    """Page de mesures horaires au format de l'API v3 (clés camelCase)."""
+    parametre = {"id": 2, "name": "pm25", "units": "µg/m³", "displayName": "PM2.5"}
+    resultats = []
+    for i in range(nombre):
+        debut = f"2025-01-{1 + i // 24 % 28:02d}T{i % 24:02d}:00:00Z"
+        resultats.append(
+            {
+                "value": 10.0 + i % 50,
+                "flagInfo": {"hasFlags": False},
+                "parameter": parametre,
+                "period": {
+                    "label": "1hour",
+                    "interval": "01:00:00",
+                    "datetimeFrom": {"utc": debut, "local": debut},
+                    "datetimeTo": {"utc": debut, "local": debut},
+                },
+                "coordinates": None,
+                "summary": None,
+                "coverage": {
+                    "expectedCount": 1,
+                    "expectedInterval": "01:00:00",
+                    "observedCount": 1,
+                    "observedInterval": "01:00:00",
+                    "percentComplete": 100.0,
+                    "percentCoverage": 100.0,
+                    "datetimeFrom": None,
+                    "datetimeTo": None,
+                },
+            }
+        )
+    meta = {"name": "openaq-api", "website": "/", "page": 1, "limit": nombre}
+    return json.dumps(
+        {"meta": {**meta, "found": nombre}, "results": resultats}
+    ).encode()
+
+
+class TransportFactice:
+    """Transport renvoyant toujours la même page, sans réseau."""
+
+    def __init__(self, corps: bytes):
+        self.corps = corps
+        # Quota illimité : le SDK ne doit jamais se mettre en attente
+        self.en_tetes = (
+            b"Content-Type: application/json\r\n"
+            b"x-ratelimit-limit: 1000000\r\n"
+            b"x-ratelimit-remaining: 1000000\r\n"
+            b"x-ratelimit-reset: 60\r\n\r\n"
+        )
+
+    def send_request(self, method, url, params, headers):
+        return Response(
+            200, self.corps, http.client.parse_headers(io.BytesIO(self.en_tetes))
+        )
+
+    def close(self):
+        pass
+
+
+def chronometrer(fonction, repetitions: int = 3) -> float:
+    """Meilleur temps d'exécution sur plusieurs répétitions, en secondes."""
+    meilleur = float("inf")
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        fonction()
+        meilleur = min(meilleur, time.perf_counter() - debut)
+    return meilleur
+
+
+def main():
+    par_page = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    pages = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    transport = TransportFactice(generer_page(par_page))
+    clients = {
+        "SDK openaq": OpenAQ(api_key=CLE_API, _transport=transport),
+        f"REST ({DECODEUR_JSON})": RestClient(
+            CLE_API, "https://api.openaq.org/v3/", transport
+        ),
+    }
+    aplatir = MeasurementCollector._parse_measurement
+
+    def collecter(client):
+        lignes = []
+        for page in range(1, pages + 1):
+            reponse = client.measurements.list(1, data="hours", page=page)
+            lignes.extend(aplatir(None, m, CAPTEUR) for m in reponse.results)
+        return lignes
+
+    # Vérification d'équivalence avant toute mesure
+    resultats = [collecter(client) for client in clients.values()]
+    assert all(r == resultats[0] for r in resultats[1:])
+
+    print(f"=== DÉCODAGE DE {pages} PAGES DE {par_page} MESURES ===")
+    reference = None
+    for libelle, client in clients.items():
+        duree = chronometrer(lambda: collecter(client))
+        reference = reference or duree
+        print(f"{libelle:<16} : {duree:.3f} s (x{reference / duree:.1f})")
+
+
+if __name__ == "__main__":
+    main()
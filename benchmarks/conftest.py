@@ -0,0 +1,68 @@
+"""
+Configuration commune de la suite pytest-benchmark du pipeline d'exploration
+
+Fournit des jeux de stations synthétiques de tailles croissantes (générés par
+le MockDataset du serveur simulé, au format de l'API v3) servis page par page,
+sans réseau ni quota, par le client en mémoire de tests/client_factice.py. Les
+résultats sauvegardés (--benchmark-save / --benchmark-autosave) sont rangés dans
+benchmarks/baselines quel que soit le répertoire de lancement.
+
+Variables d'environnement :
+- BENCH_SIZES : tailles des jeux de stations, ex: "10,1000" (défaut :
+  10,100,1000,10000,100000)
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import os
+import sys
+import logging
+
+import pytest
+
+REPERTOIRE_SCRIPTS = os.path.join(
+    os.path.dirname(__file__), "..", "scripts", "exploration"
+)
+REPERTOIRE_TESTS = os.path.join(os.path.dirname(__file__), "..", "tests")
+REPERTOIRE_REFERENCES = os.path.join(os.path.dirname(__file__), "baselines")
+STOCKAGE_PAR_DEFAUT = "file://./.benchmarks"
+
+sys.path.insert(0, REPERTOIRE_SCRIPTS)
+sys.path.append(REPERTOIRE_TESTS)
+
+from client_factice import JeuSynthetique, nouvel_explorateur  # noqa: E402, F401
+
+TAILLES = [
+    int(taille)
+    for taille in os.getenv("BENCH_SIZES", "10,100,1000,10000,100000").split(",")
+    if taille.strip()
+]
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """Range les références dans benchmarks/baselines sauf --benchmark-storage explicite."""
+    if getattr(config.option, "benchmark_storage", None) == STOCKAGE_PAR_DEFAUT:
+        config.option.benchmark_storage = "file://" + os.path.abspath(
+            REPERTOIRE_REFERENCES
+        )
+
+    # Les journaux par station fausseraient les mesures (sortie console)
+    logging.disable(logging.WARNING)
+
+
+@pytest.fixture(scope="session", params=TAILLES, ids=lambda taille: f"{taille}")
+def jeu(request) -> JeuSynthetique:
+    """Jeu de stations d'une taille donnée, construit une seule fois par session."""
+    return JeuSynthetique(request.param)
+
+
+@pytest.fixture(scope="session")
+def explorateur_rempli(jeu):
+    """Explorateur dont stations et capteurs ont déjà été découverts."""
+    explorer = nouvel_explorateur(jeu)
+    explorer.discover_senegal_stations()
+    for station in explorer.stations_data:
+        explorer.explore_station_sensors(station["station_id"], station["nom"])
+    return explorer
@@ -0,0 +1,111 @@
+"""
+Budget de démarrage de la CLI d'exploration (python -X importtime)
+
+L'explorateur est lancé par cron et par des contrôles de santé : sur une
+exécution servie par le cache, le démarrage de l'interpréteur et les imports
+représentent l'essentiel du temps. Ces tests vérifient, dans un processus
+neuf, que :
+- importer openaq_explorer ou measurement_collector ne charge aucune
+  dépendance lourde (SDK OpenAQ, python-dotenv, pandas, pyarrow, anyio...) ;
+- l'import ne crée aucun fichier journal dans le répertoire courant ;
+- le temps d'import cumulé (meilleur de plusieurs lancements) reste sous
+  le budget.
+
+Variables d'environnement :
+- IMPORT_BUDGET_MS : budget du temps d'import cumulé en millisecondes (120)
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import os
+import sys
+import subprocess
+from typing import Dict
+
+import pytest
+
+from conftest import REPERTOIRE_SCRIPTS
+
+# Modules à ne charger que sur les chemins qui en ont besoin
+MODULES_DIFFERES = (
+    "openaq",
+    "dotenv",
+    "pandas",
+    "pyarrow",
+    "anyio",
+    "httpx",
+    "orjson",
+    "psutil",
+    "prometheus_client",
+    "psycopg",
+    "redis",
+)
+
+MODULES_CLI = ("openaq_explorer", "measurement_collector")
+
+LANCEMENTS = 5
+
+
+def _environnement() -> Dict[str, str]:
+    env = dict(os.environ, PYTHONPATH=os.path.abspath(REPERTOIRE_SCRIPTS))
+    # Le bytecode doit être en cache : seul l'import est mesuré, pas la compilation
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def importtime(module: str, cwd: str) -> Dict[str, int]:
+    """
+    Importe module dans un interpréteur neuf avec -X importtime.
+
+    Returns:
+        Dict[str, int]: temps d'import cumulé (µs) de chaque module chargé.
+    """
+    resultat = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd,
+        env=_environnement(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumuls = {}
+    for ligne in resultat.stderr.splitlines():
+        if not ligne.startswith("import time:") or "cumulative" in ligne:
+            continue
+        _, cumul, nom = ligne[len("import time:") :].split("|")
+        cumuls[nom.strip()] = int(cumul)
+    return cumuls
+
+
+@pytest.mark.parametrize("module", MODULES_CLI)
+def test_import_sans_dependances_lourdes(module, tmp_path):
+    charges = importtime(module, str(tmp_path))
+
+    assert module in charges
+    lourds = sorted(nom for nom in charges if nom.split(".")[0] in MODULES_DIFFERES)
+    assert not lourds, f"imports à différer : {lourds}"
+    # Le journal n'est configuré que par main()
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.benchmark(group="demarrage")
+@pytest.mark.parametrize("module", MODULES_CLI)
+def test_import_budget(benchmark, module, tmp_path):
+    budget_ms = float(os.getenv("IMPORT_BUDGET_MS", "120"))
+    importtime(module, str(tmp_path))  # mise en cache du bytecode
+
+    # Durée mesurée : démarrage complet du processus (interpréteur compris)
+    cumuls = benchmark.pedantic(
+        importtime, args=(module, str(tmp_path)), rounds=LANCEMENTS
+    )
+    meilleur_ms = (
+        min(importtime(module, str(tmp_path))[module] for _ in range(LANCEMENTS)) / 1000
+    )
+    benchmark.extra_info["import_cumule_ms"] = round(meilleur_ms, 1)
+
+    assert module in cumuls
+    assert meilleur_ms <= budget_ms, (
+        f"import de {module} : {meilleur_ms:.1f} ms pour un budget "
+        f"de {budget_ms:.0f} ms (python -X importtime -c 'import {module}')"
+    )
@@ -0,0 +1,98 @@
+"""
+Bancs d'essai pytest-benchmark du pipeline d'exploration
+
+Chaque étape coûteuse de l'explorateur est mesurée sur des parcs synthétiques
+de 10 à 100 000 stations (voir conftest.py) :
+- discover_senegal_stations : pagination et conversion des stations
+- explore_station_sensors : extraction des capteurs de chaque station
+- _get_unique_parameters et _analyze_* : agrégations du résumé
+- export_results : exports JSON, CSV, Parquet et rapport
+
+Usage (depuis la racine du dépôt) :
+    pytest benchmarks --benchmark-autosave
+        mesure et enregistre une référence JSON dans benchmarks/baselines
+    pytest benchmarks --benchmark-compare --benchmark-compare-fail=mean:20%
+        compare à la dernière référence et échoue si une moyenne régresse de 20 %
+    BENCH_SIZES=10,1000 pytest benchmarks
+        limite les tailles de parc mesurées
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import pytest
+
+from conftest import nouvel_explorateur
+
+
+def _tours(taille: int) -> int:
+    """Nombre de répétitions : les grands parcs ne sont mesurés qu'une ou deux fois."""
+    if taille <= 1000:
+        return 5
+    if taille <= 10000:
+        return 3
+    return 1
+
+
+@pytest.mark.benchmark(group="decouverte")
+def test_discover_senegal_stations(benchmark, jeu):
+    stations = benchmark.pedantic(
+        lambda explorer: explorer.discover_senegal_stations(),
+        setup=lambda: ((nouvel_explorateur(jeu),), {}),
+        rounds=_tours(jeu.taille),
+    )
+    assert len(stations) == jeu.taille
+
+
+@pytest.mark.benchmark(group="capteurs")
+def test_explore_station_sensors(benchmark, jeu):
+    stations = jeu.stations()
+
+    def explorer_capteurs(explorer):
+        for station in stations:
+            explorer.explore_station_sensors(station["station_id"], station["nom"])
+        return explorer.sensors_data
+
+    capteurs = benchmark.pedantic(
+        explorer_capteurs,
+        setup=lambda: ((nouvel_explorateur(jeu),), {}),
+        rounds=_tours(jeu.taille),
+    )
+    assert len(capteurs) == sum(len(c) for c in jeu.capteurs.values())
+
+
+@pytest.mark.benchmark(group="agregations")
+def test_get_unique_parameters(benchmark, explorateur_rempli):
+    parametres = benchmark(explorateur_rempli._get_unique_parameters)
+    assert parametres
+
+
+@pytest.mark.benchmark(group="agregations")
+def test_analyze_geographic_distribution(benchmark, explorateur_rempli):
+    repartition = benchmark(explorateur_rempli._analyze_geographic_distribution)
+    assert repartition["stations_avec_coordonnees"] == len(
+        explorateur_rempli.stations_data
+    )
+
+
+@pytest.mark.benchmark(group="agregations")
+def test_analyze_data_timespan(benchmark, explorateur_rempli):
+    periode = benchmark(explorateur_rempli._analyze_data_timespan)
+    assert periode["stations_avec_donnees_temporelles"] == len(
+        explorateur_rempli.stations_data
+    )
+
+
+@pytest.mark.benchmark(group="export")
+def test_export_results(benchmark, explorateur_rempli, tmp_path, monkeypatch):
+    # Exports dans un répertoire temporaire, sans chargement PostgreSQL
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+
+    benchmark.pedantic(
+        explorateur_rempli.export_results,
+        args=("bench",),
+        warmup_rounds=1,
+        rounds=_tours(len(explorateur_rempli.stations_data)),
+    )
+    assert any(tmp_path.glob("bench_stations_*.csv"))
@@ -0,0 +1,345 @@
+"""
+Pool de clients OpenAQ partagés au sein d'un même processus
+
+Chaque explorateur construisait son propre client OpenAQ et le fermait en fin
+d'exploration : les connexions HTTPS (et leurs poignées de main TLS, coûteuses
+sur la liaison montante de Dakar) n'étaient jamais réutilisées d'une exécution
+à l'autre. Le pool conserve un client par clé API, tous adossés à un unique
+transport HTTP dont la taille et la durée de vie des connexions keep-alive sont
+configurables. Les explorateurs et les collectes d'un même processus empruntent
+le client (acquire) puis le rendent (release) sans fermer les connexions ; elles
+ne sont fermées qu'à l'arrêt du processus.
+
+Paramètres (variables d'environnement) :
+- HTTP_POOL_SIZE : nombre maximal de connexions simultanées (20 par défaut)
+- HTTP_KEEPALIVE_CONNECTIONS : connexions inactives conservées par hôte (10)
+- HTTP_KEEPALIVE_EXPIRY : durée de vie d'une connexion inactive, en secondes (30)
+- HTTP_CONNECT_TIMEOUT / HTTP_READ_TIMEOUT : délais en secondes (5 et 8)
+- OPENAQ_TRANSPORT : "sdk" (objets du SDK, par défaut) ou "rest" (client REST
+  léger de rest_transport, sans désérialisation en objets)
+- USE_SAMPLE_DATA / SAMPLE_DATA_ONLY / SAMPLE_DATA_RECORD : enregistrement et
+  rejeu des réponses sur disque (voir replay_transport)
+- OPENAQ_BASE_URL : URL de l'API (ex: serveur simulé http://127.0.0.1:8765/v3/) ;
+  une URL http:// utilise un transport HTTP simple au lieu de celui du SDK
+
+Le SDK openaq 1.x repose sur http.client (HTTP/1.1) : HTTP/2 n'est pas
+disponible avec ce transport.
+
+Le partage du transport s'appuie sur des détails internes du SDK (argument
+_transport du client, corps brut Response._raw_bytes), d'où la version bornée
+dans requirements.txt. Si une autre version ne les fournit plus, le pool se
+dégrade avec un avertissement : un transport par client, octets non comptés.
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import os
+import atexit
+import inspect
+import logging
+import threading
+from typing import Any, Dict, Mapping, Optional, Tuple
+from urllib.parse import urlencode, urlparse
+
+logger = logging.getLogger(__name__)
+
+# URL de l'API OpenAQ v3 (identique à la valeur par défaut du SDK)
+URL_API_OPENAQ = "https://api.openaq.org/v3/"
+
+TRANSPORTS_CLIENT = ("sdk", "rest")
+
+
+class PlainHttpTransport:
+    """
+    Transport HTTP sans TLS pour les serveurs locaux (API simulée).
+
+    Le transport du SDK n'ouvre que des connexions HTTPS. Celui-ci garde une
+    connexion keep-alive par thread et par hôte, et valide les réponses comme
+    le SDK (exceptions OpenAQ pour les codes 4xx/5xx).
+    """
+
+    def __init__(self, timeout: Optional[float] = 8.0):
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+
+    def _connection(self, host: str, fresh: bool = False):
+        connections = getattr(self._local, "connections", None)
+        if connections is None:
+            connections = self._local.connections = {}
+        if fresh or host not in connections:
+            import http.client
+
+            if host in connections:
+                connections[host].close()
+            connections[host] = http.client.HTTPConnection(host, timeout=self.timeout)
+            with self._lock:
+                self._connections.append(connections[host])
+        return connections[host]
+
+    def send_request(self, method, url, params, headers: Mapping[str, str]):
+        import http.client
+
+        from openaq.core.transport import Response, check_response
+
+        parsed = urlparse(url)
+        query = urlencode(
+            {
+                k: str(v).lower() if isinstance(v, bool) else v
+                for k, v in (params or {}).items()
+            }
+        )
+        path = (parsed.path or "/") + (f"?{query}" if query else "")
+
+        for attempt in range(2):
+            connection = self._connection(parsed.netloc, fresh=attempt > 0)
+            try:
+                connection.request(method.upper(), path, headers=dict(headers))
+                raw = connection.getresponse()
+                return check_response(Response(raw.status, raw.read(), raw.msg))
+            except (OSError, http.client.HTTPException):
+                # Connexion keep-alive fermée par le serveur : une seule reprise
+                if attempt:
+                    raise
+
+    def close(self):
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+
+
+class CountingTransport:
+    """Compte les réponses et les octets reçus par le transport commun du pool."""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self._lock = threading.Lock()
+        self.responses = 0
+        self.bytes_received = 0
+        self._size_warning = False
+
+    def send_request(self, method, url, params, headers):
+        response = self.inner.send_request(method, url, params, headers)
+        raw = getattr(response, "_raw_bytes", None)
+        with self._lock:
+            self.responses += 1
+            if raw is not None:
+                self.bytes_received += len(raw)
+            elif not self._size_warning:
+                self._size_warning = True
+                logger.warning(
+                    "Réponses du SDK sans _raw_bytes (version d'openaq non testée) : "
+                    "octets reçus non comptés"
+                )
+        return response
+
+    def close(self):
+        self.inner.close()
+
+
+class OpenAQClientPool:
+    """
+    Registre thread-safe de clients OpenAQ partageant un même transport HTTP.
+
+    Un client est créé à la première demande pour un couple (clé API, URL) puis
+    réutilisé ; le nombre d'emprunts en cours est suivi pour les statistiques.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 8.0,
+        client_type: str = "sdk",
+        base_url: str = URL_API_OPENAQ,
+    ):
+        """
+        Args:
+            max_connections: Connexions HTTPS simultanées, tous hôtes confondus
+            max_keepalive_connections: Connexions inactives conservées par hôte
+            keepalive_expiry: Durée (s) au-delà de laquelle une connexion inactive est fermée
+            connect_timeout: Délai (s) d'établissement d'une connexion
+            read_timeout: Délai (s) de lecture d'une réponse
+            client_type: "sdk" (client OpenAQ) ou "rest" (RestClient)
+            base_url: URL de l'API utilisée par défaut par acquire()
+        """
+        if client_type not in TRANSPORTS_CLIENT:
+            raise ValueError(
+                f"Transport OpenAQ inconnu: {client_type} "
+                f"(disponibles: {', '.join(TRANSPORTS_CLIENT)})"
+            )
+
+        self.client_type = client_type
+        self.base_url = base_url
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+
+        self._lock = threading.Lock()
+        self._transport = None
+        self._clients: Dict[Tuple[str, str], Any] = {}
+        self._borrowed: Dict[int, int] = {}
+
+        self.clients_created = 0
+        self.acquisitions = 0
+        self.reuses = 0
+
+    @classmethod
+    def from_env(cls) -> "OpenAQClientPool":
+        """Construit un pool à partir des variables HTTP_* (valeurs par défaut sinon)."""
+        return cls(
+            max_connections=int(os.getenv("HTTP_POOL_SIZE", 20)),
+            max_keepalive_connections=int(os.getenv("HTTP_KEEPALIVE_CONNECTIONS", 10)),
+            keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY", 30.0)),
+            connect_timeout=float(os.getenv("HTTP_CONNECT_TIMEOUT", 5.0)),
+            read_timeout=float(os.getenv("HTTP_READ_TIMEOUT", 8.0)),
+            client_type=os.getenv("OPENAQ_TRANSPORT", "sdk").strip().lower(),
+            base_url=os.getenv("OPENAQ_BASE_URL") or URL_API_OPENAQ,
+        )
+
+    def _create_http_transport(self):
+        """Transport HTTP du SDK, dimensionné selon les limites du pool."""
+        if urlparse(self.base_url).scheme == "http":
+            logger.info(f"API OpenAQ servie en HTTP simple par {self.base_url}")
+            return PlainHttpTransport(timeout=self.read_timeout)
+
+        from openaq.core.transport import Limits, Timeout, Transport
+
+        return Transport(
+            timeout=Timeout(self.connect_timeout, read=self.read_timeout),
+            limits=Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+        )
+
+    def _get_transport(self):
+        """Crée à la demande le transport commun à tous les clients."""
+        if self._transport is None:
+            from replay_transport import transport_from_env
+
+            self._transport = CountingTransport(
+                transport_from_env(self._create_http_transport)
+            )
+        return self._transport
+
+    def _create_client(self, api_key: str, base_url: str):
+        """Construit un client du type configuré sur le transport commun."""
+        if self.client_type == "rest":
+            from rest_transport import RestClient
+
+            return RestClient(api_key, base_url, self._get_transport())
+
+        from openaq import OpenAQ
+
+        # Le limiteur intégré du SDK (auto_wait) reste actif : il n'attend que
+        # si l'API annonce un quota restant nul, cas que TokenBucketRateLimiter
+        # anticipe déjà (voir rate_limiter)
+        if "_transport" not in inspect.signature(OpenAQ).parameters:
+            logger.warning(
+                "Le client OpenAQ n'accepte plus _transport (version d'openaq non "
+                "testée) : chaque client utilise son propre transport HTTP"
+            )
+            return OpenAQ(api_key=api_key, base_url=base_url)
+        return OpenAQ(
+            api_key=api_key, base_url=base_url, _transport=self._get_transport()
+        )
+
+    def acquire(self, api_key: str, base_url: Optional[str] = None):
+        """
+        Emprunte le client associé à une clé API, en le créant si nécessaire.
+
+        Args:
+            api_key: Clé API OpenAQ
+            base_url: URL de base de l'API (par défaut celle du pool)
+
+        Returns:
+            OpenAQ ou RestClient: Client partagé ; à rendre avec release()
+            plutôt qu'à fermer.
+        """
+        base_url = base_url or self.base_url
+        key = (api_key, base_url)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._create_client(api_key, base_url)
+                self._clients[key] = client
+                self.clients_created += 1
+                logger.debug(
+                    f"Nouveau client OpenAQ {self.client_type} "
+                    f"(pool de {self.max_connections} connexions)"
+                )
+            else:
+                self.reuses += 1
+
+            self.acquisitions += 1
+            self._borrowed[id(client)] = self._borrowed.get(id(client), 0) + 1
+            return client
+
+    def release(self, client) -> None:
+        """
+        Rend un client emprunté. Ses connexions restent ouvertes pour les
+        emprunts suivants ; un client étranger au pool est ignoré.
+        """
+        with self._lock:
+            count = self._borrowed.get(id(client))
+            if count is None:
+                return
+            if count > 1:
+                self._borrowed[id(client)] = count - 1
+            else:
+                del self._borrowed[id(client)]
+
+    def close(self) -> None:
+        """Ferme toutes les connexions et oublie les clients (fin de processus)."""
+        with self._lock:
+            if self._transport is not None:
+                self._transport.close()
+                self._transport = None
+            self._clients.clear()
+            self._borrowed.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Retourne les compteurs du pool pour le résumé d'exploration."""
+        with self._lock:
+            stats = {
+                "transport": self.client_type,
+                "clients": len(self._clients),
+                "clients_crees": self.clients_created,
+                "emprunts": self.acquisitions,
+                "reutilisations": self.reuses,
+                "emprunts_en_cours": sum(self._borrowed.values()),
+                "connexions_max": self.max_connections,
+                "connexions_keepalive": self.max_keepalive_connections,
+            }
+            if self._transport is not None:
+                stats["reponses_http"] = self._transport.responses
+                stats["octets_recus"] = self._transport.bytes_received
+                if hasattr(self._transport.inner, "stats"):
+                    stats["fixtures"] = self._transport.inner.stats()
+            return stats
+
+
+_shared_pool: Optional[OpenAQClientPool] = None
+_shared_lock = threading.Lock()
+
+
+def shared_pool() -> OpenAQClientPool:
+    """
+    Retourne le pool commun au processus, créé à la première utilisation selon
+    les variables HTTP_* et fermé automatiquement à la sortie de l'interpréteur.
+    """
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is None:
+            _shared_pool = OpenAQClientPool.from_env()
+            atexit.register(_shared_pool.close)
+        return _shared_pool
@@ -0,0 +1,160 @@
+"""
+Requêtes de découverte des stations OpenAQ : pays, zones rectangulaires et rayons
+
+Ce module décrit les zones à explorer sous forme de requêtes indépendantes
+(code ISO, bounding box ou point + rayon) que l'explorateur exécute en parallèle
+avant de fusionner et dédoublonner les stations. Il permet par exemple de suivre
+les épisodes de poussière transfrontaliers venant de Mauritanie et du Mali en
+une seule exécution.
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+# Pays d'Afrique de l'Ouest : membres et anciens membres de la CEDEAO, plus la Mauritanie
+CODES_ISO_AFRIQUE_OUEST = (
+    "BF",
+    "BJ",
+    "CI",
+    "CV",
+    "GH",
+    "GM",
+    "GN",
+    "GW",
+    "LR",
+    "ML",
+    "MR",
+    "NE",
+    "NG",
+    "SL",
+    "SN",
+    "TG",
+)
+
+# Rayon maximal accepté par l'API OpenAQ v3 pour les recherches par coordonnées
+RAYON_MAX_METRES = 25000
+
+
+@dataclass(frozen=True)
+class DiscoveryQuery:
+    """
+    Requête de découverte des stations : un seul critère géographique par requête.
+
+    Attributes:
+        iso: Code ISO 3166-1 alpha-2 du pays (ex: "SN")
+        bbox: Zone rectangulaire (lon_min, lat_min, lon_max, lat_max) en WGS84
+        coordinates: Centre d'une recherche par rayon (latitude, longitude)
+        radius: Rayon de recherche en mètres (25 000 maximum)
+    """
+
+    iso: Optional[str] = None
+    bbox: Optional[Tuple[float, float, float, float]] = None
+    coordinates: Optional[Tuple[float, float]] = None
+    radius: Optional[int] = None
+
+    def __post_init__(self):
+        criteres = [
+            self.iso is not None,
+            self.bbox is not None,
+            self.coordinates is not None,
+        ]
+        if sum(criteres) != 1:
+            raise ValueError(
+                "Une requête doit définir exactement un critère : iso, bbox ou coordinates"
+            )
+        if (self.coordinates is None) != (self.radius is None):
+            raise ValueError("coordinates et radius doivent être fournis ensemble")
+        if self.radius is not None and not 0 < self.radius <= RAYON_MAX_METRES:
+            raise ValueError(
+                f"Le rayon doit être compris entre 1 et {RAYON_MAX_METRES} mètres"
+            )
+
+    @classmethod
+    def pays(cls, iso: str) -> "DiscoveryQuery":
+        """Requête couvrant tout un pays."""
+        return cls(iso=iso.upper())
+
+    @classmethod
+    def zone(
+        cls, lon_min: float, lat_min: float, lon_max: float, lat_max: float
+    ) -> "DiscoveryQuery":
+        """Requête couvrant une zone rectangulaire."""
+        return cls(bbox=(lon_min, lat_min, lon_max, lat_max))
+
+    @classmethod
+    def rayon(cls, latitude: float, longitude: float, radius: int) -> "DiscoveryQuery":
+        """Requête couvrant un cercle autour d'un point."""
+        return cls(coordinates=(latitude, longitude), radius=int(radius))
+
+    @property
+    def label(self) -> str:
+        """Description courte de la requête pour les logs et le résumé."""
+        if self.iso is not None:
+            return f"iso={self.iso}"
+        if self.bbox is not None:
+            return "bbox=" + ",".join(str(v) for v in self.bbox)
+        return (
+            f"rayon={self.radius}m autour de "
+            f"{self.coordinates[0]},{self.coordinates[1]}"
+        )
+
+    def to_filters(self) -> Dict[str, Any]:
+        """Retourne les filtres correspondants pour locations.list."""
+        if self.iso is not None:
+            return {"iso": self.iso}
+        if self.bbox is not None:
+            return {"bbox": self.bbox}
+        return {"coordinates": self.coordinates, "radius": self.radius}
+
+
+def parse_queries(spec: str) -> List[DiscoveryQuery]:
+    """
+    Interprète une liste de requêtes séparées par des points-virgules.
+
+    Formats acceptés :
+    - "SN" ou "SN,MR,ML" : codes ISO de pays
+    - "AFRIQUE_OUEST" : tous les pays de CODES_ISO_AFRIQUE_OUEST
+    - "bbox:lon_min,lat_min,lon_max,lat_max" : zone rectangulaire
+    - "rayon:latitude,longitude,metres" : cercle autour d'un point
+
+    Exemple : "SN,MR;bbox:-17.6,14.6,-17.1,14.9;rayon:16.5,-15.0,25000"
+
+    Args:
+        spec: Spécification textuelle, typiquement la variable DISCOVERY_QUERIES
+
+    Returns:
+        List[DiscoveryQuery]: Requêtes dans l'ordre de la spécification.
+    """
+    queries = []
+
+    for part in (p.strip() for p in spec.split(";")):
+        if not part:
+            continue
+
+        kind, _, values = part.partition(":")
+        kind = kind.strip().lower()
+
+        if kind == "bbox":
+            queries.append(DiscoveryQuery.zone(*[float(v) for v in values.split(",")]))
+        elif kind == "rayon":
+            latitude, longitude, radius = [float(v) for v in values.split(",")]
+            queries.append(DiscoveryQuery.rayon(latitude, longitude, int(radius)))
+        elif part.upper() == "AFRIQUE_OUEST":
+            queries.extend(DiscoveryQuery.pays(iso) for iso in CODES_ISO_AFRIQUE_OUEST)
+        else:
+            queries.extend(
+                DiscoveryQuery.pays(iso.strip())
+                for iso in part.split(",")
+                if iso.strip()
+            )
+
+    return queries
+
+
+def queries_from_env() -> List[DiscoveryQuery]:
+    """Construit les requêtes depuis DISCOVERY_QUERIES (par défaut le Sénégal)."""
+    return parse_queries(os.getenv("DISCOVERY_QUERIES", "SN"))
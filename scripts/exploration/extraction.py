@@ -0,0 +1,97 @@
+"""
+Accesseurs précompilés pour extraire les champs des objets de l'API OpenAQ
+
+Les chemins d'attributs ("id", "parameter.name"...) sont analysés une seule
+fois puis transformés en fonctions d'accès mises en cache. Les extractions
+répétées pour chaque capteur n'ont plus à découper le chemin ni à tester
+hasattr puis getattr à chaque appel.
+
+La sémantique est celle de l'ancienne méthode _safe_get_value : attribut
+d'objet d'abord, puis clé de dictionnaire ; une valeur None, un élément absent
+ou une exception donnent la valeur par défaut.
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import logging
+from functools import lru_cache
+from typing import Any, Callable, Dict
+
+from response_cache import PayloadDict
+
+logger = logging.getLogger(__name__)
+
+# Sentinelle distinguant un attribut absent d'un attribut valant None
+_ABSENT = object()
+
+# Types pour lesquels obj.cle équivaut exactement à obj.get(cle) dès que la clé
+# ne masque pas une méthode de dict : dictionnaires bruts (paramètres des
+# capteurs) et payloads relus depuis le cache
+_TYPES_DICTIONNAIRE = (dict, PayloadDict)
+
+
+@lru_cache(maxsize=None)
+def compile_accessor(attribute_path: str) -> Callable[..., Any]:
+    """
+    Compile un chemin d'attribut en fonction d'accès.
+
+    Args:
+        attribute_path: Chemin pointé, ex: "parameter.name"
+
+    Returns:
+        Callable: accessor(obj, default="N/A") retournant la valeur ou default.
+    """
+    # Pour chaque segment : peut-on lire directement la clé d'un dictionnaire ?
+    parts = tuple(
+        (part, not hasattr(PayloadDict, part)) for part in attribute_path.split(".")
+    )
+
+    def accessor(obj, default="N/A"):
+        current = obj
+        try:
+            for part, lecture_directe in parts:
+                if lecture_directe and type(current) in _TYPES_DICTIONNAIRE:
+                    value = current.get(part, _ABSENT)
+                    if value is _ABSENT:
+                        return default
+                else:
+                    value = getattr(current, part, _ABSENT)
+                if value is _ABSENT:
+                    if isinstance(current, dict) and part in current:
+                        value = current[part]
+                    else:
+                        return default
+                if value is None:
+                    return default
+                current = value
+            return current
+        except Exception as e:
+            logger.debug(f"Erreur d'extraction pour {attribute_path}: {e}")
+            return default
+
+    accessor.__name__ = f"accessor_{attribute_path.replace('.', '_')}"
+    return accessor
+
+
+def compile_extractor(
+    fields: Dict[str, str], default="N/A"
+) -> Callable[[Any], Dict[str, Any]]:
+    """
+    Compile une correspondance champ → chemin en extracteur d'enregistrement.
+
+    Exemple : compile_extractor({"capteur_id": "id", "capteur_nom": "name"})
+
+    Args:
+        fields: Nom du champ produit → chemin d'attribut dans l'objet source
+        default: Valeur des champs introuvables
+
+    Returns:
+        Callable: extract(obj) retournant un dictionnaire avec tous les champs.
+    """
+    accessors = tuple((name, compile_accessor(path)) for name, path in fields.items())
+
+    def extract(obj) -> Dict[str, Any]:
+        return {name: accessor(obj, default) for name, accessor in accessors}
+
+    return extract
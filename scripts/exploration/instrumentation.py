@@ -0,0 +1,230 @@
+"""
+Mesures par phase de l'exploration (durée, appels API, octets, ressources)
+
+run_complete_exploration ne journalisait que des décomptes : impossible de
+savoir où une exécution nocturne lente avait passé son temps. Chaque phase
+(connexion, découverte, diagnostic, capteurs, agrégation, export) est encadrée
+par PhaseInstrumentation.phase(), qui relève :
+- la durée réelle de la phase ;
+- les appels API (relances comprises), octets reçus, relances et l'attente de
+  quota, par différence entre les compteurs cumulés du limiteur, du pool et de
+  la politique de réessai ;
+- le temps CPU du processus, sa mémoire résidente en fin de phase et le pic
+  observé par un échantillonnage psutil en tâche de fond.
+
+La durée de récupération des capteurs de chaque station est également
+collectée (moyenne, centiles, station la plus lente). Sans psutil, les mesures
+de ressources sont simplement omises.
+
+Paramètres (variables d'environnement) :
+- METRICS_SAMPLE_INTERVAL : période d'échantillonnage mémoire/CPU en secondes (0.5)
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+from logging_setup import log_phase
+
+logger = logging.getLogger(__name__)
+
+OCTETS_PAR_MO = 1024 * 1024
+
+
+def _process():
+    """Processus courant vu par psutil, ou None si psutil n'est pas installé."""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process()
+
+
+def _centile(valeurs: List[float], rang: float) -> float:
+    """Centile d'une liste triée (plus proche rang)."""
+    index = min(len(valeurs) - 1, max(0, round(rang / 100 * len(valeurs)) - 1))
+    return valeurs[index]
+
+
+class _MemorySampler:
+    """Relève la mémoire résidente maximale d'un processus pendant une phase."""
+
+    def __init__(self, process, interval: float):
+        self.process = process
+        self.interval = interval
+        self.peak_rss = process.memory_info().rss
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="echantillonnage-memoire", daemon=True
+        )
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak_rss = max(self.peak_rss, self.process.memory_info().rss)
+
+    def start(self) -> "_MemorySampler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> int:
+        self._stop.set()
+        self._thread.join()
+        self.peak_rss = max(self.peak_rss, self.process.memory_info().rss)
+        return self.peak_rss
+
+
+class PhaseInstrumentation:
+    """
+    Chronomètre les phases d'une exploration et en agrège les compteurs.
+
+    Les compteurs sont fournis par une fonction renvoyant des valeurs cumulées
+    (ex: {"appels_api": 120, "octets_recus": 5.2e6}) ; chaque phase en retient
+    la variation. Les phases s'exécutent l'une après l'autre ; les durées par
+    station peuvent en revanche être enregistrées depuis plusieurs threads.
+    """
+
+    def __init__(
+        self,
+        counters: Optional[Callable[[], Dict[str, float]]] = None,
+        sample_interval: float = 0.5,
+    ):
+        """
+        Args:
+            counters: Fonction renvoyant les compteurs cumulés à comparer
+            sample_interval: Période d'échantillonnage de la mémoire, en secondes
+        """
+        self.counters = counters or dict
+        self.sample_interval = sample_interval
+        self._process = _process()
+
+        self._lock = threading.Lock()
+        self.phases: Dict[str, Dict[str, Any]] = {}
+        self.station_durations: List[tuple] = []
+
+    @classmethod
+    def from_env(
+        cls, counters: Optional[Callable[[], Dict[str, float]]] = None
+    ) -> "PhaseInstrumentation":
+        """Construit l'instrumentation à partir de METRICS_SAMPLE_INTERVAL."""
+        return cls(
+            counters=counters,
+            sample_interval=float(os.getenv("METRICS_SAMPLE_INTERVAL", "0.5")),
+        )
+
+    def _cpu_seconds(self) -> float:
+        times = self._process.cpu_times()
+        return times.user + times.system
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Mesure le bloc encadré comme la phase name, dont les journaux suivent
+        le niveau prévu pour elle (voir logging_setup.log_phase).
+
+        Une phase répétée (ex: export appelé deux fois) cumule ses mesures. Une
+        exception est propagée après avoir été notée dans la phase.
+        """
+        debut_compteurs = self.counters()
+        sampler = None
+        if self._process is not None:
+            cpu_debut = self._cpu_seconds()
+            sampler = _MemorySampler(self._process, self.sample_interval).start()
+
+        erreur = None
+        debut = time.perf_counter()
+        try:
+            with log_phase(name):
+                yield
+        except BaseException as e:
+            erreur = type(e).__name__
+            raise
+        finally:
+            duree = time.perf_counter() - debut
+            mesures = {"duree_s": duree}
+            fin_compteurs = self.counters()
+            for cle, valeur in fin_compteurs.items():
+                mesures[cle] = valeur - debut_compteurs.get(cle, 0)
+
+            if sampler is not None:
+                pic = sampler.stop()
+                cpu = self._cpu_seconds() - cpu_debut
+                mesures["cpu_s"] = cpu
+                mesures["cpu_moyen_pct"] = round(100 * cpu / duree, 1) if duree else 0
+                mesures["memoire_rss_mo"] = round(
+                    self._process.memory_info().rss / OCTETS_PAR_MO, 1
+                )
+                mesures["memoire_pic_mo"] = round(pic / OCTETS_PAR_MO, 1)
+
+            self._record_phase(name, mesures, erreur)
+
+    def _record_phase(self, name: str, mesures: Dict[str, Any], erreur):
+        with self._lock:
+            phase = self.phases.get(name)
+            if phase is None:
+                phase = self.phases[name] = {"executions": 0}
+            phase["executions"] += 1
+            for cle, valeur in mesures.items():
+                if cle.startswith("memoire") or cle == "cpu_moyen_pct":
+                    phase[cle] = max(phase.get(cle, 0), valeur)
+                else:
+                    phase[cle] = phase.get(cle, 0) + valeur
+            if erreur:
+                phase["erreur"] = erreur
+
+        logger.info(
+            f"Phase {name}: {mesures['duree_s']:.2f}s, "
+            f"{mesures.get('appels_api', 0)} appel(s) API, "
+            f"{mesures.get('octets_recus', 0) / OCTETS_PAR_MO:.2f} Mo reçus, "
+            f"{mesures.get('relances', 0)} relance(s)"
+        )
+
+    def record_station(self, station_id, seconds: float):
+        """Enregistre la durée de récupération des capteurs d'une station."""
+        with self._lock:
+            self.station_durations.append((seconds, station_id))
+
+    def _station_stats(self) -> Dict[str, Any]:
+        if not self.station_durations:
+            return {"nombre": 0}
+        durees = sorted(duree for duree, _ in self.station_durations)
+        duree_max, station_id = max(self.station_durations)
+        return {
+            "nombre": len(durees),
+            "moyenne_s": round(sum(durees) / len(durees), 4),
+            "p50_s": round(_centile(durees, 50), 4),
+            "p95_s": round(_centile(durees, 95), 4),
+            "max_s": round(duree_max, 4),
+            "station_la_plus_lente": station_id,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Retourne les mesures de chaque phase pour le résumé d'exploration."""
+        with self._lock:
+            phases = {}
+            for name, phase in self.phases.items():
+                phases[name] = {
+                    cle: round(valeur, 3) if isinstance(valeur, float) else valeur
+                    for cle, valeur in phase.items()
+                }
+            return {
+                "phases": phases,
+                "duree_totale_s": round(
+                    sum(phase["duree_s"] for phase in self.phases.values()), 3
+                ),
+                "capteurs_par_station": self._station_stats(),
+                "psutil": self._process is not None,
+            }
+
+    def write(self, filename: str, metadata: Optional[Dict[str, Any]] = None) -> str:
+        """Écrit les mesures dans un fichier JSON et retourne son nom."""
+        document = {**(metadata or {}), **self.stats()}
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump(document, f, ensure_ascii=False, indent=2, default=str)
+        return filename
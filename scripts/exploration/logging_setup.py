@@ -0,0 +1,254 @@
+"""
+Journalisation non bloquante des explorations et collectes OpenAQ
+
+La configuration d'origine (logging.basicConfig) écrivait de façon synchrone
+dans exploration_stations.log et sur la console, depuis les boucles mêmes de
+récupération : à plusieurs milliers de stations, ces écritures apparaissaient
+dans les profils. configure_logging() installe à la place sur le logger racine
+un gestionnaire qui se contente de déposer l'enregistrement dans une file non
+bornée ; un QueueListener l'écrit dans un thread dédié (fichier et console).
+
+La verbosité se règle globalement et par phase d'exploration : les journaux
+émis dans un bloc log_phase("capteurs") (PhaseInstrumentation.phase en ouvre
+un pour chaque phase, threads anyio compris) suivent le niveau de cette phase.
+Les lignes peuvent aussi être produites au format JSON, une par enregistrement.
+
+Paramètres (variables d'environnement) :
+- LOG_LEVEL : niveau global (INFO)
+- LOG_PHASE_LEVELS : niveaux par phase, ex: "capteurs=WARNING,export=DEBUG"
+- LOG_FORMAT : text (par défaut) ou json
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import os
+import sys
+import json
+import atexit
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+FICHIER_JOURNAL = "exploration_stations.log"
+FORMAT_TEXTE = "%(asctime)s - %(levelname)s - %(message)s"
+FORMATS_JOURNAL = ("text", "json")
+
+_phase = contextvars.ContextVar("phase_journal", default=None)
+_FORMAT_EXCEPTIONS = logging.Formatter()
+
+
+@contextmanager
+def log_phase(name: str):
+    """Rattache à la phase name les journaux émis dans le bloc."""
+    jeton = _phase.set(name)
+    try:
+        yield
+    finally:
+        _phase.reset(jeton)
+
+
+def current_phase() -> Optional[str]:
+    """Phase courante des journaux, ou None hors de toute phase."""
+    return _phase.get()
+
+
+def parse_level(value) -> int:
+    """Convertit un nom de niveau ("debug", "WARNING"...) ou un entier en niveau."""
+    if isinstance(value, int):
+        return value
+    niveau = logging.getLevelName(str(value).strip().upper())
+    if not isinstance(niveau, int):
+        raise ValueError(f"Niveau de journalisation inconnu: {value}")
+    return niveau
+
+
+def parse_phase_levels(spec: str) -> Dict[str, int]:
+    """
+    Lit les niveaux par phase au format "phase=NIVEAU,phase=NIVEAU".
+
+    Exemple: "capteurs=WARNING,export=DEBUG" -> {"capteurs": 30, "export": 10}
+    """
+    niveaux = {}
+    for element in spec.split(","):
+        if not element.strip():
+            continue
+        phase, separateur, niveau = element.partition("=")
+        if not separateur:
+            raise ValueError(
+                f"Niveau de phase invalide (phase=NIVEAU attendu): {element}"
+            )
+        niveaux[phase.strip()] = parse_level(niveau)
+    return niveaux
+
+
+class PhaseLevelFilter(logging.Filter):
+    """
+    Applique le niveau de la phase courante (ou le niveau global hors phase)
+    et note la phase dans l'enregistrement (attribut phase).
+    """
+
+    def __init__(self, level: int, phase_levels: Optional[Dict[str, int]] = None):
+        super().__init__()
+        self.level = level
+        self.phase_levels = dict(phase_levels or {})
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        phase = _phase.get()
+        record.phase = phase
+        return record.levelno >= self.phase_levels.get(phase, self.level)
+
+
+class JsonFormatter(logging.Formatter):
+    """Une ligne JSON par enregistrement (horodatage UTC, niveau, phase, message)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        document = {
+            "horodatage": datetime.fromtimestamp(record.created, timezone.utc)
+            .isoformat(timespec="milliseconds")
+            .replace("+00:00", "Z"),
+            "niveau": record.levelname,
+            "logger": record.name,
+            "phase": getattr(record, "phase", None),
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            document["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            document["exception"] = record.exc_text
+        return json.dumps(document, ensure_ascii=False, default=str)
+
+
+class EnqueueHandler(logging.Handler):
+    """
+    Dépose les enregistrements dans une file, message déjà mis en forme.
+
+    Équivalent allégé de logging.handlers.QueueHandler : l'enregistrement
+    n'est ni copié ni formaté en entier dans le thread appelant, seuls le
+    message et l'éventuelle trace d'exception sont figés (leurs arguments
+    pourraient changer avant l'écriture).
+    """
+
+    def __init__(self, file_journal):
+        super().__init__()
+        self.file_journal = file_journal
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            record.msg = record.getMessage()
+            record.args = None
+            if record.exc_info:
+                record.exc_text = _FORMAT_EXCEPTIONS.formatException(record.exc_info)
+                record.exc_info = None
+            self.file_journal.put_nowait(record)
+        except Exception:
+            self.handleError(record)
+
+
+_listener = None
+_queue_handler = None
+_lock = threading.Lock()
+
+
+def _configure_console():
+    """Sortie console en UTF-8 sous Windows - approche plus douce."""
+    if sys.platform.startswith("win") and hasattr(sys.stdout, "reconfigure"):
+        try:
+            sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+            sys.stderr.reconfigure(encoding="utf-8", errors="replace")
+        except Exception:
+            # Si la reconfiguration échoue, on continue sans forcer l'UTF-8
+            pass
+
+
+def configure_logging(
+    log_file: Optional[str] = FICHIER_JOURNAL,
+    level=None,
+    phase_levels: Optional[Dict[str, int]] = None,
+    json_lines: Optional[bool] = None,
+):
+    """
+    Configure la journalisation du processus (une seule fois) : file d'attente
+    sur le logger racine, écriture du fichier et de la console en tâche de fond.
+
+    Appelée par les points d'entrée (main) plutôt qu'à l'import : un module qui
+    importe l'explorateur garde sa propre configuration du logging.
+
+    Args:
+        log_file: Fichier journal en UTF-8, ou None pour la console seule
+        level: Niveau global. Par défaut, LOG_LEVEL (INFO).
+        phase_levels: Niveaux par phase. Par défaut, LOG_PHASE_LEVELS.
+        json_lines: Lignes JSON plutôt que texte. Par défaut, LOG_FORMAT=json.
+
+    Returns:
+        QueueListener: Thread d'écriture des journaux.
+    """
+    global _listener, _queue_handler
+
+    level = parse_level(level or os.getenv("LOG_LEVEL", "INFO"))
+    if phase_levels is None:
+        phase_levels = parse_phase_levels(os.getenv("LOG_PHASE_LEVELS", ""))
+    if json_lines is None:
+        log_format = os.getenv("LOG_FORMAT", "text").strip().lower()
+        if log_format not in FORMATS_JOURNAL:
+            raise ValueError(
+                f"LOG_FORMAT invalide: {log_format} "
+                f"(valeurs possibles: {', '.join(FORMATS_JOURNAL)})"
+            )
+        json_lines = log_format == "json"
+
+    with _lock:
+        if _listener is not None:
+            return _listener
+
+        import queue
+        import logging.handlers
+
+        _configure_console()
+
+        formatter = JsonFormatter() if json_lines else logging.Formatter(FORMAT_TEXTE)
+        handlers = [logging.StreamHandler()]
+        if log_file:
+            handlers.insert(0, logging.FileHandler(log_file, encoding="utf-8"))
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        # File non bornée : un appel de journalisation ne bloque jamais
+        file_journal = queue.SimpleQueue()
+        _queue_handler = EnqueueHandler(file_journal)
+        _queue_handler.addFilter(PhaseLevelFilter(level, phase_levels))
+
+        # Le logger racine laisse passer le niveau le plus bavard ; le filtre
+        # applique ensuite celui de la phase courante
+        root = logging.getLogger()
+        root.setLevel(min([level, *phase_levels.values()]))
+        root.addHandler(_queue_handler)
+
+        _listener = logging.handlers.QueueListener(file_journal, *handlers)
+        _listener.start()
+        atexit.register(stop_logging)
+
+    logger.debug(
+        f"Journalisation asynchrone: niveau {logging.getLevelName(level)}, "
+        f"phases {phase_levels or '-'}, format {'json' if json_lines else 'text'}"
+    )
+    return _listener
+
+
+def stop_logging():
+    """Vide la file, arrête le thread d'écriture et ferme fichier et console."""
+    global _listener, _queue_handler
+
+    with _lock:
+        if _listener is None:
+            return
+        logging.getLogger().removeHandler(_queue_handler)
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = _queue_handler = None
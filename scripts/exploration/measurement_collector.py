@@ -0,0 +1,586 @@
+#!/usr/bin/env python3
+"""
+Collecte des séries temporelles de mesures des capteurs OpenAQ
+
+Ce script prolonge l'exploration : pour chaque capteur identifié dans
+sensors_data, il parcourt page par page les mesures (horaires, journalières ou
+brutes) et les transmet par blocs de taille bornée à un puits de données
+interchangeable (CSV, base de données...). De nombreux capteurs sont collectés
+en parallèle, sous le même budget de débit que l'explorateur.
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import os
+import csv
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+from sync_state import WatermarkStore, parse_timestamp
+from postgres_loader import PostgresLoader
+from parquet_export import ParquetSink
+from streaming_export import JsonLinesSink, compression_from_env
+from metrics_exporter import metrics, start_server_from_env
+
+logger = logging.getLogger(__name__)
+
+# Colonnes d'un enregistrement de mesure, dans l'ordre d'export
+CHAMPS_MESURE = [
+    "capteur_id",
+    "station_id",
+    "parametre_nom",
+    "unite_mesure",
+    "valeur",
+    "date_debut",
+    "date_fin",
+    "intervalle",
+    "couverture_pct",
+]
+
+
+class CsvSink:
+    """
+    Puits de données écrivant les mesures dans un fichier CSV, bloc par bloc.
+
+    Tout puits expose la même interface : write(records) pour un bloc de mesures
+    et close() en fin de collecte.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.rows_written = 0
+        self._file = None
+        self._writer = None
+
+    def write(self, records: List[Dict[str, Any]]):
+        """Ajoute un bloc de mesures au fichier."""
+        if self._writer is None:
+            self._file = open(self.filename, "w", encoding="utf-8", newline="")
+            self._writer = csv.DictWriter(
+                self._file, fieldnames=CHAMPS_MESURE, extrasaction="ignore"
+            )
+            self._writer.writeheader()
+
+        self._writer.writerows(records)
+        self.rows_written += len(records)
+
+    def close(self):
+        """Ferme le fichier s'il a été ouvert."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._writer = None
+
+
+class MeasurementCollector:
+    """
+    Collecteur concurrent des mesures de capteurs OpenAQ.
+
+    Le collecteur réutilise le client et la chaîne d'appel de l'explorateur
+    (limiteur de débit, relances), si bien que l'exploration et la collecte
+    partagent le même quota. Un groupe fixe de max_concurrency travailleurs
+    puise les capteurs dans une file bornée, et les pages de mesures transitent
+    par une seconde file bornée vers un unique rédacteur : lorsque le puits est
+    plus lent que l'API, les téléchargements se mettent en attente et au plus
+    queue_size + max_concurrency pages restent en mémoire, quel que soit le
+    nombre de capteurs.
+    """
+
+    def __init__(
+        self,
+        explorer,
+        sink,
+        data: str = "hours",
+        page_size: int = 1000,
+        chunk_size: int = 5000,
+        max_concurrency: int = None,
+        queue_size: int = 16,
+        watermarks: Optional[WatermarkStore] = None,
+    ):
+        """
+        Initialise le collecteur.
+
+        Args:
+            explorer: ExploratorStationsSenegal connecté (client ouvert)
+            sink: Puits de données (voir CsvSink)
+            data: Granularité des mesures : "measurements", "hours" ou "days"
+            page_size: Nombre de mesures par requête (1000 maximum)
+            chunk_size: Nombre de mesures par bloc transmis au puits
+            max_concurrency: Nombre maximal de capteurs collectés simultanément.
+                Par défaut, la variable COLLECTION_MAX_CONCURRENCY (8).
+            queue_size: Nombre maximal de pages en attente d'écriture
+            watermarks: État de synchronisation pour une collecte incrémentale.
+                Si fourni, seules les mesures postérieures au dernier watermark
+                de chaque capteur sont demandées, et les stations dont
+                derniere_mesure n'a pas bougé sont ignorées.
+        """
+        self.explorer = explorer
+        self.sink = sink
+        self.data = data
+        self.page_size = page_size
+        self.chunk_size = chunk_size
+        self.max_concurrency = max_concurrency or int(
+            os.getenv("COLLECTION_MAX_CONCURRENCY", "8")
+        )
+        self.queue_size = queue_size
+        self.watermarks = watermarks
+
+        self.stats = {
+            "capteurs_collectes": 0,
+            "capteurs_en_echec": 0,
+            "capteurs_ignores": 0,
+            "pages_recues": 0,
+            "mesures_ecrites": 0,
+        }
+
+    def _parse_measurement(self, measurement, sensor: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convertit un objet Measurement d'OpenAQ en enregistrement plat.
+
+        Args:
+            measurement: Objet Measurement retourné par measurements.list
+            sensor: Enregistrement du capteur issu de sensors_data
+
+        Returns:
+            Dict: Mesure avec les colonnes de CHAMPS_MESURE.
+        """
+        period = measurement.period
+        coverage = getattr(measurement, "coverage", None)
+
+        return {
+            "capteur_id": sensor["capteur_id"],
+            "station_id": sensor["station_id"],
+            "parametre_nom": sensor["parametre_nom"],
+            "unite_mesure": sensor["unite_mesure"],
+            "valeur": measurement.value,
+            "date_debut": period.datetime_from.utc if period.datetime_from else None,
+            "date_fin": period.datetime_to.utc if period.datetime_to else None,
+            "intervalle": period.interval,
+            "couverture_pct": coverage.percent_coverage if coverage else None,
+        }
+
+    def _range_params(
+        self, datetime_from: Optional[str], datetime_to: Optional[str]
+    ) -> Dict[str, Any]:
+        """
+        Construit les bornes temporelles adaptées à la granularité demandée.
+
+        Les mesures brutes et horaires se filtrent par datetime_from/datetime_to,
+        les agrégats journaliers par date_from/date_to.
+        """
+        if self.data in ("days", "years"):
+            return {
+                "date_from": datetime_from[:10] if datetime_from else None,
+                "date_to": datetime_to[:10] if datetime_to else None,
+            }
+        return {"datetime_from": datetime_from, "datetime_to": datetime_to}
+
+    def iter_sensor_pages(
+        self,
+        sensor: Dict[str, Any],
+        datetime_from: Optional[str] = None,
+        datetime_to: Optional[str] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Parcourt les mesures d'un capteur page par page.
+
+        Args:
+            sensor: Enregistrement du capteur issu de sensors_data
+            datetime_from: Début de la période (ISO 8601), None pour tout l'historique
+            datetime_to: Fin de la période (ISO 8601), None jusqu'à maintenant
+
+        Yields:
+            List[Dict]: Mesures de chaque page.
+        """
+        client = self.explorer.client
+        range_params = self._range_params(datetime_from, datetime_to)
+        page = 1
+        received = 0
+
+        while True:
+            response = self.explorer.call_api(
+                client.measurements.list,
+                sensors_id=sensor["capteur_id"],
+                data=self.data,
+                page=page,
+                limit=self.page_size,
+                **range_params,
+            )
+
+            results = response.results or []
+            found = self.explorer._parse_found(getattr(response.meta, "found", None))
+            received += len(results)
+
+            if results:
+                yield [self._parse_measurement(m, sensor) for m in results]
+
+            if len(results) < self.page_size or (
+                found is not None and received >= found
+            ):
+                return
+            page += 1
+
+    def _sensor_ranges(self, sensors: List[Dict[str, Any]], datetime_from, datetime_to):
+        """
+        Détermine la période à collecter pour chaque capteur.
+
+        À défaut de bornes explicites, la période couvre l'historique de la station
+        (premiere_mesure à derniere_mesure) connu grâce à l'exploration. En mode
+        incrémental, elle démarre au watermark du capteur et les capteurs des
+        stations inchangées depuis la dernière synchronisation sont ignorés.
+
+        Yields:
+            Tuple: (capteur, début, fin, watermark du capteur ou None)
+        """
+        stations = {s["station_id"]: s for s in self.explorer.stations_data}
+
+        for sensor in sensors:
+            station = stations.get(sensor["station_id"], {})
+            debut = datetime_from or station.get("premiere_mesure")
+            watermark = None
+
+            if self.watermarks is not None:
+                if station and self.watermarks.is_station_unchanged(station):
+                    self.stats["capteurs_ignores"] += 1
+                    continue
+
+                watermark = self.watermarks.sensor_watermark(sensor["capteur_id"])
+                if watermark and (
+                    parse_timestamp(debut) is None
+                    or parse_timestamp(watermark) > parse_timestamp(debut)
+                ):
+                    debut = watermark
+
+            yield sensor, debut, datetime_to or station.get(
+                "derniere_mesure"
+            ), watermark
+
+    def _advance_watermarks(self, termines: List[tuple]):
+        """Avance les watermarks des capteurs entièrement écrits puis sauvegarde l'état."""
+        for capteur_id, date_debut in termines:
+            self.watermarks.advance_sensor(capteur_id, date_debut)
+        self.watermarks.save()
+
+    def _write_chunk(self, records: List[Dict[str, Any]], termines: List[tuple] = ()):
+        """
+        Transmet un bloc au puits puis avance les watermarks des capteurs terminés.
+
+        Args:
+            records: Mesures du bloc
+            termines: (capteur_id, date_debut la plus récente) des capteurs dont
+                toutes les pages précèdent ce bloc ou en font partie
+        """
+        if records:
+            self.sink.write(records)
+            metrics().record_rows(type(self.sink).__name__, len(records))
+        if self.watermarks is not None and termines:
+            self._advance_watermarks(termines)
+
+    def _mark_synced_stations(self, sensors, failed_stations, datetime_to):
+        """
+        Enregistre derniere_mesure pour les stations entièrement synchronisées.
+
+        Une station n'est marquée que si aucun de ses capteurs n'a échoué, si la
+        période n'a pas été tronquée par une borne de fin explicite et si tous
+        ses capteurs connus de l'exploration faisaient partie de la collecte :
+        une station collectée pour une partie de ses paramètres seulement
+        (COLLECTION_PARAMETERS) ne doit pas être ignorée au passage suivant.
+        """
+        if datetime_to is not None:
+            return
+
+        capteurs_par_station = {}
+        for station_id, capteur_id in zip(
+            self.explorer.sensors_data.column("station_id"),
+            self.explorer.sensors_data.column("capteur_id"),
+        ):
+            capteurs_par_station.setdefault(station_id, set()).add(capteur_id)
+
+        collectes = {}
+        for sensor in sensors:
+            collectes.setdefault(sensor["station_id"], set()).add(sensor["capteur_id"])
+
+        stations = {s["station_id"]: s for s in self.explorer.stations_data}
+        partielles = 0
+        for station_id, capteurs in collectes.items():
+            station = stations.get(station_id)
+            if station_id in failed_stations or station is None:
+                continue
+            if not capteurs_par_station.get(station_id, set()) <= capteurs:
+                partielles += 1
+                continue
+            self.watermarks.mark_station(station_id, station.get("derniere_mesure"))
+        self.watermarks.save()
+
+        if partielles:
+            logger.info(
+                f"{partielles} station(s) collectée(s) partiellement, "
+                f"non marquée(s) comme synchronisée(s)"
+            )
+
+    async def collect_async(
+        self,
+        sensors: List[Dict[str, Any]] = None,
+        datetime_from: str = None,
+        datetime_to: str = None,
+    ) -> Dict[str, Any]:
+        """
+        Collecte les mesures de plusieurs capteurs simultanément.
+
+        Args:
+            sensors: Capteurs à collecter. Par défaut, tous ceux de l'explorateur.
+            datetime_from: Début de la période commune (ISO 8601)
+            datetime_to: Fin de la période commune (ISO 8601)
+
+        Returns:
+            Dict: Statistiques de collecte.
+        """
+        import anyio
+        import anyio.to_thread
+
+        sensors = self.explorer.sensors_data if sensors is None else sensors
+        travailleurs = max(1, self.max_concurrency)
+        limiter = anyio.CapacityLimiter(travailleurs)
+        send_stream, receive_stream = anyio.create_memory_object_stream(
+            max_buffer_size=self.queue_size
+        )
+        capteurs_envoi, capteurs_reception = anyio.create_memory_object_stream(
+            max_buffer_size=travailleurs
+        )
+
+        failed_stations = set()
+        metriques = metrics()
+
+        def mesurer_files():
+            # Pages en attente d'écriture et capteurs en attente d'un créneau
+            metriques.set_queue_depth(
+                "pages_a_ecrire", receive_stream.statistics().current_buffer_used
+            )
+            metriques.set_queue_depth(
+                "capteurs_en_attente",
+                capteurs_reception.statistics().current_buffer_used,
+            )
+
+        logger.info(
+            f"Collecte des mesures ({self.data}) de {len(sensors)} capteurs "
+            f"(concurrence max: {self.max_concurrency}, "
+            f"incrémentale: {self.watermarks is not None})"
+        )
+
+        async def collecter_capteur(sensor, debut, fin, watermark, send_stream):
+            pages = self.iter_sensor_pages(sensor, debut, fin)
+            seuil = parse_timestamp(watermark)
+            # Mesure la plus récente du capteur : l'API ne garantit pas l'ordre
+            # chronologique des pages, le watermark n'avance qu'en fin de capteur
+            plus_recente = None
+            try:
+                while True:
+                    page = await anyio.to_thread.run_sync(
+                        next, pages, None, limiter=limiter
+                    )
+                    if page is None:
+                        break
+                    self.stats["pages_recues"] += 1
+                    if seuil is not None:
+                        # La borne de début est inclusive : la mesure du
+                        # watermark a déjà été écrite lors de la collecte précédente
+                        page = [
+                            m
+                            for m in page
+                            if (parse_timestamp(m["date_debut"]) or seuil) > seuil
+                        ]
+                    if page and self.watermarks is not None:
+                        for m in page:
+                            horodatage = parse_timestamp(m["date_debut"])
+                            if horodatage is not None and (
+                                plus_recente is None or horodatage > plus_recente[0]
+                            ):
+                                plus_recente = (horodatage, m["date_debut"])
+                    if page:
+                        await send_stream.send((page, None))
+                    mesurer_files()
+                if plus_recente is not None:
+                    # Après toutes ses pages dans la file : le rédacteur avance
+                    # le watermark une fois ces pages écrites
+                    await send_stream.send(
+                        ([], (sensor["capteur_id"], plus_recente[1]))
+                    )
+                self.stats["capteurs_collectes"] += 1
+            except Exception as e:
+                self.stats["capteurs_en_echec"] += 1
+                failed_stations.add(sensor["station_id"])
+                logger.error(
+                    f"Échec de la collecte du capteur {sensor['capteur_id']}: {e}"
+                )
+
+        async def travailleur(capteurs_reception, send_stream):
+            # Un capteur à la fois : chaque travailleur retient au plus une page
+            async with capteurs_reception, send_stream:
+                async for sensor, debut, fin, watermark in capteurs_reception:
+                    await collecter_capteur(sensor, debut, fin, watermark, send_stream)
+
+        async def rediger(receive_stream):
+            buffer = []
+            termines = []
+            async with receive_stream:
+                async for page, termine in receive_stream:
+                    mesurer_files()
+                    buffer.extend(page)
+                    if termine is not None:
+                        termines.append(termine)
+                    if len(buffer) >= self.chunk_size:
+                        await anyio.to_thread.run_sync(
+                            self._write_chunk, buffer, termines
+                        )
+                        self.stats["mesures_ecrites"] += len(buffer)
+                        buffer = []
+                        termines = []
+            if buffer or termines:
+                await anyio.to_thread.run_sync(self._write_chunk, buffer, termines)
+                self.stats["mesures_ecrites"] += len(buffer)
+
+        async with anyio.create_task_group() as task_group:
+            task_group.start_soon(rediger, receive_stream)
+            async with send_stream, capteurs_reception:
+                for _ in range(travailleurs):
+                    task_group.start_soon(
+                        travailleur, capteurs_reception.clone(), send_stream.clone()
+                    )
+            async with capteurs_envoi:
+                for plage in self._sensor_ranges(sensors, datetime_from, datetime_to):
+                    await capteurs_envoi.send(plage)
+
+        mesurer_files()
+        if self.watermarks is not None:
+            self._mark_synced_stations(sensors, failed_stations, datetime_to)
+
+        logger.info(
+            f"Collecte terminée: {self.stats['mesures_ecrites']} mesures, "
+            f"{self.stats['capteurs_collectes']} capteurs, "
+            f"{self.stats['capteurs_en_echec']} échec(s), "
+            f"{self.stats['capteurs_ignores']} ignoré(s) (stations inchangées)"
+        )
+        return self.stats
+
+    def collect(
+        self,
+        sensors: List[Dict[str, Any]] = None,
+        datetime_from: str = None,
+        datetime_to: str = None,
+    ) -> Dict[str, Any]:
+        """Version synchrone de collect_async ; ferme le puits en fin de collecte."""
+        import anyio
+
+        try:
+            return anyio.run(self.collect_async, sensors, datetime_from, datetime_to)
+        finally:
+            self.sink.close()
+
+
+def main():
+    """
+    Explore les stations configurées puis collecte les mesures de leurs capteurs.
+
+    Paramètres (variables d'environnement) :
+    - COLLECTION_DATA : granularité ("measurements", "hours", "days"), "hours" par défaut
+    - COLLECTION_PARAMETERS : paramètres à collecter, ex: "pm25,pm10" (tous par défaut)
+    - COLLECTION_DATE_FROM / COLLECTION_DATE_TO : bornes ISO 8601 de la période
+    - COLLECTION_INCREMENTAL : ne collecter que les nouvelles mesures depuis le
+      dernier passage (état dans WATERMARK_FILE)
+    - COLLECTION_SINK : "csv" (par défaut), "jsonl" (JSON Lines, compressé selon
+      EXPORT_COMPRESSION), "parquet" (jeu de données partitionné par paramètre et
+      par mois) ou "postgres" (base DATABASE_URL)
+    """
+    from logging_setup import configure_logging
+    from openaq_explorer import (
+        ExploratorStationsSenegal,
+        load_environment,
+        require_openaq,
+    )
+
+    # .env d'abord : il peut définir LOG_LEVEL, LOG_PHASE_LEVELS et LOG_FORMAT
+    load_environment()
+    configure_logging()
+    require_openaq()
+
+    print("=== COLLECTE DES MESURES OPENAQ ===\n")
+
+    # Métriques Prometheus (si METRICS_PORT est défini)
+    start_server_from_env()
+
+    explorer = ExploratorStationsSenegal()
+    if not explorer.connect_to_api():
+        print("❌ Impossible de se connecter à l'API OpenAQ")
+        return
+
+    try:
+        import anyio
+
+        anyio.run(explorer.discover_and_explore_async)
+
+        parametres = [
+            p.strip()
+            for p in os.getenv("COLLECTION_PARAMETERS", "").split(",")
+            if p.strip()
+        ]
+        sensors = [
+            s
+            for s in explorer.sensors_data
+            if not parametres or s["parametre_nom"] in parametres
+        ]
+
+        sink_type = os.getenv("COLLECTION_SINK", "csv").lower()
+        output_dir = os.getenv("OUTPUT_DIR", "./output")
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+
+        if sink_type == "postgres":
+            sink = PostgresLoader.from_env()
+            if sink is None:
+                print("❌ COLLECTION_SINK=postgres nécessite DATABASE_URL")
+                return
+            # Les mesures se rattachent aux capteurs : on charge d'abord l'exploration
+            sink.load_exploration(explorer.stations_data, explorer.sensors_data)
+            destination = "PostgreSQL"
+        elif sink_type == "parquet":
+            sink = ParquetSink(os.path.join(output_dir, f"mesures_{timestamp}"))
+            destination = sink.directory
+        elif sink_type == "jsonl":
+            os.makedirs(output_dir, exist_ok=True)
+            sink = JsonLinesSink(
+                os.path.join(output_dir, f"mesures_{timestamp}.jsonl"),
+                compression_from_env(),
+            )
+            destination = sink.filename
+        else:
+            os.makedirs(output_dir, exist_ok=True)
+            sink = CsvSink(os.path.join(output_dir, f"mesures_{timestamp}.csv"))
+            destination = sink.filename
+
+        data = os.getenv("COLLECTION_DATA", "hours")
+        incremental = os.getenv("COLLECTION_INCREMENTAL", "False").lower() in [
+            "true",
+            "1",
+        ]
+        watermarks = WatermarkStore.from_env(data) if incremental else None
+
+        collector = MeasurementCollector(
+            explorer, sink, data=data, watermarks=watermarks
+        )
+        stats = collector.collect(
+            sensors,
+            datetime_from=os.getenv("COLLECTION_DATE_FROM"),
+            datetime_to=os.getenv("COLLECTION_DATE_TO"),
+        )
+
+        print(f"\n✅ {stats['mesures_ecrites']} mesures écrites dans {destination}")
+
+    except KeyboardInterrupt:
+        print("\nCollecte interrompue par l'utilisateur.")
+    finally:
+        explorer.release_client()
+
+
+if __name__ == "__main__":
+    main()
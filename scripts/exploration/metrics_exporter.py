@@ -0,0 +1,202 @@
+"""
+Métriques Prometheus/OpenMetrics des explorations et collectes OpenAQ
+
+Les résumés de fin d'exécution ne suffisent pas pour suivre une collecte de
+longue durée. Ce module tient, pour tout le processus, les métriques suivantes
+et les expose en HTTP (/metrics) pour qu'un Prometheus local les relève :
+- openaq_api_requests_total{endpoint, status} : requêtes API par point d'accès
+  et code HTTP (ou type d'erreur réseau)
+- openaq_api_request_duration_seconds{endpoint} : histogramme des latences
+- openaq_rate_limit_wait_seconds_total : attente imposée par le limiteur de débit
+- openaq_cache_lookups_total{result} et openaq_cache_hit_ratio : cache de réponses
+- openaq_rows_ingested_total{sink} : mesures écrites par puits (csv, parquet...)
+- openaq_queue_depth{queue} : profondeur des files de la collecte
+
+prometheus_client est optionnel : sans lui, les métriques sont des opérations
+vides et aucun serveur n'est démarré.
+
+Paramètres (variables d'environnement) :
+- METRICS_PORT : port du serveur /metrics (non démarré si absent)
+- METRICS_ADDR : adresse d'écoute (127.0.0.1 par défaut)
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import os
+import logging
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Bornes de l'histogramme des latences API, en secondes
+BORNES_LATENCE = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def error_status(error: BaseException) -> str:
+    """Libellé de statut d'une requête en échec : code HTTP ou type d'erreur."""
+    status = getattr(error, "status_code", None)
+    return str(status) if status else type(error).__name__
+
+
+class NoopMetrics:
+    """Métriques sans effet, utilisées lorsque prometheus_client est absent."""
+
+    enabled = False
+
+    def record_api_request(self, endpoint: str, status: str, seconds: float):
+        pass
+
+    def record_rate_limit_wait(self, seconds: float):
+        pass
+
+    def record_cache_lookup(self, hit: bool):
+        pass
+
+    def record_rows(self, sink: str, rows: int):
+        pass
+
+    def set_queue_depth(self, queue: str, depth: int):
+        pass
+
+    def start_server(self, port: int, addr: str = "127.0.0.1") -> bool:
+        logger.warning(
+            "prometheus_client non installé : métriques non exposées "
+            "(pip install prometheus-client)"
+        )
+        return False
+
+
+class PrometheusMetrics(NoopMetrics):
+    """Métriques du processus, enregistrées dans un registre prometheus_client."""
+
+    enabled = True
+
+    def __init__(self, registry=None):
+        """
+        Args:
+            registry: Registre prometheus_client (registre global par défaut,
+                qui inclut aussi les métriques CPU/mémoire du processus)
+        """
+        from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+
+        self.registry = registry or REGISTRY
+        self._lock = threading.Lock()
+        self._server_started = False
+        self._cache_hits = 0
+        self._cache_lookups = 0
+
+        self.api_requests = Counter(
+            "openaq_api_requests",
+            "Requêtes à l'API OpenAQ par point d'accès et statut",
+            ["endpoint", "status"],
+            registry=self.registry,
+        )
+        self.api_latency = Histogram(
+            "openaq_api_request_duration_seconds",
+            "Latence des requêtes à l'API OpenAQ (hors attente du limiteur)",
+            ["endpoint"],
+            buckets=BORNES_LATENCE,
+            registry=self.registry,
+        )
+        self.rate_limit_wait = Counter(
+            "openaq_rate_limit_wait_seconds",
+            "Attente cumulée imposée par le limiteur de débit",
+            registry=self.registry,
+        )
+        self.cache_lookups = Counter(
+            "openaq_cache_lookups",
+            "Consultations du cache de réponses (hit ou miss)",
+            ["result"],
+            registry=self.registry,
+        )
+        self.cache_hit_ratio = Gauge(
+            "openaq_cache_hit_ratio",
+            "Proportion de réponses servies par le cache depuis le démarrage",
+            registry=self.registry,
+        )
+        self.rows_ingested = Counter(
+            "openaq_rows_ingested",
+            "Mesures écrites par puits de données",
+            ["sink"],
+            registry=self.registry,
+        )
+        self.queue_depth = Gauge(
+            "openaq_queue_depth",
+            "Éléments en attente dans les files de la collecte",
+            ["queue"],
+            registry=self.registry,
+        )
+
+    def record_api_request(self, endpoint: str, status: str, seconds: float):
+        self.api_requests.labels(endpoint, status).inc()
+        self.api_latency.labels(endpoint).observe(seconds)
+
+    def record_rate_limit_wait(self, seconds: float):
+        if seconds > 0:
+            self.rate_limit_wait.inc(seconds)
+
+    def record_cache_lookup(self, hit: bool):
+        self.cache_lookups.labels("hit" if hit else "miss").inc()
+        with self._lock:
+            self._cache_lookups += 1
+            self._cache_hits += hit
+            self.cache_hit_ratio.set(self._cache_hits / self._cache_lookups)
+
+    def record_rows(self, sink: str, rows: int):
+        self.rows_ingested.labels(sink).inc(rows)
+
+    def set_queue_depth(self, queue: str, depth: int):
+        self.queue_depth.labels(queue).set(depth)
+
+    def start_server(self, port: int, addr: str = "127.0.0.1") -> bool:
+        """Démarre le serveur /metrics dans un thread (une seule fois par processus)."""
+        from prometheus_client import start_http_server
+
+        with self._lock:
+            if self._server_started:
+                return True
+            start_http_server(port, addr=addr, registry=self.registry)
+            self._server_started = True
+
+        logger.info(f"Métriques Prometheus exposées sur http://{addr}:{port}/metrics")
+        return True
+
+
+_metrics: Optional[NoopMetrics] = None
+_metrics_lock = threading.Lock()
+
+
+def metrics() -> NoopMetrics:
+    """
+    Retourne les métriques communes au processus, créées à la première
+    utilisation (sans effet si prometheus_client n'est pas installé).
+    """
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            try:
+                _metrics = PrometheusMetrics()
+            except ImportError:
+                _metrics = NoopMetrics()
+        return _metrics
+
+
+def start_server_from_env() -> bool:
+    """
+    Démarre le serveur /metrics si METRICS_PORT est défini.
+
+    Returns:
+        bool: True si les métriques sont exposées.
+    """
+    port = os.getenv("METRICS_PORT")
+    if not port:
+        return False
+    try:
+        return metrics().start_server(
+            int(port), addr=os.getenv("METRICS_ADDR", "127.0.0.1")
+        )
+    except OSError as e:
+        logger.error(f"Serveur de métriques indisponible sur le port {port}: {e}")
+        return False
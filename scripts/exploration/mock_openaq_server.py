@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+"""
+Serveur local simulant les points d'accès de l'API OpenAQ v3 (tests de charge)
+
+Émule les points d'accès utilisés par l'exploration et la collecte :
+- GET /v3/locations (pagination, filtres iso, bbox, coordinates/radius)
+- GET /v3/locations/{id}/sensors
+- GET /v3/sensors/{id}/{measurements|hours|days}
+
+Les données sont synthétiques et déterministes : chaque station est calculée
+à partir de son identifiant (aucun stockage), ce qui permet d'en servir des
+milliers, par exemple 100 fois le parc réel du Sénégal. Le serveur applique le
+quota par clé API comme l'API réelle (429 et en-têtes x-ratelimit-*), injecte
+à la demande des erreurs 5xx et de la latence, et expose ses compteurs sur
+GET /__stats.
+
+Usage :
+    python mock_openaq_server.py --stations 5000 --rate-limit 6000 --error-rate 0.02
+
+puis, pour l'exploration ou la collecte :
+    OPENAQ_BASE_URL=http://127.0.0.1:8765/v3/ OPENAQ_TRANSPORT=rest \
+        OPENAQ_API_KEY=test python openaq_explorer.py
+
+(le client du SDK exige une clé de 64 caractères hexadécimaux, même factice)
+
+Dépendances : fastapi et uvicorn (requirements.txt).
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import json
+import math
+import time
+import random
+import asyncio
+import argparse
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Emprise du Sénégal (lon_min, lat_min, lon_max, lat_max)
+EMPRISE_SENEGAL = (-17.55, 12.30, -11.35, 16.70)
+
+LOCALITES = ["Dakar", "Thiès", "Saint-Louis", "Kaolack", "Ziguinchor", "Touba"]
+
+PARAMETRES = [
+    {"id": 2, "name": "pm25", "units": "µg/m³", "displayName": "PM2.5"},
+    {"id": 1, "name": "pm10", "units": "µg/m³", "displayName": "PM10"},
+    {"id": 19, "name": "pm1", "units": "µg/m³", "displayName": "PM1"},
+    {"id": 100, "name": "temperature", "units": "c", "displayName": "Température"},
+    {"id": 98, "name": "relativehumidity", "units": "%", "displayName": "Humidité"},
+    {"id": 7, "name": "no2", "units": "ppm", "displayName": "NO₂"},
+    {"id": 10, "name": "o3", "units": "ppm", "displayName": "O₃"},
+]
+
+# Identifiants de capteurs : station_id * CAPTEURS_PAR_STATION_MAX + rang
+CAPTEURS_PAR_STATION_MAX = 100
+
+PAS_DONNEES = {
+    "measurements": timedelta(hours=1),
+    "hours": timedelta(hours=1),
+    "days": timedelta(days=1),
+}
+
+
+def _iso(moment: datetime) -> Dict[str, str]:
+    utc = moment.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return {"utc": utc, "local": moment.strftime("%Y-%m-%dT%H:%M:%S+00:00")}
+
+
+def _parse_moment(value: Optional[str]) -> Optional[datetime]:
+    """Interprète une date ou un horodatage ISO 8601 (UTC si non précisé)."""
+    if not value:
+        return None
+    moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+def _distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 6371.0 * 2 * math.asin(math.sqrt(a))
+
+
+class MockDataset:
+    """Parc synthétique de stations, capteurs et séries de mesures."""
+
+    def __init__(self, stations: int = 5000, seed: int = 42, reference=None):
+        """
+        Args:
+            stations: Nombre de stations servies (identifiants 1..stations)
+            seed: Graine des données générées
+            reference: Date de dernière mesure des stations (heure courante par défaut)
+        """
+        self.stations = stations
+        self.seed = seed
+        self.reference = (reference or datetime.now(timezone.utc)).replace(
+            minute=0, second=0, microsecond=0
+        )
+
+    def _random(self, *key) -> random.Random:
+        # Graine textuelle : stable d'un processus à l'autre, contrairement à hash()
+        return random.Random(":".join(map(str, (self.seed,) + key)))
+
+    def _coordinates(self, station_id: int) -> Tuple[float, float]:
+        rng = self._random("coordonnees", station_id)
+        lon_min, lat_min, lon_max, lat_max = EMPRISE_SENEGAL
+        return (
+            round(rng.uniform(lat_min, lat_max), 5),
+            round(rng.uniform(lon_min, lon_max), 5),
+        )
+
+    def sensors(self, station_id: int) -> List[Dict[str, Any]]:
+        """Capteurs d'une station (1 à 6 paramètres)."""
+        rng = self._random("capteurs", station_id)
+        parametres = rng.sample(PARAMETRES, rng.randint(1, 6))
+        return [
+            {
+                "id": station_id * CAPTEURS_PAR_STATION_MAX + rang,
+                "name": f"{parametre['name']} {parametre['units']}",
+                "parameter": parametre,
+            }
+            for rang, parametre in enumerate(parametres)
+        ]
+
+    def period(self, station_id: int) -> Tuple[datetime, datetime]:
+        """Première et dernière mesure d'une station."""
+        first = self.reference - timedelta(days=30 + station_id % 700)
+        last = self.reference - timedelta(hours=station_id % 3)
+        return first, last
+
+    def location(self, station_id: int) -> Dict[str, Any]:
+        """Station au format de l'API v3."""
+        latitude, longitude = self._coordinates(station_id)
+        first, last = self.period(station_id)
+        proprietaire = station_id % 4
+        return {
+            "id": station_id,
+            "name": f"Station simulée {station_id}",
+            "locality": LOCALITES[station_id % len(LOCALITES)],
+            "timezone": "Africa/Dakar",
+            "country": {"id": 163, "code": "SN", "name": "Senegal"},
+            "owner": {"id": 1000 + proprietaire, "name": f"Opérateur {proprietaire}"},
+            "provider": {"id": 166, "name": "AirGradient"},
+            "isMobile": False,
+            "isMonitor": station_id % 10 == 0,
+            "instruments": [{"id": 4, "name": "Capteur bas coût"}],
+            "sensors": self.sensors(station_id),
+            "coordinates": {"latitude": latitude, "longitude": longitude},
+            "bounds": [longitude, latitude, longitude, latitude],
+            "distance": None,
+            "datetimeFirst": _iso(first),
+            "datetimeLast": _iso(last),
+        }
+
+    def location_ids(
+        self,
+        iso: Optional[str] = None,
+        bbox: Optional[str] = None,
+        coordinates: Optional[str] = None,
+        radius: Optional[int] = None,
+    ) -> List[int]:
+        """Identifiants des stations répondant aux filtres de locations.list."""
+        if iso and iso.upper() != "SN":
+            return []
+
+        ids = range(1, self.stations + 1)
+        if bbox:
+            lon_min, lat_min, lon_max, lat_max = map(float, bbox.split(","))
+            ids = [
+                i
+                for i in ids
+                if lat_min <= self._coordinates(i)[0] <= lat_max
+                and lon_min <= self._coordinates(i)[1] <= lon_max
+            ]
+        if coordinates and radius:
+            lat, lon = map(float, coordinates.split(","))
+            ids = [
+                i
+                for i in ids
+                if _distance_km(lat, lon, *self._coordinates(i)) * 1000 <= radius
+            ]
+        return list(ids)
+
+    def measurement_periods(
+        self,
+        sensor_id: int,
+        data: str,
+        start: Optional[datetime],
+        end: Optional[datetime],
+    ) -> Tuple[datetime, timedelta, int]:
+        """Début, pas et nombre de périodes de la série d'un capteur."""
+        first, last = self.period(sensor_id // CAPTEURS_PAR_STATION_MAX)
+        step = PAS_DONNEES[data]
+        start = max(start or first, first)
+        end = min(end or last, last)
+        count = max(0, int((end - start) / step)) if end > start else 0
+        return start, step, count
+
+    def measurement(
+        self, sensor: Dict[str, Any], start: datetime, step: timedelta
+    ) -> Dict[str, Any]:
+        """Mesure agrégée d'une période au format de l'API v3."""
+        end = start + step
+        heures = start.timestamp() / 3600
+        valeur = round(
+            25 + 15 * math.sin(heures / 24 * 2 * math.pi) + (sensor["id"] % 17), 2
+        )
+        return {
+            "value": valeur,
+            "flagInfo": {"hasFlags": False},
+            "parameter": sensor["parameter"],
+            "period": {
+                "label": "raw" if step < timedelta(days=1) else "1day",
+                "interval": "01:00:00" if step < timedelta(days=1) else "24:00:00",
+                "datetimeFrom": _iso(start),
+                "datetimeTo": _iso(end),
+            },
+            "coordinates": None,
+            "summary": None,
+            "coverage": {
+                "expectedCount": 1,
+                "expectedInterval": "01:00:00",
+                "observedCount": 1,
+                "observedInterval": "01:00:00",
+                "percentComplete": 100.0,
+                "percentCoverage": 100.0,
+                "datetimeFrom": _iso(start),
+                "datetimeTo": _iso(end),
+            },
+        }
+
+
+class MockBehaviour:
+    """Quota par clé API, erreurs 5xx et latence simulés par le serveur."""
+
+    def __init__(
+        self,
+        rate_limit: int = 60,
+        error_rate: float = 0.0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        seed: int = 42,
+    ):
+        """
+        Args:
+            rate_limit: Requêtes autorisées par minute et par clé API
+            error_rate: Proportion de requêtes en erreur 500/502/503
+            latency: Latence ajoutée à chaque réponse, en secondes
+            jitter: Variation aléatoire maximale de la latence, en secondes
+            seed: Graine du tirage des erreurs et de la latence
+        """
+        self.rate_limit = rate_limit
+        self.error_rate = error_rate
+        self.latency = latency
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self._windows: Dict[str, Tuple[int, int]] = {}
+        self.counters = {
+            "requetes": 0,
+            "reponses_429": 0,
+            "erreurs_5xx": 0,
+            "non_autorisees": 0,
+        }
+
+    def quota(self, api_key: str) -> Tuple[bool, Dict[str, str]]:
+        """Consomme une requête de la fenêtre d'une minute de la clé API."""
+        window = int(time.time() // 60)
+        start, used = self._windows.get(api_key, (window, 0))
+        if start != window:
+            start, used = window, 0
+
+        allowed = used < self.rate_limit
+        if allowed:
+            used += 1
+        self._windows[api_key] = (start, used)
+
+        headers = {
+            "x-ratelimit-limit": str(self.rate_limit),
+            "x-ratelimit-remaining": str(self.rate_limit - used),
+            "x-ratelimit-used": str(used),
+            "x-ratelimit-reset": str(max(1, int((window + 1) * 60 - time.time()))),
+        }
+        return allowed, headers
+
+    def delay(self) -> float:
+        return self.latency + self._random.uniform(0, self.jitter)
+
+    def injected_error(self) -> Optional[int]:
+        if self.error_rate and self._random.random() < self.error_rate:
+            return self._random.choice((500, 502, 503))
+        return None
+
+
+def _page(items_count: int, page: int, limit: int) -> range:
+    start = (page - 1) * limit
+    return range(start, min(start + limit, items_count))
+
+
+def create_app(dataset: MockDataset, behaviour: MockBehaviour):
+    """Construit l'application FastAPI du serveur simulé."""
+    from fastapi import FastAPI, Query, Request
+    from fastapi.responses import Response
+
+    app = FastAPI(title="OpenAQ v3 simulée", docs_url=None, redoc_url=None)
+    counters = behaviour.counters
+
+    def json_response(content, status_code: int = 200, headers=None) -> Response:
+        # Sérialisation directe : jsonable_encoder de FastAPI est ~30 fois plus
+        # lent sur une page de 1000 mesures et deviendrait le goulot d'étranglement
+        return Response(
+            json.dumps(content, ensure_ascii=False),
+            status_code=status_code,
+            headers=headers,
+            media_type="application/json",
+        )
+
+    def meta(page: int, limit: int, found: int) -> Dict[str, Any]:
+        return {
+            "name": "openaq-api",
+            "website": "/",
+            "page": page,
+            "limit": limit,
+            "found": found,
+        }
+
+    @app.middleware("http")
+    async def simulate_api(request: Request, call_next):
+        if request.url.path == "/__stats":
+            return await call_next(request)
+
+        counters["requetes"] += 1
+        delay = behaviour.delay()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        api_key = request.headers.get("x-api-key")
+        if not api_key:
+            counters["non_autorisees"] += 1
+            return json_response({"detail": "Unauthorized"}, status_code=401)
+
+        allowed, headers = behaviour.quota(api_key)
+        if not allowed:
+            counters["reponses_429"] += 1
+            return json_response(
+                {"detail": "Too many requests"}, status_code=429, headers=headers
+            )
+
+        status = behaviour.injected_error()
+        if status is not None:
+            counters["erreurs_5xx"] += 1
+            return json_response(
+                {"detail": "Erreur simulée"}, status_code=status, headers=headers
+            )
+
+        response = await call_next(request)
+        response.headers.update(headers)
+        return response
+
+    @app.get("/v3/locations")
+    async def locations(
+        page: int = Query(1, ge=1),
+        limit: int = Query(100, ge=1, le=1000),
+        iso: Optional[str] = None,
+        bbox: Optional[str] = None,
+        coordinates: Optional[str] = None,
+        radius: Optional[int] = Query(None, le=25000),
+        sort_order: str = "asc",
+    ):
+        ids = dataset.location_ids(iso, bbox, coordinates, radius)
+        if sort_order == "desc":
+            ids.reverse()
+        results = [dataset.location(ids[i]) for i in _page(len(ids), page, limit)]
+        return json_response({"meta": meta(page, limit, len(ids)), "results": results})
+
+    @app.get("/v3/locations/{location_id}/sensors")
+    async def location_sensors(location_id: int):
+        if not 1 <= location_id <= dataset.stations:
+            return json_response({"detail": "Location not found"}, status_code=404)
+        results = dataset.sensors(location_id)
+        return json_response({"meta": meta(1, 100, len(results)), "results": results})
+
+    @app.get("/v3/sensors/{sensor_id}/{data}")
+    async def sensor_measurements(
+        sensor_id: int,
+        data: str,
+        page: int = Query(1, ge=1),
+        limit: int = Query(1000, ge=1, le=1000),
+        datetime_from: Optional[str] = None,
+        datetime_to: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+    ):
+        station_id, rang = divmod(sensor_id, CAPTEURS_PAR_STATION_MAX)
+        sensors = (
+            dataset.sensors(station_id) if 1 <= station_id <= dataset.stations else []
+        )
+        if data not in PAS_DONNEES or rang >= len(sensors):
+            return json_response({"detail": "Sensor not found"}, status_code=404)
+
+        start, step, count = dataset.measurement_periods(
+            sensor_id,
+            data,
+            _parse_moment(datetime_from or date_from),
+            _parse_moment(datetime_to or date_to),
+        )
+        results = [
+            dataset.measurement(sensors[rang], start + i * step, step)
+            for i in _page(count, page, limit)
+        ]
+        return json_response({"meta": meta(page, limit, count), "results": results})
+
+    @app.get("/__stats")
+    async def stats():
+        return json_response({"stations": dataset.stations, **counters})
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur OpenAQ v3 simulé")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--stations", type=int, default=5000)
+    parser.add_argument(
+        "--rate-limit", type=int, default=60, help="requêtes/minute par clé"
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    try:
+        import uvicorn
+    except ImportError:
+        print("❌ Le serveur simulé nécessite fastapi et uvicorn :")
+        print("pip install fastapi uvicorn")
+        return
+
+    app = create_app(
+        MockDataset(args.stations, seed=args.seed),
+        MockBehaviour(
+            rate_limit=args.rate_limit,
+            error_rate=args.error_rate,
+            latency=args.latency_ms / 1000,
+            jitter=args.jitter_ms / 1000,
+            seed=args.seed,
+        ),
+    )
+    print(f"=== API OPENAQ SIMULÉE : {args.stations} stations ===")
+    print(f"OPENAQ_BASE_URL=http://{args.host}:{args.port}/v3/")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,104 +11,131 @@ Date: Mai 2025
 """
 
 import os
-import json
-import pandas as pd
+import time
+import functools
+import importlib.util
+from collections import Counter
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
 import logging
 
-# Configuration du logging pour suivre les opérations avec support Unicode complet
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler("exploration_stations.log", encoding="utf-8"),
-        logging.StreamHandler(),
-    ],
-)
+from rate_limiter import TokenBucketRateLimiter
+from retry_policy import RetryPolicy
+from response_cache import ResponseCache
+from discovery_queries import DiscoveryQuery, queries_from_env
+from postgres_loader import PostgresLoader
+import parquet_export
+import streaming_export
+from records import CHAMPS_CAPTEUR, CHAMPS_STATION, RecordTable
+from sensor_schema import SensorExtractor, compare_fingerprint
+from client_pool import OpenAQClientPool, shared_pool
+from replay_transport import CLE_API_FACTICE, sample_data_only
+from instrumentation import PhaseInstrumentation
+from metrics_exporter import error_status, metrics, start_server_from_env
+from logging_setup import configure_logging
+
+# Les imports coûteux (SDK OpenAQ, python-dotenv, pandas, pyarrow, anyio...)
+# sont différés jusqu'au chemin qui en a besoin : importer ce module, ou lancer
+# la CLI pour un contrôle de santé, reste rapide et n'ouvre aucun fichier.
 logger = logging.getLogger(__name__)
 
-# Configuration spécifique pour Windows - approche plus douce
-import sys
 
-if sys.platform.startswith("win"):
-    # Sur Windows, on utilise une approche moins invasive pour l'Unicode
-    import locale
-
-    if hasattr(sys.stdout, "reconfigure"):
-        try:
-            sys.stdout.reconfigure(encoding="utf-8", errors="replace")
-            sys.stderr.reconfigure(encoding="utf-8", errors="replace")
-        except:
-            # Si la reconfiguration échoue, on continue sans forcer l'UTF-8
-            pass
+@functools.lru_cache(maxsize=None)
+def load_environment() -> bool:
+    """
+    Charge le fichier .env (une seule fois par processus) avec python-dotenv.
 
-# Gestion sécurisée des variables d'environnement avec python-dotenv
-try:
-    from dotenv import load_dotenv
+    Returns:
+        bool: True si python-dotenv est installé.
+    """
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        logger.warning(
+            "Package python-dotenv non installé. Installez-le avec: pip install python-dotenv"
+        )
+        logger.info("Utilisation des variables d'environnement système uniquement")
+        return False
 
     # Chargement automatique du fichier .env s'il existe
     load_dotenv()
     logger.info("Fichier .env chargé avec succès")
-except ImportError:
-    logger.warning(
-        "Package python-dotenv non installé. Installez-le avec: pip install python-dotenv"
+    return True
+
+
+def require_openaq():
+    """
+    Vérifie que le SDK OpenAQ est installé (sans l'importer) et arrête la CLI
+    avec les instructions d'installation sinon.
+    """
+    if importlib.util.find_spec("openaq") is not None:
+        return
+    logger.error(
+        "Le package OpenAQ n'est pas installé. Installez-le avec: pip install openaq"
     )
-    logger.info("Utilisation des variables d'environnement système uniquement")
+    print("\n❌ PACKAGE MANQUANT")
+    print("Le package OpenAQ n'est pas installé sur votre système.")
+    print("\nPour l'installer, exécutez cette commande :")
+    print("pip install openaq")
+    print("\nOu si vous utilisez conda :")
+    print("conda install -c conda-forge openaq")
+    exit(1)
 
-# Gestion robuste des imports OpenAQ avec détection automatique de la structure
-try:
-    from openaq import OpenAQ
 
-    logger.info("Package OpenAQ importé avec succès")
+# Exceptions de substitution, utilisées si le SDK n'expose pas les siennes
+class RateLimitError(Exception):
+    """Exception levée quand la limite de taux API est dépassée"""
 
-    # Tentative d'import des exceptions avec gestion des différentes structures possibles
-    try:
-        # Structure moderne (versions récentes)
-        from openaq.exceptions import RateLimitError, ServerError, AuthError
+    pass
 
-        logger.info("Exceptions OpenAQ importées depuis openaq.exceptions")
-    except ImportError:
-        try:
-            # Structure alternative (certaines versions)
-            from openaq import RateLimitError, ServerError, AuthError
 
-            logger.info("Exceptions OpenAQ importées depuis le module principal")
-        except ImportError:
-            # Fallback : utilisation des exceptions HTTP standard
-            logger.warning(
-                "Exceptions spécifiques OpenAQ non trouvées, utilisation des exceptions standard"
-            )
+class ServerError(Exception):
+    """Exception levée pour les erreurs serveur (5xx)"""
 
-            # Définition d'exceptions de substitution basées sur les exceptions standard
-            class RateLimitError(Exception):
-                """Exception levée quand la limite de taux API est dépassée"""
+    pass
 
-                pass
 
-            class ServerError(Exception):
-                """Exception levée pour les erreurs serveur (5xx)"""
+class AuthError(Exception):
+    """Exception levée pour les erreurs d'authentification"""
 
-                pass
+    pass
 
-            class AuthError(Exception):
-                """Exception levée pour les erreurs d'authentification"""
 
-                pass
+@functools.lru_cache(maxsize=None)
+def openaq_exceptions() -> tuple:
+    """
+    Exceptions (RateLimitError, ServerError, AuthError) du SDK OpenAQ.
 
-            logger.info("Exceptions de substitution définies")
+    Résolues à la première erreur à classer plutôt qu'à l'import du module,
+    avec détection automatique de la structure du SDK installé.
+    """
+    try:
+        # Structure moderne (versions récentes)
+        from openaq.exceptions import (
+            RateLimitError as limite,
+            ServerError as serveur,
+            AuthError as authentification,
+        )
 
-except ImportError:
-    logger.error(
-        "Le package OpenAQ n'est pas installé. Installez-le avec: pip install openaq"
-    )
-    print("\n❌ PACKAGE MANQUANT")
-    print("Le package OpenAQ n'est pas installé sur votre système.")
-    print("\nPour l'installer, exécutez cette commande :")
-    print("pip install openaq")
-    print("\nOu si vous utilisez conda :")
-    print("conda install -c conda-forge openaq")
-    exit(1)
+        logger.debug("Exceptions OpenAQ importées depuis openaq.exceptions")
+    except ImportError:
+        try:
+            # Structure alternative (certaines versions)
+            from openaq import (
+                RateLimitError as limite,
+                ServerError as serveur,
+                AuthError as authentification,
+            )
+
+            logger.debug("Exceptions OpenAQ importées depuis le module principal")
+        except ImportError:
+            # Fallback : exceptions de substitution ; les erreurs du SDK sont
+            # alors reconnues par leur nom et leur code HTTP
+            logger.debug(
+                "Exceptions spécifiques OpenAQ non trouvées, utilisation des exceptions standard"
+            )
+            return RateLimitError, ServerError, AuthError
+    return limite, serveur, authentification
 
 
 class ExploratorStationsSenegal:
@@ -120,7 +147,16 @@ class ExploratorStationsSenegal:
     que nous récupérons toutes les informations nécessaires à la phase de collecte.
     """
 
-    def __init__(self, api_key: str = None):
+    def __init__(
+        self,
+        api_key: str = None,
+        rate_limiter: TokenBucketRateLimiter = None,
+        retry_policy: RetryPolicy = None,
+        cache: ResponseCache = None,
+        queries: List[DiscoveryQuery] = None,
+        client_pool: OpenAQClientPool = None,
+        diagnostics: bool = None,
+    ):
         """
         Initialise l'explorateur avec la clé API OpenAQ en suivant les bonnes pratiques de sécurité.
 
@@ -131,7 +167,24 @@ class ExploratorStationsSenegal:
 
         Args:
             api_key: Clé API OpenAQ. Si fournie, override les autres sources (non recommandé en production).
+            rate_limiter: Limiteur de débit à partager avec d'autres composants.
+                Par défaut, un limiteur configuré par API_RATE_LIMIT est créé.
+            retry_policy: Politique de réessai des erreurs transitoires. Par défaut,
+                une politique configurée par API_MAX_RETRIES et associées est créée.
+            cache: Cache des réponses de l'API. Par défaut, configuré par
+                CACHE_ENABLED et CACHE_MAX_AGE_HOURS (désactivé si absent).
+            queries: Zones à explorer (pays, bbox, rayons). Par défaut, la variable
+                DISCOVERY_QUERIES, ou le Sénégal seul si elle est absente.
+            client_pool: Pool de clients OpenAQ. Par défaut, le pool commun au
+                processus (connexions keep-alive réutilisées entre explorateurs
+                et collectes).
+            diagnostics: Si True, run_complete_exploration examine en détail la
+                réponse de la première station (une requête de plus). Par
+                défaut, la variable EXPLORATION_DIAGNOSTICS (désactivé).
         """
+        # Fichier .env (chargé une seule fois, y compris hors de la CLI)
+        load_environment()
+
         # Priorité 1: Paramètre direct (avec avertissement de sécurité)
         if api_key:
             logger.warning(
@@ -142,6 +195,11 @@ class ExploratorStationsSenegal:
             # Priorité 2: Variable d'environnement (recommandée)
             self.api_key = os.getenv("OPENAQ_API_KEY")
 
+        # Le rejeu strict des fixtures ne contacte jamais l'API
+        if not self.api_key and sample_data_only():
+            logger.info("SAMPLE_DATA_ONLY actif : clé API factice utilisée")
+            self.api_key = CLE_API_FACTICE
+
         # Validation de la présence de la clé API
         if not self.api_key:
             error_message = (
@@ -153,235 +211,397 @@ class ExploratorStationsSenegal:
             raise ValueError(error_message)
 
         self.client = None
-        self.stations_data = []
-        self.sensors_data = []
+        self.client_pool = client_pool or shared_pool()
+        self.rate_limiter = rate_limiter or TokenBucketRateLimiter.from_env()
+        self.retry_policy = retry_policy or RetryPolicy.from_env()
+        self.cache = cache if cache is not None else ResponseCache.from_env()
+        self.queries = queries or queries_from_env()
+        self.sensor_extractor = SensorExtractor.from_env()
+        if diagnostics is None:
+            diagnostics = os.getenv("EXPLORATION_DIAGNOSTICS", "False").lower() in [
+                "true",
+                "1",
+            ]
+        self.diagnostics = diagnostics
+        self.instrumentation = PhaseInstrumentation.from_env(
+            self._instrumentation_counters
+        )
         self.exploration_summary = {}
 
+        # Index des stations déjà connues pour dédoublonner les requêtes qui se chevauchent
+        self._station_ids = set()
+        self.discovery_stats = {}
+
         # Métadonnées pour l'exploration
         self.timestamp_exploration = datetime.now().isoformat()
 
+        # Stockage colonnaire : date_exploration n'est conservée qu'une fois par table
+        horodatage = {"date_exploration": self.timestamp_exploration}
+        self.stations_data = RecordTable(CHAMPS_STATION, constants=horodatage)
+        self.sensors_data = RecordTable(CHAMPS_CAPTEUR, constants=horodatage)
+
+    def _instrumentation_counters(self) -> Dict[str, float]:
+        """Compteurs cumulés relevés au début et à la fin de chaque phase."""
+        limiteur = self.rate_limiter.stats()
+        return {
+            "appels_api": limiteur["requetes_regulees"],
+            "octets_recus": self.client_pool.stats().get("octets_recus", 0),
+            "relances": self.retry_policy.stats()["relances_totales"],
+            # Durée réelle de blocage, pas la somme des attentes de chaque thread
+            "attente_quota_s": self.rate_limiter.blocked_time(),
+        }
+
     def connect_to_api(self) -> bool:
         """
         Établit la connexion avec l'API OpenAQ et teste l'authentification.
 
+        Le client est emprunté au pool : si un autre explorateur ou une collecte
+        du même processus l'a déjà créé, ses connexions HTTPS sont réutilisées.
+
         Returns:
             bool: True si la connexion est réussie, False sinon.
         """
         try:
-            self.client = OpenAQ(api_key=self.api_key)
+            self.client = self.retry_policy.call(
+                self.client_pool.acquire,
+                self.api_key,
+                is_retryable=self._is_transient_error,
+                operation="connexion",
+            )
             logger.info("Connexion à l'API OpenAQ établie avec succès")
             return True
 
-        except AuthError as e:
-            logger.error(f"Erreur d'authentification: {e}")
-            return False
         except Exception as e:
-            logger.error(f"Erreur lors de la connexion à l'API: {e}")
+            _, _, auth_error = openaq_exceptions()
+            if isinstance(e, auth_error):
+                logger.error(f"Erreur d'authentification: {e}")
+            else:
+                logger.error(f"Erreur lors de la connexion à l'API: {e}")
             return False
 
-    def discover_senegal_stations(self) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _is_rate_limit_error(error: BaseException) -> bool:
         """
-        Découvre toutes les stations de mesure au Sénégal.
+        Indique si une exception correspond à un dépassement de quota de l'API.
 
-        Cette méthode utilise le code ISO du Sénégal (SN) pour filtrer les stations.
-        Elle récupère également des informations contextuelles importantes comme
-        les coordonnées géographiques et les types d'instruments.
+        Selon la version du SDK, la limitation est signalée par RateLimitError,
+        HTTPRateLimitError ou un simple code HTTP 429 : les trois cas sont reconnus.
+        """
+        rate_limit_error, _, _ = openaq_exceptions()
+        return (
+            isinstance(error, rate_limit_error)
+            or type(error).__name__ in ("RateLimitError", "HTTPRateLimitError")
+            or getattr(error, "status_code", None) == 429
+        )
+
+    @classmethod
+    def _is_transient_error(cls, error: BaseException) -> bool:
+        """
+        Indique si une exception est passagère et justifie une nouvelle tentative.
+
+        Sont considérés comme transitoires : les dépassements de quota, les erreurs
+        serveur 5xx (ServerError et ses sous-classes BadGateway, ServiceUnavailable,
+        GatewayTimeout du SDK) et les coupures réseau. Les erreurs d'authentification
+        ne sont jamais relancées.
+        """
+        _, server_error, auth_error = openaq_exceptions()
+        if isinstance(error, auth_error):
+            return False
+        if cls._is_rate_limit_error(error):
+            return True
+
+        status_code = getattr(error, "status_code", None)
+        return (
+            isinstance(error, (server_error, ConnectionError, TimeoutError))
+            or any(base.__name__ == "ServerError" for base in type(error).__mro__)
+            or (isinstance(status_code, int) and status_code >= 500)
+        )
+
+    def call_api(self, func, *args, cacheable: bool = False, **kwargs):
+        """
+        Point d'entrée unique pour tous les appels au client OpenAQ.
+
+        Chaque requête passe par le limiteur de débit partagé, qui espace les
+        appels selon le quota et met les requêtes en attente lorsque l'API
+        signale un dépassement. Les erreurs transitoires (quota, 5xx, réseau)
+        sont relancées selon la politique de réessai, avec backoff exponentiel.
+
+        Pour les appels marqués cacheable, le cache est consulté en premier : une
+        réponse trouvée est renvoyée sans requête réseau ni consommation de quota.
+
+        Args:
+            func: Méthode du client OpenAQ (ex: self.client.locations.list)
+            *args, **kwargs: Arguments transmis à la méthode
+            cacheable: Si True, la réponse est lue depuis et écrite dans le cache
 
         Returns:
-            List[Dict]: Liste des stations avec leurs métadonnées complètes.
+            La réponse de l'API.
         """
-        logger.info("Début de la découverte des stations sénégalaises...")
+        endpoint = getattr(func, "__qualname__", "appel_api")
+        use_cache = cacheable and self.cache is not None
+        metriques = metrics()
+
+        if use_cache:
+            cache_params = {"args": list(args), **kwargs}
+            cached_response = self.cache.get(endpoint, cache_params)
+            metriques.record_cache_lookup(cached_response is not None)
+            if cached_response is not None:
+                logger.debug(f"Réponse servie depuis le cache: {endpoint}")
+                return cached_response
+
+        def requete(*call_args, **call_kwargs):
+            # Latence de la requête seule, hors attente du limiteur
+            debut = time.perf_counter()
+            statut = "200"
+            try:
+                return func(*call_args, **call_kwargs)
+            except Exception as e:
+                statut = error_status(e)
+                raise
+            finally:
+                metriques.record_api_request(
+                    endpoint, statut, time.perf_counter() - debut
+                )
 
-        try:
-            # Récupération des stations avec le code ISO du Sénégal
-            response = self.client.locations.list(
-                iso="SN",  # Code ISO du Sénégal
-                limit=1000,  # Maximum pour être sûr de tout récupérer
-                order_by="id",
-                sort_order="asc",
+        def tentative():
+            return self.rate_limiter.call(
+                requete, *args, is_rate_limit_error=self._is_rate_limit_error, **kwargs
             )
 
-            logger.info(f"Nombre total de stations trouvées: {len(response.results)}")
-
-            for location in response.results:
-                # Extraction des informations essentielles de chaque station
-                station_info = {
-                    "station_id": location.id,
-                    "nom": location.name,
-                    "localite": location.locality,
-                    "pays": location.country.name if location.country else "N/A",
-                    "code_pays": location.country.code if location.country else "N/A",
-                    "latitude": (
-                        location.coordinates.latitude if location.coordinates else None
-                    ),
-                    "longitude": (
-                        location.coordinates.longitude if location.coordinates else None
-                    ),
-                    "proprietaire": location.owner.name if location.owner else "N/A",
-                    "fournisseur": (
-                        location.provider.name if location.provider else "N/A"
-                    ),
-                    "est_mobile": location.is_mobile,
-                    "est_moniteur": location.is_monitor,
-                    "premiere_mesure": (
-                        location.datetime_first.utc if location.datetime_first else None
-                    ),
-                    "derniere_mesure": (
-                        location.datetime_last.utc if location.datetime_last else None
-                    ),
-                    "nombre_capteurs": len(location.sensors) if location.sensors else 0,
-                    "types_instruments": (
-                        [instr.name for instr in location.instruments]
-                        if location.instruments
-                        else []
-                    ),
-                    "date_exploration": self.timestamp_exploration,
-                }
+        response = self.retry_policy.call(
+            tentative, is_retryable=self._is_transient_error, operation=endpoint
+        )
 
-                self.stations_data.append(station_info)
+        if use_cache:
+            self.cache.set(endpoint, cache_params, response)
 
-                logger.info(
-                    f"Station explorée: {station_info['nom']} (ID: {station_info['station_id']})"
-                )
+        return response
 
-            return self.stations_data
+    def _parse_location(self, location) -> Dict[str, Any]:
+        """
+        Convertit un objet Location d'OpenAQ en enregistrement de station.
 
-        except RateLimitError:
-            logger.warning("Limite de taux atteinte lors de la découverte des stations")
-            raise
-        except Exception as e:
-            logger.error(f"Erreur lors de la découverte des stations: {e}")
-            raise
+        Args:
+            location: Objet Location retourné par locations.list
+
+        Returns:
+            Dict: Métadonnées de la station.
+        """
+        return {
+            "station_id": location.id,
+            "nom": location.name,
+            "localite": location.locality,
+            "pays": location.country.name if location.country else "N/A",
+            "code_pays": location.country.code if location.country else "N/A",
+            "latitude": (
+                location.coordinates.latitude if location.coordinates else None
+            ),
+            "longitude": (
+                location.coordinates.longitude if location.coordinates else None
+            ),
+            "proprietaire": location.owner.name if location.owner else "N/A",
+            "fournisseur": (location.provider.name if location.provider else "N/A"),
+            "est_mobile": location.is_mobile,
+            "est_moniteur": location.is_monitor,
+            "premiere_mesure": (
+                location.datetime_first.utc if location.datetime_first else None
+            ),
+            "derniere_mesure": (
+                location.datetime_last.utc if location.datetime_last else None
+            ),
+            "nombre_capteurs": len(location.sensors) if location.sensors else 0,
+            "types_instruments": (
+                [instr.name for instr in location.instruments]
+                if location.instruments
+                else []
+            ),
+            "date_exploration": self.timestamp_exploration,
+        }
+
+    @staticmethod
+    def _parse_found(found) -> Optional[int]:
+        """
+        Interprète meta.found, qui peut être un entier ou une borne du type ">1000".
 
-    def _safe_get_value(self, obj, attribute_path: str, default="N/A"):
+        Returns:
+            int: Nombre exact de résultats, ou None si l'API ne donne qu'une borne.
+        """
+        if isinstance(found, int):
+            return found
+        if isinstance(found, str) and found.isdigit():
+            return int(found)
+        return None
+
+    def iter_station_pages(
+        self, page_size: int = None, **filters
+    ) -> Iterator[List[Dict[str, Any]]]:
         """
-        Méthode utilitaire améliorée pour extraire des valeurs de manière sécurisée depuis des objets
-        ou des dictionnaires, avec gestion avancée des structures imbriquées.
+        Parcourt les stations page par page et produit chaque page dès son arrivée.
 
-        Cette version améliorée peut gérer les objets Python complexes avec des attributs imbriqués,
-        ce qui est crucial pour extraire les informations des paramètres OpenAQ.
+        La pagination suit meta.found et le numéro de page : elle s'arrête lorsque
+        toutes les stations annoncées ont été reçues ou qu'une page incomplète
+        arrive. Les appelants peuvent ainsi traiter les premières pages pendant
+        que les suivantes sont encore en cours de téléchargement.
 
         Args:
-            obj: L'objet ou dictionnaire source
-            attribute_path: Chemin vers l'attribut (ex: "parameter.name")
-            default: Valeur par défaut si l'attribut n'existe pas
+            page_size: Nombre de stations par page (1000 maximum côté API). Par
+                défaut, la variable d'environnement DISCOVERY_PAGE_SIZE (1000).
+            **filters: Filtres transmis à locations.list. Par défaut iso="SN".
 
-        Returns:
-            La valeur extraite ou la valeur par défaut
+        Yields:
+            List[Dict]: Stations de chaque page, dans l'ordre des identifiants.
         """
-        try:
-            # Diviser le chemin d'attribut (ex: "parameter.name" -> ["parameter", "name"])
-            path_parts = attribute_path.split(".")
-            current_obj = obj
-
-            for part in path_parts:
-                # Tentative d'accès comme attribut d'objet (ex: sensor.id)
-                if hasattr(current_obj, part):
-                    current_obj = getattr(current_obj, part)
-                    # Vérification supplémentaire pour les objets None
-                    if current_obj is None:
-                        return default
-                # Tentative d'accès comme clé de dictionnaire (ex: sensor['id'])
-                elif isinstance(current_obj, dict) and part in current_obj:
-                    current_obj = current_obj[part]
-                    if current_obj is None:
-                        return default
-                else:
-                    # Si aucune méthode ne fonctionne, retourner la valeur par défaut
-                    return default
-
-            # Gestion spéciale pour les objets qui peuvent être vides mais valides
-            if current_obj == "" or current_obj == 0:
-                return current_obj
-            elif current_obj is None:
-                return default
-            else:
-                return current_obj
+        if page_size is None:
+            page_size = int(os.getenv("DISCOVERY_PAGE_SIZE", "1000"))
+        filters = filters or {"iso": "SN"}
+
+        page = 1
+        received = 0
+
+        while True:
+            response = self.call_api(
+                self.client.locations.list,
+                limit=page_size,
+                page=page,
+                order_by="id",
+                sort_order="asc",
+                cacheable=True,
+                **filters,
+            )
 
-        except Exception as e:
-            # Log du problème pour diagnostic sans interrompre le processus
-            logger.debug(f"Erreur d'extraction pour {attribute_path}: {e}")
-            return default
+            results = response.results or []
+            found = self._parse_found(getattr(response.meta, "found", None))
+            received += len(results)
+
+            logger.info(
+                f"Page {page} reçue: {len(results)} stations "
+                f"({received}/{found if found is not None else '?'})"
+            )
+
+            if results:
+                yield [self._parse_location(location) for location in results]
+
+            if len(results) < page_size or (found is not None and received >= found):
+                return
+            page += 1
+
+    def discover_senegal_stations(self) -> List[Dict[str, Any]]:
+        """
+        Découvre toutes les stations de mesure au Sénégal.
+
+        Cette méthode utilise le code ISO du Sénégal (SN) pour filtrer les stations.
+        Elle récupère également des informations contextuelles importantes comme
+        les coordonnées géographiques et les types d'instruments. Toutes les pages
+        de résultats sont parcourues via iter_station_pages.
+
+        Returns:
+            List[Dict]: Liste des stations avec leurs métadonnées complètes.
+        """
+        logger.info("Début de la découverte des stations sénégalaises...")
+        return self.discover_stations([DiscoveryQuery.pays("SN")])
 
-    def _extract_parameter_info(self, sensor):
+    def discover_stations(
+        self, queries: List[DiscoveryQuery] = None, max_concurrency: int = None
+    ) -> List[Dict[str, Any]]:
         """
-        Extraction spécialisée des informations de paramètre basée sur la découverte que
-        sensor.parameter est un dictionnaire Python, pas un objet Parameter.
+        Découvre les stations de plusieurs zones (pays, bbox, rayons) en parallèle.
 
-        Cette méthode utilise la structure réelle révélée par notre diagnostic :
-        - sensor.parameter est un dictionnaire
-        - Les clés du dictionnaire contiennent les informations que nous cherchons
+        Chaque requête est paginée dans son propre thread de travail ; les stations
+        sont ensuite fusionnées dans l'ordre des requêtes et dédoublonnées par
+        identifiant, car des zones voisines (ex: bbox autour de Dakar et pays SN)
+        renvoient souvent les mêmes stations.
 
         Args:
-            sensor: Objet Sensor d'OpenAQ
+            queries: Requêtes à exécuter. Par défaut, self.queries.
+            max_concurrency: Nombre maximal de requêtes simultanées
 
         Returns:
-            dict: Informations extraites du paramètre ou valeurs par défaut
+            List[Dict]: Liste des stations avec leurs métadonnées complètes.
         """
-        param_info = {
-            "parametre_id": "N/A",
-            "parametre_nom": "N/A",
-            "parametre_nom_affichage": "N/A",
-            "unite_mesure": "N/A",
-        }
+        queries = queries or self.queries
+        logger.info(
+            f"Découverte des stations pour {len(queries)} requête(s): "
+            f"{', '.join(query.label for query in queries)}"
+        )
 
         try:
-            # Vérification que l'objet sensor a bien un attribut parameter
-            if not hasattr(sensor, "parameter"):
-                logger.debug("Sensor sans attribut parameter")
-                return param_info
-
-            param_dict = sensor.parameter
-
-            # Vérification que l'objet parameter n'est pas None
-            if param_dict is None:
-                logger.debug("Attribut parameter est None")
-                return param_info
-
-            # Maintenant nous savons que parameter est un dictionnaire !
-            # Extraction sécurisée de chaque clé du dictionnaire
-            if isinstance(param_dict, dict):
-                # ID du paramètre
-                if "id" in param_dict and param_dict["id"] is not None:
-                    param_info["parametre_id"] = param_dict["id"]
-
-                # Nom du paramètre
-                if "name" in param_dict and param_dict["name"] is not None:
-                    param_info["parametre_nom"] = param_dict["name"]
-
-                # Nom d'affichage
-                if (
-                    "display_name" in param_dict
-                    and param_dict["display_name"] is not None
-                ):
-                    param_info["parametre_nom_affichage"] = param_dict["display_name"]
-                elif param_info["parametre_nom"] != "N/A":
-                    # Fallback sur le nom standard si display_name n'est pas disponible
-                    param_info["parametre_nom_affichage"] = param_info["parametre_nom"]
-
-                # Unités de mesure
-                if "units" in param_dict and param_dict["units"] is not None:
-                    param_info["unite_mesure"] = param_dict["units"]
-
-                # Diagnostic pour comprendre les cas où l'extraction échoue encore
-                if param_info["parametre_nom"] == "N/A":
-                    logger.debug(
-                        f"Extraction échouée - Clés disponibles dans le dictionnaire: {list(param_dict.keys())}"
-                    )
-                    logger.debug(f"Contenu du dictionnaire parameter: {param_dict}")
+            if len(queries) == 1:
+                pages_par_requete = [
+                    list(self.iter_station_pages(**queries[0].to_filters()))
+                ]
             else:
-                # Si ce n'est pas un dictionnaire, loguer le type pour diagnostic
-                logger.debug(
-                    f"parameter n'est pas un dictionnaire mais : {type(param_dict)}"
+                import anyio
+
+                pages_par_requete = anyio.run(
+                    self._fetch_queries_async, queries, max_concurrency
                 )
-                if hasattr(param_dict, "__dict__"):
-                    logger.debug(f"Contenu __dict__: {param_dict.__dict__}")
 
-            return param_info
+            for query, pages in zip(queries, pages_par_requete):
+                stations = [station for page in pages for station in page]
+                self._merge_stations(query.label, stations)
+
+            logger.info(f"Nombre total de stations trouvées: {len(self.stations_data)}")
+
+            return self.stations_data
 
         except Exception as e:
-            logger.debug(f"Erreur lors de l'extraction des paramètres: {e}")
-            return param_info
+            if self._is_rate_limit_error(e):
+                logger.warning(
+                    "Limite de taux atteinte lors de la découverte des stations"
+                )
+            else:
+                logger.error(f"Erreur lors de la découverte des stations: {e}")
+            raise
+
+    async def _fetch_queries_async(
+        self, queries: List[DiscoveryQuery], max_concurrency: int = None
+    ) -> List[List[List[Dict[str, Any]]]]:
+        """Pagine toutes les requêtes simultanément et retourne leurs pages dans l'ordre."""
+        import anyio
+        import anyio.to_thread
+
+        if max_concurrency is None:
+            max_concurrency = int(os.getenv("EXPLORATION_MAX_CONCURRENCY", "8"))
+
+        limiter = anyio.CapacityLimiter(max(1, max_concurrency))
+        pages_par_requete = [[] for _ in queries]
+
+        async def executer_requete(index: int, query: DiscoveryQuery):
+            pages_par_requete[index] = await anyio.to_thread.run_sync(
+                lambda: list(self.iter_station_pages(**query.to_filters())),
+                limiter=limiter,
+            )
+
+        async with anyio.create_task_group() as task_group:
+            for index, query in enumerate(queries):
+                task_group.start_soon(executer_requete, index, query)
+
+        return pages_par_requete
+
+    def _merge_stations(self, label: str, stations: List[Dict[str, Any]]):
+        """
+        Ajoute à stations_data les stations d'une requête qui ne sont pas déjà connues.
+
+        Args:
+            label: Libellé de la requête d'origine, pour les statistiques
+            stations: Stations renvoyées par la requête
+        """
+        stats = self.discovery_stats.setdefault(
+            label, {"stations_recues": 0, "doublons": 0}
+        )
+
+        for station_info in stations:
+            stats["stations_recues"] += 1
+            if station_info["station_id"] in self._station_ids:
+                stats["doublons"] += 1
+                continue
+
+            self._station_ids.add(station_info["station_id"])
+            self.stations_data.append(station_info)
+
+            logger.debug(
+                f"Station explorée: {station_info['nom']} (ID: {station_info['station_id']})"
+            )
 
     def explore_station_sensors(
         self, station_id: int, station_name: str
@@ -400,60 +620,69 @@ class ExploratorStationsSenegal:
         Returns:
             List[Dict]: Liste des capteurs avec leurs spécifications complètes.
         """
-        logger.info(f"Exploration des capteurs de la station: {station_name}")
+        station_sensors = self._fetch_station_sensors(station_id, station_name)
+        self.sensors_data.extend(station_sensors)
+        return station_sensors
+
+    def _fetch_station_sensors(
+        self, station_id: int, station_name: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Récupère et analyse les capteurs d'une station sans modifier sensors_data.
+
+        Cette séparation permet au mode asynchrone d'interroger plusieurs stations
+        en parallèle puis de fusionner les résultats dans l'ordre des stations.
+
+        Args:
+            station_id: Identifiant unique de la station
+            station_name: Nom de la station pour les logs
+
+        Returns:
+            List[Dict]: Liste des capteurs de la station.
+        """
+        logger.debug(f"Exploration des capteurs de la station: {station_name}")
 
         station_sensors = []
+        debut = time.perf_counter()
 
         try:
             # Récupération des capteurs de la station
-            sensors_response = self.client.locations.sensors(station_id)
+            sensors_response = self.call_api(
+                self.client.locations.sensors, station_id, cacheable=True
+            )
 
             # Diagnostic simplifié maintenant que nous comprenons la structure
             logger.debug(
                 f"Nombre de capteurs reçus: {len(sensors_response.results) if hasattr(sensors_response, 'results') else 0}"
             )
 
-            for i, sensor in enumerate(sensors_response.results):
-                try:
-                    # Extraction des informations de base du capteur
-                    sensor_info = {
-                        "station_id": station_id,
-                        "station_nom": station_name,
-                        "capteur_id": self._safe_get_value(sensor, "id"),
-                        "capteur_nom": self._safe_get_value(sensor, "name"),
-                        "date_exploration": self.timestamp_exploration,
-                    }
-
-                    # Extraction spécialisée des informations de paramètre (dictionnaire)
-                    param_info = self._extract_parameter_info(sensor)
-                    sensor_info.update(param_info)
-
-                    # Validation que nous avons récupéré des données significatives
-                    has_valid_data = (
-                        sensor_info["capteur_id"] != "N/A"
-                        or sensor_info["parametre_nom"] != "N/A"
-                        or sensor_info["unite_mesure"] != "N/A"
-                    )
+            # Extraction de toute la page selon le schéma déclaratif des capteurs
+            colonnes = self.sensor_extractor.extract_page(sensors_response.results)
+            champs = list(colonnes)
 
-                    if has_valid_data:
-                        station_sensors.append(sensor_info)
-                        self.sensors_data.append(sensor_info)
+            for i, valeurs in enumerate(zip(*colonnes.values())):
+                sensor_info = {
+                    "station_id": station_id,
+                    "station_nom": station_name,
+                    "date_exploration": self.timestamp_exploration,
+                    **dict(zip(champs, valeurs)),
+                }
 
-                        logger.debug(
-                            f"  Capteur {i+1}: {sensor_info['parametre_nom_affichage']} ({sensor_info['unite_mesure']})"
-                        )
-                    else:
-                        logger.warning(
-                            f"  Capteur {i+1}: Aucune donnée significative extraite"
-                        )
+                # Validation que nous avons récupéré des données significatives
+                has_valid_data = (
+                    sensor_info["capteur_id"] != "N/A"
+                    or sensor_info["parametre_nom"] != "N/A"
+                    or sensor_info["unite_mesure"] != "N/A"
+                )
 
-                except Exception as sensor_error:
+                if has_valid_data:
+                    station_sensors.append(sensor_info)
+                else:
                     logger.warning(
-                        f"  Erreur lors du traitement du capteur {i+1}: {sensor_error}"
+                        f"  Capteur {i+1}: Aucune donnée significative extraite"
                     )
-                    continue
 
-            logger.info(
+            logger.debug(
                 f"  -> {len(station_sensors)} capteurs traités avec succès pour {station_name}"
             )
 
@@ -468,6 +697,179 @@ class ExploratorStationsSenegal:
             )
             return []
 
+        finally:
+            self.instrumentation.record_station(station_id, time.perf_counter() - debut)
+
+    async def explore_stations_sensors_async(
+        self, stations: List[Dict[str, Any]], max_concurrency: int = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Explore les capteurs de toutes les stations de manière concurrente.
+
+        Le SDK OpenAQ étant synchrone, chaque appel locations.sensors est exécuté
+        dans un thread de travail via anyio. Un CapacityLimiter plafonne le nombre
+        de requêtes simultanées pour ne pas saturer l'API. Les résultats sont
+        ajoutés à sensors_data dans l'ordre des stations, exactement comme en
+        mode séquentiel.
+
+        Args:
+            stations: Liste des stations issues de discover_senegal_stations
+            max_concurrency: Nombre maximal de requêtes simultanées. Par défaut,
+                la variable d'environnement EXPLORATION_MAX_CONCURRENCY (8).
+
+        Returns:
+            List[List[Dict]]: Capteurs de chaque station, dans l'ordre des stations.
+        """
+        return await self._explore_pages_async(
+            [("stations", iter([stations]))], max_concurrency, record_stations=False
+        )
+
+    async def discover_and_explore_async(
+        self, max_concurrency: int = None, queries: List[DiscoveryQuery] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Découvre les stations page par page et explore leurs capteurs au fil de l'eau.
+
+        Toutes les requêtes de découverte sont paginées simultanément et
+        l'exploration des capteurs d'une page démarre dès sa réception, pendant
+        que les pages suivantes sont encore téléchargées. Les stations en double
+        entre requêtes ne sont explorées qu'une fois. Les stations sont ajoutées à
+        stations_data et les capteurs à sensors_data dans l'ordre des requêtes,
+        comme avec discover_stations.
+
+        Args:
+            max_concurrency: Nombre maximal de requêtes de capteurs simultanées
+            queries: Requêtes de découverte. Par défaut, self.queries.
+
+        Returns:
+            List[List[Dict]]: Capteurs de chaque station, dans l'ordre des stations.
+        """
+        queries = queries or self.queries
+        sources = [
+            (query.label, self.iter_station_pages(**query.to_filters()))
+            for query in queries
+        ]
+        return await self._explore_pages_async(
+            sources, max_concurrency, record_stations=True
+        )
+
+    async def _explore_pages_async(
+        self,
+        sources: List[tuple],
+        max_concurrency: int = None,
+        record_stations: bool = False,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Moteur commun de l'exploration concurrente, alimenté par des flux de pages.
+
+        Chaque source (libellé, itérateur de pages) est lue dans son propre thread
+        de travail, car le pager effectue des appels API bloquants, et chaque
+        station reçue lance immédiatement sa tâche d'exploration des capteurs,
+        dans la limite de max_concurrency. Les résultats sont finalement triés
+        par (source, page, position) pour rester déterministes quel que soit
+        l'ordre d'arrivée des pages.
+
+        Args:
+            sources: Liste de couples (libellé, itérateur de listes de stations)
+            max_concurrency: Nombre maximal de requêtes de capteurs simultanées
+            record_stations: Si True, les stations reçues sont dédoublonnées et
+                ajoutées à stations_data
+
+        Returns:
+            List[List[Dict]]: Capteurs de chaque station, dans l'ordre des stations.
+        """
+        import anyio
+        import anyio.to_thread
+
+        if max_concurrency is None:
+            max_concurrency = int(os.getenv("EXPLORATION_MAX_CONCURRENCY", "8"))
+
+        limiter = anyio.CapacityLimiter(max(1, max_concurrency))
+        stations = []
+        resultats = []
+        ordre = []
+        stats_par_station = []
+        index_par_station = {}
+
+        logger.info(
+            f"Exploration concurrente des capteurs (concurrence max: {limiter.total_tokens})"
+        )
+
+        async def explorer_station(index: int, station: Dict[str, Any]):
+            resultats[index] = await anyio.to_thread.run_sync(
+                self._fetch_station_sensors,
+                station["station_id"],
+                station["nom"],
+                limiter=limiter,
+            )
+
+        async def lire_source(source_index: int, label: str, pages: Iterator):
+            stats = (
+                self.discovery_stats.setdefault(
+                    label, {"stations_recues": 0, "doublons": 0}
+                )
+                if record_stations
+                else {"stations_recues": 0, "doublons": 0}
+            )
+            page_index = 0
+
+            while True:
+                page = await anyio.to_thread.run_sync(next, pages, None)
+                if page is None:
+                    return
+
+                for position, station in enumerate(page):
+                    cle = (source_index, page_index, position)
+                    station_id = station["station_id"]
+                    stats["stations_recues"] += 1
+
+                    if record_stations:
+                        if station_id in self._station_ids:
+                            stats["doublons"] += 1
+                            continue
+                        if station_id in index_par_station:
+                            # Doublon entre requêtes : comme dans discover_stations,
+                            # la station appartient à l'occurrence la plus en amont
+                            # (source, page, position), quel que soit l'ordre
+                            # d'arrivée des pages ; toute autre occurrence est
+                            # comptée comme doublon de sa propre requête
+                            index = index_par_station[station_id]
+                            if cle < ordre[index]:
+                                stats_par_station[index]["doublons"] += 1
+                                ordre[index] = cle
+                                stats_par_station[index] = stats
+                                stations[index] = station
+                            else:
+                                stats["doublons"] += 1
+                            continue
+                        index_par_station[station_id] = len(stations)
+
+                    stations.append(station)
+                    resultats.append([])
+                    ordre.append(cle)
+                    stats_par_station.append(stats)
+                    task_group.start_soon(explorer_station, len(resultats) - 1, station)
+
+                page_index += 1
+
+        async with anyio.create_task_group() as task_group:
+            for source_index, (label, pages) in enumerate(sources):
+                task_group.start_soon(lire_source, source_index, label, pages)
+
+        # Fusion dans l'ordre des sources pour garder une sortie déterministe
+        permutation = sorted(range(len(resultats)), key=ordre.__getitem__)
+        resultats = [resultats[index] for index in permutation]
+
+        if record_stations:
+            for index in permutation:
+                self._station_ids.add(stations[index]["station_id"])
+                self.stations_data.append(stations[index])
+
+        for station_sensors in resultats:
+            self.sensors_data.extend(station_sensors)
+
+        return resultats
+
     def diagnose_api_response_structure(self, station_id: int, station_name: str):
         """
         Fonction de diagnostic pour comprendre la structure exacte des données
@@ -483,7 +885,7 @@ class ExploratorStationsSenegal:
         logger.info(f"=== DIAGNOSTIC APPROFONDI POUR {station_name} ===")
 
         try:
-            sensors_response = self.client.locations.sensors(station_id)
+            sensors_response = self.call_api(self.client.locations.sensors, station_id)
 
             # Analyser la structure de la réponse globale
             logger.info(f"Type de réponse: {type(sensors_response)}")
@@ -519,54 +921,125 @@ class ExploratorStationsSenegal:
 
         logger.info("=== FIN DU DIAGNOSTIC ===")
 
-    def run_complete_exploration(self):
+    def check_sensor_structure(self) -> Dict[str, Any]:
         """
-        Exécute l'exploration complète de toutes les stations sénégalaises avec diagnostic intégré.
+        Contrôle hors ligne de la structure des capteurs déjà reçus.
 
-        Cette version améliorée inclut un diagnostic automatique de la structure des données
-        pour la première station, ce qui nous aide à comprendre et adapter notre approche.
+        L'empreinte calculée lors de l'extraction est comparée à celle de
+        l'exécution précédente (fichier SCHEMA_FINGERPRINT_FILE) et aux chemins
+        du schéma d'extraction. Aucune requête n'est émise.
+
+        Returns:
+            Dict: Empreinte et résultat de la comparaison.
+        """
+        fingerprint = self.sensor_extractor.fingerprint()
+        if fingerprint is None:
+            return {"statut": "aucun capteur extrait"}
+
+        path = os.getenv(
+            "SCHEMA_FINGERPRINT_FILE",
+            os.path.join(
+                os.getenv("DATA_DIR", "./data"), "state", "empreinte_capteurs.json"
+            ),
+        )
+        try:
+            return compare_fingerprint(fingerprint, path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Empreinte de structure non comparée ({path}): {e}")
+            return {"empreinte": fingerprint["empreinte"], "statut": "non comparée"}
+
+    def run_complete_exploration(
+        self, async_mode: bool = False, max_concurrency: int = None
+    ):
+        """
+        Exécute l'exploration complète de toutes les stations sénégalaises.
+
+        La structure des capteurs reçus est contrôlée hors ligne par empreinte
+        (check_sensor_structure). Le diagnostic détaillé de la première station,
+        qui coûte une requête, n'est exécuté qu'en mode diagnostics
+        (EXPLORATION_DIAGNOSTICS=True).
+
+        Args:
+            async_mode: Si True, la découverte est diffusée page par page et les
+                capteurs sont récupérés de manière concurrente dès l'arrivée de
+                chaque page (voir discover_and_explore_async).
+            max_concurrency: Plafond de requêtes simultanées en mode asynchrone.
         """
         logger.info("=== DÉBUT DE L'EXPLORATION COMPLÈTE ===")
 
         # Étape 1: Connexion à l'API
-        if not self.connect_to_api():
+        with self.instrumentation.phase("connexion"):
+            connecte = self.connect_to_api()
+        if not connecte:
             raise ConnectionError("Impossible de se connecter à l'API OpenAQ")
 
         try:
-            # Étape 2: Découverte des stations
-            stations = self.discover_senegal_stations()
+            # Étape 2: Découverte des stations (en flux avec l'étape 4 en mode asynchrone)
+            if async_mode:
+                import anyio
+
+                logger.info("Découverte et exploration des capteurs en flux...")
+                with self.instrumentation.phase("decouverte_et_capteurs"):
+                    capteurs_par_station = anyio.run(
+                        self.discover_and_explore_async, max_concurrency
+                    )
+                stations = self.stations_data
+            else:
+                with self.instrumentation.phase("decouverte"):
+                    stations = self.discover_stations()
 
-            # Étape 3: Diagnostic sur la première station pour comprendre la structure
-            if stations:
+            # Étape 3: Diagnostic détaillé de la première station (mode diagnostics)
+            if stations and self.diagnostics:
                 logger.info("=== DIAGNOSTIC DE LA STRUCTURE API ===")
-                self.diagnose_api_response_structure(
-                    stations[0]["station_id"], stations[0]["nom"]
-                )
+                with self.instrumentation.phase("diagnostic"):
+                    self.diagnose_api_response_structure(
+                        stations[0]["station_id"], stations[0]["nom"]
+                    )
 
             # Étape 4: Exploration détaillée de chaque station
-            logger.info("Début de l'exploration détaillée des capteurs...")
-
             total_sensors = 0
             stations_avec_donnees = 0
 
-            for station in stations:
-                station_sensors = self.explore_station_sensors(
-                    station["station_id"], station["nom"]
-                )
+            if not async_mode:
+                logger.info("Début de l'exploration détaillée des capteurs...")
+                with self.instrumentation.phase("capteurs"):
+                    capteurs_par_station = [
+                        self.explore_station_sensors(
+                            station["station_id"], station["nom"]
+                        )
+                        for station in stations
+                    ]
 
+            for station_sensors in capteurs_par_station:
                 if station_sensors:
                     stations_avec_donnees += 1
                     total_sensors += len(station_sensors)
 
+            # Contrôle de structure sur les capteurs déjà reçus, sans requête
+            structure_capteurs = self.check_sensor_structure()
+
+            # Étape 5: Agrégations du résumé
+            with self.instrumentation.phase("agregation"):
+                parametres_uniques = self._get_unique_parameters()
+                repartition = self._analyze_geographic_distribution()
+                periode = self._analyze_data_timespan()
+
             # Compilation du résumé d'exploration
             self.exploration_summary = {
                 "timestamp_exploration": self.timestamp_exploration,
                 "nombre_total_stations": len(stations),
                 "stations_avec_capteurs": stations_avec_donnees,
                 "nombre_total_capteurs": total_sensors,
-                "parametres_uniques": self._get_unique_parameters(),
-                "repartition_geographique": self._analyze_geographic_distribution(),
-                "periode_donnees": self._analyze_data_timespan(),
+                "parametres_uniques": parametres_uniques,
+                "requetes_decouverte": self.discovery_stats,
+                "extraction_capteurs": self.sensor_extractor.stats(),
+                "structure_capteurs": structure_capteurs,
+                "repartition_geographique": repartition,
+                "periode_donnees": periode,
+                "limitation_debit": self.rate_limiter.stats(),
+                "relances": self.retry_policy.stats(),
+                "cache": self.cache.stats() if self.cache else "désactivé",
+                "metriques_phases": self.instrumentation.stats(),
                 "statut_exploration": "SUCCÈS",
             }
 
@@ -580,45 +1053,62 @@ class ExploratorStationsSenegal:
         except Exception as e:
             logger.error(f"Erreur durant l'exploration: {e}")
             self.exploration_summary["statut_exploration"] = f"ERREUR: {str(e)}"
+            self.exploration_summary["metriques_phases"] = self.instrumentation.stats()
             raise
 
         finally:
-            # Fermeture propre de la connexion API
-            if self.client:
-                self.client.close()
-                logger.info("Connexion API fermée")
+            self.release_client()
+            # Instantané pris après restitution : l'emprunt de cette exploration
+            # n'apparaît plus dans emprunts_en_cours
+            self.exploration_summary["pool_connexions"] = self.client_pool.stats()
+
+    def release_client(self):
+        """Rend le client au pool ; les connexions restent ouvertes pour les suivants."""
+        if self.client:
+            self.client_pool.release(self.client)
+            self.client = None
+            logger.info("Client API rendu au pool de connexions")
 
     def _get_unique_parameters(self) -> List[Dict[str, str]]:
         """Analyse les paramètres uniques mesurés across toutes les stations."""
+        noms = self.sensors_data.column("parametre_nom")
+        nombre_capteurs = Counter(noms)
         parametres_uniques = {}
 
-        for sensor in self.sensors_data:
-            param_key = sensor["parametre_nom"]
-            if param_key not in parametres_uniques:
-                parametres_uniques[param_key] = {
-                    "nom": sensor["parametre_nom"],
-                    "nom_affichage": sensor["parametre_nom_affichage"],
-                    "unite": sensor["unite_mesure"],
-                    "nombre_capteurs": 0,
+        # Premier capteur rencontré pour chaque paramètre, dans l'ordre d'exploration
+        for nom, nom_affichage, unite in zip(
+            noms,
+            self.sensors_data.column("parametre_nom_affichage"),
+            self.sensors_data.column("unite_mesure"),
+        ):
+            if nom not in parametres_uniques:
+                parametres_uniques[nom] = {
+                    "nom": nom,
+                    "nom_affichage": nom_affichage,
+                    "unite": unite,
+                    "nombre_capteurs": nombre_capteurs[nom],
                 }
-            parametres_uniques[param_key]["nombre_capteurs"] += 1
 
         return list(parametres_uniques.values())
 
     def _analyze_geographic_distribution(self) -> Dict[str, Any]:
         """Analyse la répartition géographique des stations."""
-        localites = {}
-        coordonnees_valides = 0
-
-        for station in self.stations_data:
-            localite = station["localite"] or "Non spécifiée"
-            localites[localite] = localites.get(localite, 0) + 1
-
-            if station["latitude"] and station["longitude"]:
-                coordonnees_valides += 1
+        stations = self.stations_data
+        localites = Counter(
+            localite or "Non spécifiée" for localite in stations.column("localite")
+        )
+        pays = Counter(stations.column("code_pays"))
+        coordonnees_valides = sum(
+            1
+            for latitude, longitude in zip(
+                stations.column("latitude"), stations.column("longitude")
+            )
+            if latitude and longitude
+        )
 
         return {
-            "repartition_par_localite": localites,
+            "repartition_par_localite": dict(localites),
+            "repartition_par_pays": dict(pays),
             "stations_avec_coordonnees": coordonnees_valides,
             "pourcentage_geolocalise": (
                 round((coordonnees_valides / len(self.stations_data)) * 100, 2)
@@ -630,10 +1120,10 @@ class ExploratorStationsSenegal:
     def _analyze_data_timespan(self) -> Dict[str, Any]:
         """Analyse la période temporelle couverte par les données."""
         premieres_mesures = [
-            s["premiere_mesure"] for s in self.stations_data if s["premiere_mesure"]
+            d for d in self.stations_data.column("premiere_mesure") if d
         ]
         dernieres_mesures = [
-            s["derniere_mesure"] for s in self.stations_data if s["derniere_mesure"]
+            d for d in self.stations_data.column("derniere_mesure") if d
         ]
 
         if not premieres_mesures or not dernieres_mesures:
@@ -650,18 +1140,43 @@ class ExploratorStationsSenegal:
         Exporte les résultats d'exploration dans plusieurs formats pour faciliter l'analyse.
 
         Cette méthode crée plusieurs fichiers complémentaires :
-        - Un fichier JSON complet avec toutes les données brutes
+        - Un fichier JSON complet avec toutes les données brutes, écrit en flux
+          (compressé selon EXPORT_COMPRESSION)
         - Des fichiers CSV structurés pour l'analyse dans Excel ou autres outils
+        - Des fichiers Parquet typés pour les rechargements analytiques (si pyarrow
+          est installé)
         - Un rapport de synthèse lisible par l'humain
+        - Si DATABASE_URL est défini, un chargement des stations et capteurs
+          dans PostgreSQL
+        - Un fichier JSON des mesures par phase (durées, appels API, octets,
+          relances, CPU et mémoire), export compris
 
         Args:
             base_filename: Nom de base pour les fichiers d'export
         """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-        # Export JSON complet (données brutes pour usage programmatique)
-        json_filename = f"{base_filename}_{timestamp}.json"
-        export_data = {
+        with self.instrumentation.phase("export"):
+            self._write_exports(base_filename, timestamp)
+
+        metrics_filename = self.instrumentation.write(
+            f"{base_filename}_metriques_{timestamp}.json",
+            {"timestamp_exploration": self.timestamp_exploration},
+        )
+        logger.info(f"Mesures par phase exportées vers: {metrics_filename}")
+
+    def _write_exports(self, base_filename: str, timestamp: str):
+        """Écrit les fichiers JSON, CSV, Parquet, le rapport et la base PostgreSQL."""
+
+        # Export JSON complet (données brutes pour usage programmatique), écrit
+        # enregistrement par enregistrement sans assembler le document en mémoire
+        compression = streaming_export.resolve_compression(
+            streaming_export.compression_from_env()
+        )
+        json_filename = streaming_export.compressed_filename(
+            f"{base_filename}_{timestamp}.json", compression
+        )
+        header = {
             "metadata": {
                 "timestamp_exploration": self.timestamp_exploration,
                 "timestamp_export": datetime.now().isoformat(),
@@ -669,36 +1184,73 @@ class ExploratorStationsSenegal:
                 "description": "Exploration complète des stations OpenAQ au Sénégal",
             },
             "summary": self.exploration_summary,
-            "stations": self.stations_data,
-            "sensors": self.sensors_data,
         }
 
-        with open(json_filename, "w", encoding="utf-8") as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False, default=str)
+        with streaming_export.open_text_output(json_filename, compression) as f:
+            streaming_export.write_json_document(
+                f,
+                header,
+                {
+                    "stations": iter(self.stations_data),
+                    "sensors": iter(self.sensors_data),
+                },
+            )
 
         logger.info(f"Données complètes exportées vers: {json_filename}")
 
         # Export CSV des stations (pour analyse tabulaire)
         stations_csv = f"{base_filename}_stations_{timestamp}.csv"
-        df_stations = pd.DataFrame(self.stations_data)
+        df_stations = self.stations_data.to_dataframe()
         df_stations.to_csv(stations_csv, index=False, encoding="utf-8")
         logger.info(f"Données des stations exportées vers: {stations_csv}")
 
         # Export CSV des capteurs (pour analyse détaillée)
         sensors_csv = f"{base_filename}_capteurs_{timestamp}.csv"
-        df_sensors = pd.DataFrame(self.sensors_data)
+        df_sensors = self.sensors_data.to_dataframe()
         df_sensors.to_csv(sensors_csv, index=False, encoding="utf-8")
         logger.info(f"Données des capteurs exportées vers: {sensors_csv}")
 
+        # Export Parquet (colonnes typées, noms encodés en dictionnaire)
+        parquet_files = []
+        if parquet_export.is_available():
+            stations_parquet = f"{base_filename}_stations_{timestamp}.parquet"
+            sensors_parquet = f"{base_filename}_capteurs_{timestamp}.parquet"
+            parquet_export.write_table(
+                self.stations_data, parquet_export.station_schema(), stations_parquet
+            )
+            parquet_export.write_table(
+                self.sensors_data, parquet_export.sensor_schema(), sensors_parquet
+            )
+            parquet_files = [stations_parquet, sensors_parquet]
+            logger.info(f"Exports Parquet: {stations_parquet}, {sensors_parquet}")
+        else:
+            logger.debug("pyarrow non installé : export Parquet ignoré")
+
         # Rapport de synthèse (format texte lisible)
         rapport_filename = f"{base_filename}_rapport_{timestamp}.txt"
         self._generate_synthesis_report(rapport_filename)
 
+        # Chargement en base (optionnel) : un échec n'invalide pas les fichiers produits
+        loader = PostgresLoader.from_env()
+        if loader is not None:
+            try:
+                counts = loader.load_exploration(self.stations_data, self.sensors_data)
+                logger.info(
+                    f"Base PostgreSQL alimentée: {counts['stations']} stations, "
+                    f"{counts['capteurs']} capteurs"
+                )
+            except Exception as e:
+                logger.error(f"Erreur lors du chargement PostgreSQL: {e}")
+            finally:
+                loader.close()
+
         logger.info("=== EXPORT TERMINÉ ===")
         logger.info(f"Fichiers générés:")
         logger.info(f"  - {json_filename} (données complètes)")
         logger.info(f"  - {stations_csv} (stations)")
         logger.info(f"  - {sensors_csv} (capteurs)")
+        for parquet_filename in parquet_files:
+            logger.info(f"  - {parquet_filename} (Parquet)")
         logger.info(f"  - {rapport_filename} (rapport de synthèse)")
 
     def _generate_synthesis_report(self, filename: str):
@@ -727,8 +1279,30 @@ class ExploratorStationsSenegal:
                 f"Nombre total de capteurs: {self.exploration_summary.get('nombre_total_capteurs', 0)}\n"
             )
             f.write(
-                f"Paramètres uniques mesurés: {len(self.exploration_summary.get('parametres_uniques', []))}\n\n"
+                f"Paramètres uniques mesurés: {len(self.exploration_summary.get('parametres_uniques', []))}\n"
             )
+            extraction = self.exploration_summary.get("extraction_capteurs", {})
+            f.write(
+                f"Valeurs capteurs par défaut (schéma v{extraction.get('version_schema', 'N/A')}): "
+                f"{sum(extraction.get('valeurs_par_defaut', {}).values())}\n"
+            )
+            structure = self.exploration_summary.get("structure_capteurs", {})
+            f.write(
+                f"Structure des capteurs: {structure.get('statut', 'N/A')} "
+                f"(empreinte {structure.get('empreinte', 'N/A')})\n\n"
+            )
+
+            # Durée par phase (l'export en cours n'y figure pas encore)
+            metriques = self.exploration_summary.get("metriques_phases", {})
+            if metriques.get("phases"):
+                f.write("DURÉE PAR PHASE\n")
+                f.write("-" * 30 + "\n")
+                for nom, phase in metriques["phases"].items():
+                    f.write(
+                        f"  {nom}: {phase['duree_s']} s, "
+                        f"{phase.get('appels_api', 0)} appel(s) API\n"
+                    )
+                f.write("\n")
 
             # Répartition géographique
             repartition = self.exploration_summary.get("repartition_geographique", {})
@@ -769,11 +1343,18 @@ def main():
     Cette fonction suit les meilleures pratiques de sécurité en gérant les clés API
     via des variables d'environnement plutôt que par saisie interactive.
     """
+    # .env d'abord : il peut définir LOG_LEVEL, LOG_PHASE_LEVELS et LOG_FORMAT
+    load_environment()
+    configure_logging()
+    require_openaq()
+
     print("=== EXPLORATEUR DES STATIONS OPENAQ AU SÉNÉGAL ===\n")
 
     # Vérification et guidance pour la configuration de la clé API
     api_key = os.getenv("OPENAQ_API_KEY")
-    if not api_key:
+    if sample_data_only():
+        print("✅ Rejeu des données d'exemple (SAMPLE_DATA_ONLY), sans accès réseau")
+    elif not api_key:
         print("❌ CONFIGURATION REQUISE - Clé API OpenAQ manquante")
         print(
             "\nPour configurer votre clé API de manière sécurisée, suivez ces étapes :"
@@ -807,10 +1388,14 @@ def main():
     else:
         print("✅ Clé API OpenAQ détectée")
 
+    # Métriques Prometheus (si METRICS_PORT est défini)
+    start_server_from_env()
+
     try:
         # Initialisation et exécution de l'exploration
         explorer = ExploratorStationsSenegal()  # Plus besoin de passer la clé API
-        explorer.run_complete_exploration()
+        mode_async = os.getenv("EXPLORATION_ASYNC", "False").lower() in ["true", "1"]
+        explorer.run_complete_exploration(async_mode=mode_async)
 
         # Export des résultats
         print("\nExport des résultats en cours...")
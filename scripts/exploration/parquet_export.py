@@ -0,0 +1,210 @@
+"""
+Export colonnaire (Parquet/Arrow) des stations, capteurs et mesures OpenAQ
+
+Les fichiers Parquet conservent les types des colonnes (entiers, flottants,
+horodatages UTC, booléens), encodent les noms répétés (stations, paramètres,
+unités) sous forme de dictionnaire et se relisent bien plus vite que les CSV.
+Les mesures sont écrites en jeu de données partitionné par paramètre et par mois
+(parametre_nom=pm25/mois=2025-01/...), ce qui permet aux analyses de ne lire que
+les fichiers utiles.
+
+pyarrow est une dépendance optionnelle : sans elle, l'export Parquet est
+simplement désactivé.
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import os
+import uuid
+import logging
+import importlib.util
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Nombre de mesures accumulées avant l'écriture d'un fichier par partition
+TAILLE_LOT_PARQUET = 100_000
+
+
+def is_available() -> bool:
+    """Indique si pyarrow est installé, sans l'importer."""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _clean(value: Any) -> Any:
+    """Remplace les valeurs manquantes de l'explorateur ("N/A") par None."""
+    return None if value == "N/A" else value
+
+
+def _column(records, name: str) -> List[Any]:
+    """Valeurs d'un champ, lues directement en colonne pour une RecordTable."""
+    if hasattr(records, "column"):
+        return [_clean(v) for v in records.column(name)]
+    return [_clean(r.get(name)) for r in records]
+
+
+def _table(records: List[Dict[str, Any]], schema):
+    """
+    Construit une table Arrow typée à partir d'enregistrements plats.
+
+    Les horodatages ISO 8601 sont convertis côté Arrow (cast de chaîne vers
+    timestamp) et les colonnes dictionnaire sont encodées à la construction.
+    """
+    import pyarrow as pa
+
+    arrays = []
+    for field in schema:
+        values = _column(records, field.name)
+        if pa.types.is_timestamp(field.type):
+            arrays.append(pa.array(values, pa.string()).cast(field.type))
+        elif pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(values, field.type.value_type).dictionary_encode())
+        else:
+            arrays.append(pa.array(values, field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def station_schema():
+    """Schéma Arrow des enregistrements de stations."""
+    import pyarrow as pa
+
+    texte = pa.dictionary(pa.int32(), pa.string())
+    horodatage = pa.timestamp("us", tz="UTC")
+    return pa.schema(
+        [
+            ("station_id", pa.int64()),
+            ("nom", texte),
+            ("localite", texte),
+            ("pays", texte),
+            ("code_pays", texte),
+            ("latitude", pa.float64()),
+            ("longitude", pa.float64()),
+            ("proprietaire", texte),
+            ("fournisseur", texte),
+            ("est_mobile", pa.bool_()),
+            ("est_moniteur", pa.bool_()),
+            ("premiere_mesure", horodatage),
+            ("derniere_mesure", horodatage),
+            ("nombre_capteurs", pa.int32()),
+            ("types_instruments", pa.list_(pa.string())),
+            # Heure locale de l'exploration, sans fuseau (datetime.now().isoformat())
+            ("date_exploration", pa.timestamp("us")),
+        ]
+    )
+
+
+def sensor_schema():
+    """Schéma Arrow des enregistrements de capteurs."""
+    import pyarrow as pa
+
+    texte = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema(
+        [
+            ("station_id", pa.int64()),
+            ("station_nom", texte),
+            ("capteur_id", pa.int64()),
+            ("capteur_nom", texte),
+            ("date_exploration", pa.timestamp("us")),
+            ("parametre_id", pa.int32()),
+            ("parametre_nom", texte),
+            ("parametre_nom_affichage", texte),
+            ("unite_mesure", texte),
+        ]
+    )
+
+
+def measurement_schema():
+    """Schéma Arrow des mesures, colonne de partition mois comprise."""
+    import pyarrow as pa
+
+    texte = pa.dictionary(pa.int32(), pa.string())
+    horodatage = pa.timestamp("us", tz="UTC")
+    return pa.schema(
+        [
+            ("capteur_id", pa.int64()),
+            ("station_id", pa.int64()),
+            ("parametre_nom", texte),
+            ("unite_mesure", texte),
+            ("valeur", pa.float64()),
+            ("date_debut", horodatage),
+            ("date_fin", horodatage),
+            ("intervalle", texte),
+            ("couverture_pct", pa.float64()),
+            ("mois", pa.string()),
+        ]
+    )
+
+
+def write_table(records: List[Dict[str, Any]], schema, filename: str):
+    """
+    Écrit des enregistrements dans un fichier Parquet unique (compression zstd).
+
+    Args:
+        records: Enregistrements plats (stations ou capteurs)
+        schema: Schéma Arrow, ex: station_schema()
+        filename: Chemin du fichier .parquet
+    """
+    import pyarrow.parquet as pq
+
+    pq.write_table(_table(records, schema), filename, compression="zstd")
+
+
+class ParquetSink:
+    """
+    Puits de données écrivant les mesures en jeu de données Parquet partitionné.
+
+    Les blocs reçus sont accumulés jusqu'à TAILLE_LOT_PARQUET lignes avant
+    d'être écrits, pour éviter une multitude de petits fichiers ; la mémoire
+    utilisée reste bornée par cette taille de lot.
+    """
+
+    def __init__(self, directory: str, batch_size: int = TAILLE_LOT_PARQUET):
+        """
+        Args:
+            directory: Répertoire racine du jeu de données
+            batch_size: Nombre de mesures par écriture
+        """
+        self.directory = directory
+        self.batch_size = batch_size
+        self.rows_written = 0
+        self._pending: List[Dict[str, Any]] = []
+        self._flushes = 0
+        self._run_id = uuid.uuid4().hex[:8]
+
+    def write(self, records: List[Dict[str, Any]]):
+        """Ajoute un bloc de mesures, écrit sur disque dès que le lot est plein."""
+        self._pending.extend(records)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Écrit les mesures en attente dans les partitions parametre_nom/mois."""
+        if not self._pending:
+            return
+
+        import pyarrow.compute as pc
+        import pyarrow.dataset as ds
+
+        table = _table(self._pending, measurement_schema())
+        mois = pc.strftime(table["date_debut"], format="%Y-%m")
+        table = table.set_column(table.schema.get_field_index("mois"), "mois", mois)
+        os.makedirs(self.directory, exist_ok=True)
+        ds.write_dataset(
+            table,
+            self.directory,
+            format="parquet",
+            partitioning=["parametre_nom", "mois"],
+            partitioning_flavor="hive",
+            basename_template=f"mesures-{self._run_id}-{self._flushes}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            file_options=ds.ParquetFileFormat().make_write_options(compression="zstd"),
+        )
+
+        self.rows_written += len(self._pending)
+        self._flushes += 1
+        self._pending = []
+
+    def close(self):
+        """Écrit le dernier lot incomplet."""
+        self.flush()
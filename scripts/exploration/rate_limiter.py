@@ -0,0 +1,286 @@
+"""
+Limiteur de débit à seau de jetons partagé par tous les appels à l'API OpenAQ
+
+Ce module fournit un régulateur central qui espace les requêtes pour rester sous
+le quota de l'API au lieu d'échouer lorsque celui-ci est atteint. Le débit cible
+provient de la variable d'environnement API_RATE_LIMIT (requêtes par minute) et
+est corrigé en continu à partir des en-têtes x-ratelimit-* renvoyés par OpenAQ.
+
+Avec le transport sdk, le client OpenAQ garde son propre limiteur (auto_wait) :
+il attend, à l'intérieur de l'appel, lorsque l'API annonce un quota restant nul.
+Le débit effectif ne peut donc jamais dépasser le quota de l'API (x-ratelimit-limit,
+60 requêtes par minute par défaut) : un API_RATE_LIMIT supérieur ne l'augmente
+pas. Ce limiteur-ci suspend les requêtes sur les mêmes en-têtes, si bien que
+l'attente du SDK reste exceptionnelle ; elle n'est pas comptée dans ses
+statistiques. Le transport rest n'a pas d'autre limiteur que celui-ci.
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Any, Callable, Optional
+
+from metrics_exporter import metrics
+
+logger = logging.getLogger(__name__)
+
+# Quota par défaut de l'API OpenAQ v3 (requêtes par minute)
+DEBIT_PAR_DEFAUT = 60
+
+# Durée de pause appliquée après un refus si l'API n'indique pas de délai
+PAUSE_PAR_DEFAUT_SECONDES = 60
+
+
+def _read_header(headers, name: str) -> Optional[int]:
+    """
+    Lit un en-tête de limitation de débit quelle que soit sa représentation.
+
+    Le SDK OpenAQ expose les en-têtes sous forme d'objet (x_ratelimit_remaining)
+    tandis que les réponses HTTP brutes utilisent des dictionnaires (x-ratelimit-remaining).
+
+    Args:
+        headers: Objet ou dictionnaire d'en-têtes
+        name: Nom de l'en-tête au format snake_case (ex: "x_ratelimit_remaining")
+
+    Returns:
+        La valeur entière de l'en-tête, ou None si elle est absente ou invalide.
+    """
+    if headers is None:
+        return None
+
+    value = getattr(headers, name, None)
+    if value is None and isinstance(headers, dict):
+        value = headers.get(name, headers.get(name.replace("_", "-")))
+
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucketRateLimiter:
+    """
+    Seau de jetons thread-safe qui régule le débit des requêtes OpenAQ.
+
+    Chaque requête consomme un jeton ; les jetons se régénèrent au rythme du
+    quota configuré. Lorsque l'API signale que le quota est épuisé (en-têtes ou
+    erreur de limitation), le limiteur suspend toutes les requêtes jusqu'à la
+    réinitialisation de la fenêtre plutôt que de laisser les appels échouer.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = DEBIT_PAR_DEFAUT,
+        burst: int = None,
+    ):
+        """
+        Initialise le limiteur de débit.
+
+        Args:
+            requests_per_minute: Débit maximal soutenu, en requêtes par minute
+            burst: Nombre de requêtes pouvant partir sans attente. Par défaut un
+                dixième du débit par minute, pour lisser la charge sur la fenêtre.
+        """
+        if requests_per_minute <= 0:
+            raise ValueError("Le débit doit être strictement positif")
+
+        self.requests_per_minute = float(requests_per_minute)
+        self.capacity = float(burst or max(1, int(requests_per_minute // 10)))
+
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+        # Statistiques exposées dans le résumé d'exploration : attente cumulée
+        # sur tous les threads, et durée réelle pendant laquelle au moins un
+        # thread était bloqué par le limiteur
+        self.total_requests = 0
+        self.total_wait_seconds = 0.0
+        self.blocked_seconds = 0.0
+        self.rate_limit_hits = 0
+        self._waiting_threads = 0
+        self._wait_started = 0.0
+
+    @classmethod
+    def from_env(cls) -> "TokenBucketRateLimiter":
+        """Construit un limiteur à partir de la variable API_RATE_LIMIT."""
+        requests_per_minute = float(os.getenv("API_RATE_LIMIT", DEBIT_PAR_DEFAUT))
+        return cls(requests_per_minute=requests_per_minute)
+
+    @property
+    def _rate_per_second(self) -> float:
+        return self.requests_per_minute / 60.0
+
+    def _refill(self, now: float):
+        """Régénère les jetons écoulés depuis le dernier passage (verrou détenu)."""
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(
+                self.capacity, self._tokens + elapsed * self._rate_per_second
+            )
+            self._last_refill = now
+
+    def _begin_wait(self, now: float):
+        """Un thread commence à attendre (verrou détenu)."""
+        if self._waiting_threads == 0:
+            self._wait_started = now
+        self._waiting_threads += 1
+
+    def _end_wait(self, now: float):
+        """Un thread cesse d'attendre (verrou détenu)."""
+        self._waiting_threads -= 1
+        if self._waiting_threads == 0:
+            self.blocked_seconds += now - self._wait_started
+
+    def acquire(self) -> float:
+        """
+        Bloque jusqu'à ce qu'un jeton soit disponible puis le consomme.
+
+        Returns:
+            float: Temps d'attente effectif en secondes.
+        """
+        waited = 0.0
+        waiting = False
+
+        try:
+            while True:
+                with self._lock:
+                    now = time.monotonic()
+                    self._refill(now)
+
+                    if now < self._blocked_until:
+                        delay = self._blocked_until - now
+                    elif self._tokens >= 1:
+                        self._tokens -= 1
+                        self.total_requests += 1
+                        self.total_wait_seconds += waited
+                        if waiting:
+                            waiting = False
+                            self._end_wait(now)
+                        return waited
+                    else:
+                        delay = (1 - self._tokens) / self._rate_per_second
+
+                    if not waiting:
+                        waiting = True
+                        self._begin_wait(now)
+
+                # Attente hors du verrou pour ne pas bloquer les autres threads
+                time.sleep(delay)
+                waited += delay
+        finally:
+            # Attente interrompue (ex: KeyboardInterrupt)
+            if waiting:
+                with self._lock:
+                    self._end_wait(time.monotonic())
+
+    def update_from_response(self, response: Any):
+        """
+        Synchronise le seau avec l'état de quota annoncé par l'API.
+
+        Les en-têtes x-ratelimit-remaining et x-ratelimit-reset sont prioritaires ;
+        à défaut, les métadonnées de la réponse sont consultées. Un en-tête
+        x-ratelimit-limit nul signifie que l'API n'a rien communiqué.
+
+        Args:
+            response: Réponse du SDK OpenAQ ou réponse HTTP brute
+        """
+        for source in (
+            getattr(response, "headers", None),
+            getattr(response, "meta", None),
+        ):
+            limit = _read_header(source, "x_ratelimit_limit")
+            if not limit:
+                continue
+
+            remaining = _read_header(source, "x_ratelimit_remaining")
+            reset = _read_header(source, "x_ratelimit_reset")
+
+            with self._lock:
+                if remaining is not None:
+                    self._tokens = min(self._tokens, float(remaining))
+                    if remaining <= 0 and reset:
+                        self._blocked_until = max(
+                            self._blocked_until, time.monotonic() + reset
+                        )
+                        logger.info(
+                            f"Quota API épuisé, requêtes suspendues pendant {reset}s"
+                        )
+            return
+
+    def penalize(self, retry_after: float = None):
+        """
+        Suspend toutes les requêtes après un refus de l'API pour dépassement de quota.
+
+        Args:
+            retry_after: Délai imposé par l'API en secondes, si connu
+        """
+        delay = retry_after if retry_after else PAUSE_PAR_DEFAUT_SECONDES
+        with self._lock:
+            self._tokens = 0.0
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+            self.rate_limit_hits += 1
+
+    def call(
+        self,
+        func: Callable[..., Any],
+        *args,
+        is_rate_limit_error: Callable[[BaseException], bool] = None,
+        **kwargs,
+    ) -> Any:
+        """
+        Exécute une tentative d'appel API en respectant le quota.
+
+        Si l'API refuse l'appel pour dépassement de quota, toutes les requêtes
+        sont suspendues jusqu'à la fin de la pause et l'erreur est remontée :
+        la nouvelle tentative est confiée à la politique de réessai, dont le
+        prochain passage dans acquire() attendra la réouverture de la fenêtre.
+
+        Args:
+            func: Méthode du client OpenAQ à appeler
+            is_rate_limit_error: Prédicat identifiant les erreurs de limitation
+            *args, **kwargs: Arguments transmis à func
+
+        Returns:
+            La réponse de l'API.
+        """
+        metrics().record_rate_limit_wait(self.acquire())
+        try:
+            response = func(*args, **kwargs)
+        except Exception as e:
+            if is_rate_limit_error is not None and is_rate_limit_error(e):
+                retry_after = _read_header(
+                    getattr(e, "headers", None), "x_ratelimit_reset"
+                )
+                self.penalize(retry_after)
+                logger.warning("Limite de taux atteinte, requêtes mises en attente")
+            raise
+
+        self.update_from_response(response)
+        return response
+
+    def blocked_time(self) -> float:
+        """
+        Durée réelle, en secondes, pendant laquelle au moins un thread attendait
+        le limiteur (les attentes simultanées de plusieurs threads comptent une fois).
+        """
+        with self._lock:
+            blocked = self.blocked_seconds
+            if self._waiting_threads:
+                blocked += time.monotonic() - self._wait_started
+            return blocked
+
+    def stats(self) -> dict:
+        """Retourne les statistiques de régulation pour le résumé d'exploration."""
+        return {
+            "debit_requetes_par_minute": self.requests_per_minute,
+            "requetes_regulees": self.total_requests,
+            "attente_totale_secondes": round(self.blocked_time(), 3),
+            "attente_cumulee_threads_secondes": round(self.total_wait_seconds, 3),
+            "limites_atteintes": self.rate_limit_hits,
+        }
@@ -0,0 +1,191 @@
+"""
+Stockage colonnaire compact des enregistrements de stations et de capteurs
+
+Une liste de dictionnaires répète, pour chaque ligne, la table de hachage et
+ses 9 à 16 clés ; date_exploration y est en outre dupliquée sur chaque
+enregistrement. RecordTable range les valeurs par colonne (une liste par
+champ), conserve les valeurs identiques pour toutes les lignes une seule fois et
+expose chaque ligne sous forme d'une vue légère (RecordRow, à __slots__) qui se
+comporte comme un dictionnaire en lecture : row["nom"], row.get(...), dict(row).
+
+Les agrégations peuvent travailler directement sur les colonnes (column()) et
+la conversion en DataFrame se fait colonne par colonne, sans dictionnaire
+intermédiaire par ligne.
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+# Champs des enregistrements produits par ExploratorStationsSenegal
+CHAMPS_STATION = (
+    "station_id",
+    "nom",
+    "localite",
+    "pays",
+    "code_pays",
+    "latitude",
+    "longitude",
+    "proprietaire",
+    "fournisseur",
+    "est_mobile",
+    "est_moniteur",
+    "premiere_mesure",
+    "derniere_mesure",
+    "nombre_capteurs",
+    "types_instruments",
+    "date_exploration",
+)
+
+CHAMPS_CAPTEUR = (
+    "station_id",
+    "station_nom",
+    "capteur_id",
+    "capteur_nom",
+    "date_exploration",
+    "parametre_id",
+    "parametre_nom",
+    "parametre_nom_affichage",
+    "unite_mesure",
+)
+
+
+def _compact(value: Any) -> Any:
+    """Partage les chaînes identiques (noms de paramètres, unités, pays...)."""
+    return sys.intern(value) if type(value) is str else value
+
+
+class RecordRow(Mapping):
+    """
+    Vue d'une ligne de RecordTable, utilisable comme un dictionnaire.
+
+    La vue ne copie aucune valeur : elle lit et écrit directement dans les
+    colonnes de la table.
+    """
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "RecordTable", index: int):
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        return self._table._value(key, self._index)
+
+    def __setitem__(self, key: str, value: Any):
+        self._table._set_value(key, self._index, value)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._table.fields)
+
+    def __len__(self) -> int:
+        return len(self._table.fields)
+
+    def __repr__(self) -> str:
+        return f"RecordRow({dict(self)!r})"
+
+
+class RecordTable:
+    """
+    Table d'enregistrements stockée par colonnes.
+
+    S'utilise comme la liste de dictionnaires qu'elle remplace : append,
+    extend, len, itération, indexation (les lignes sont des RecordRow).
+    """
+
+    def __init__(
+        self, fields: Sequence[str], constants: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Args:
+            fields: Noms des champs, dans l'ordre des colonnes exportées
+            constants: Valeurs communes à toutes les lignes (ex: date_exploration),
+                stockées une seule fois. Si une ligne en diffère, le champ
+                redevient une colonne ordinaire.
+        """
+        self.fields = tuple(fields)
+        self._constants = dict(constants or {})
+        self._columns: Dict[str, List[Any]] = {
+            name: [] for name in self.fields if name not in self._constants
+        }
+        self._length = 0
+
+    def _materialize(self, name: str):
+        """Transforme un champ constant en colonne ordinaire."""
+        value = self._constants.pop(name)
+        self._columns[name] = [value] * self._length
+
+    def _value(self, name: str, index: int) -> Any:
+        column = self._columns.get(name)
+        if column is not None:
+            return column[index]
+        if name in self._constants:
+            return self._constants[name]
+        raise KeyError(name)
+
+    def _set_value(self, name: str, index: int, value: Any):
+        if name in self._constants:
+            if value == self._constants[name]:
+                return
+            self._materialize(name)
+        if name not in self._columns:
+            raise KeyError(name)
+        self._columns[name][index] = _compact(value)
+
+    def append(self, record: Mapping):
+        """Ajoute un enregistrement ; les champs absents valent None."""
+        for name in list(self._constants):
+            if record.get(name, self._constants[name]) != self._constants[name]:
+                self._materialize(name)
+
+        for name, column in self._columns.items():
+            column.append(_compact(record.get(name)))
+        self._length += 1
+
+    def extend(self, records: Iterable[Mapping]):
+        """Ajoute plusieurs enregistrements."""
+        for record in records:
+            self.append(record)
+
+    def clear(self):
+        """Supprime toutes les lignes."""
+        for column in self._columns.values():
+            column.clear()
+        self._length = 0
+
+    def column(self, name: str) -> Sequence[Any]:
+        """Valeurs d'un champ pour toutes les lignes (liste en lecture seule)."""
+        if name in self._constants:
+            return [self._constants[name]] * self._length
+        if name not in self._columns:
+            raise KeyError(name)
+        return self._columns[name]
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[RecordRow]:
+        return (RecordRow(self, index) for index in range(self._length))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [RecordRow(self, i) for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("index de ligne hors limites")
+        return RecordRow(self, index)
+
+    def __repr__(self) -> str:
+        return f"RecordTable({self._length} lignes, champs={list(self.fields)})"
+
+    def to_dataframe(self):
+        """Construit un DataFrame pandas colonne par colonne."""
+        import pandas as pd
+
+        return pd.DataFrame(
+            {name: self.column(name) for name in self.fields}, columns=list(self.fields)
+        )
@@ -0,0 +1,322 @@
+"""
+Enregistrement et rejeu des réponses de l'API OpenAQ (fixtures sur disque)
+
+Ni l'intégration continue ni les tests de charge ne peuvent interroger l'API
+réelle. Ce module fournit deux transports interchangeables avec le transport
+HTTP du SDK (send_request / close), donc utilisables aussi bien par le client
+OpenAQ que par le RestClient :
+
+- RecordingTransport relaie les requêtes vers l'API et enregistre chaque réponse
+  réussie (locations.list, locations.sensors, mesures...) dans un fichier JSON ;
+- ReplayTransport sert ces réponses sans réseau ni quota, avec une latence et
+  des erreurs (429, 5xx) injectées à la demande pour éprouver la politique de
+  réessai, le limiteur de débit et l'exploration concurrente.
+
+Modes (variables d'environnement) :
+- USE_SAMPLE_DATA=True : rejeu des fixtures, les requêtes absentes sont faites
+  auprès de l'API puis enregistrées
+- SAMPLE_DATA_ONLY=True : rejeu strict, aucune requête réseau ni clé API requise
+- SAMPLE_DATA_RECORD=True : toutes les requêtes vont à l'API et sont enregistrées
+- SAMPLE_DATA_DIR : répertoire des fixtures (défaut : DATA_DIR/samples/openaq)
+- REPLAY_LATENCY_MS / REPLAY_JITTER_MS : latence simulée par requête rejouée
+- REPLAY_ERROR_RATE : proportion de requêtes rejouées en erreur (0 à 1)
+- REPLAY_ERROR_STATUS : codes HTTP injectés, ex: "429,503" (503 par défaut)
+- REPLAY_SEED : graine du tirage aléatoire, pour des essais reproductibles
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import re
+import json
+import time
+import random
+import hashlib
+import logging
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, Mapping, Optional, Sequence
+from urllib.parse import urlencode, urlparse
+
+if TYPE_CHECKING:
+    import http.client
+
+logger = logging.getLogger(__name__)
+
+# Clé factice acceptée par le SDK (64 caractères hexadécimaux) en rejeu strict
+CLE_API_FACTICE = "0" * 64
+
+# Délai de réouverture annoncé avec les erreurs 429 injectées, en secondes
+DELAI_QUOTA_INJECTE = 1
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "False").lower() in ["true", "1"]
+
+
+def sample_data_only() -> bool:
+    """Indique si le rejeu strict (sans réseau) est demandé."""
+    return _env_flag("SAMPLE_DATA_ONLY")
+
+
+def _http_message(headers: Mapping[str, Any]) -> http.client.HTTPMessage:
+    """Construit les en-têtes d'une réponse au format attendu par le SDK."""
+    import http.client
+
+    raw = "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+    return http.client.parse_headers(io.BytesIO((raw + "\r\n").encode("latin-1")))
+
+
+def _make_response(status: int, body: bytes, headers: Mapping[str, Any]):
+    """Réponse du SDK, validée comme une vraie (exceptions OpenAQ pour 4xx/5xx)."""
+    from openaq.core.transport import Response, check_response
+
+    return check_response(Response(status, body, _http_message(headers)))
+
+
+class FixtureStore:
+    """
+    Répertoire de fixtures : un fichier JSON par requête.
+
+    La clé combine la méthode, le chemin relatif à /v3 et les paramètres triés ;
+    la clé API n'en fait jamais partie. Les noms de fichiers restent lisibles
+    (ex: locations_sensors_3f2a9c1b.json).
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    @staticmethod
+    def request_key(method: str, url: str, params: Optional[Mapping[str, Any]]):
+        """Retourne (chemin, clé canonique) d'une requête."""
+        path = urlparse(url).path
+        path = path.split("/v3", 1)[-1] or "/"
+        query = urlencode(sorted((params or {}).items()))
+        return path, f"{method.upper()} {path}?{query}"
+
+    def _filename(self, path: str, key: str) -> str:
+        slug = re.sub(r"[^a-z]+", "_", path.lower()).strip("_") or "racine"
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:12]
+        return os.path.join(self.directory, f"{slug}_{digest}.json")
+
+    def load(self, method: str, url: str, params) -> Optional[Dict[str, Any]]:
+        """Fixture correspondant à la requête, ou None si elle n'a pas été enregistrée."""
+        path, key = self.request_key(method, url, params)
+        try:
+            with open(self._filename(path, key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, method: str, url: str, params, response) -> str:
+        """Enregistre une réponse du SDK (statut, en-têtes, corps JSON)."""
+        path, key = self.request_key(method, url, params)
+        filename = self._filename(path, key)
+        fixture = {
+            "requete": key,
+            "statut": response.status_code,
+            "en_tetes": {
+                name: value
+                for name, value in response.headers.items()
+                if name.startswith("x-ratelimit") or name == "content-type"
+            },
+            "corps": response.json(),
+        }
+
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{filename}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(fixture, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, filename)
+        return filename
+
+
+class RecordingTransport:
+    """Relaie les requêtes vers un transport réel et enregistre les réponses."""
+
+    def __init__(self, inner, store: FixtureStore):
+        """
+        Args:
+            inner: Transport HTTP du SDK
+            store: Répertoire des fixtures
+        """
+        self.inner = inner
+        self.store = store
+        self._lock = threading.Lock()
+        self.recorded = 0
+
+    def send_request(self, method, url, params, headers):
+        response = self.inner.send_request(method, url, params, headers)
+        self.store.save(method, url, params, response)
+        with self._lock:
+            self.recorded += 1
+        return response
+
+    def close(self):
+        self.inner.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"mode": "enregistrement", "reponses_enregistrees": self.recorded}
+
+
+class ReplayTransport:
+    """
+    Sert les réponses enregistrées, avec latence et erreurs injectées.
+
+    Sans fixture pour une requête, la requête est déléguée au transport de
+    repli (qui peut l'enregistrer) s'il existe ; sinon une erreur 404 OpenAQ est
+    levée, comme pour une ressource inconnue de l'API.
+    """
+
+    def __init__(
+        self,
+        store: FixtureStore,
+        fallback=None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_statuses: Sequence[int] = (503,),
+        seed: Optional[int] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Args:
+            store: Répertoire des fixtures
+            fallback: Transport utilisé pour les requêtes sans fixture (None = strict)
+            latency: Latence ajoutée à chaque requête rejouée, en secondes
+            jitter: Variation aléatoire maximale de la latence, en secondes
+            error_rate: Proportion de requêtes rejouées transformées en erreur
+            error_statuses: Codes HTTP tirés pour les erreurs injectées
+            seed: Graine du générateur aléatoire
+            sleep: Fonction d'attente (remplaçable pour les bancs d'essai)
+        """
+        self.store = store
+        self.fallback = fallback
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_statuses = tuple(error_statuses)
+        self._random = random.Random(seed)
+        self._sleep = sleep
+
+        self._lock = threading.Lock()
+        self.replayed = 0
+        self.missing = 0
+        self.injected_errors = 0
+
+    @classmethod
+    def from_env(cls, store: FixtureStore, fallback=None) -> "ReplayTransport":
+        """Construit le transport de rejeu à partir des variables REPLAY_*."""
+        seed = os.getenv("REPLAY_SEED")
+        statuses = os.getenv("REPLAY_ERROR_STATUS", "503")
+        return cls(
+            store,
+            fallback=fallback,
+            latency=float(os.getenv("REPLAY_LATENCY_MS", 0)) / 1000,
+            jitter=float(os.getenv("REPLAY_JITTER_MS", 0)) / 1000,
+            error_rate=float(os.getenv("REPLAY_ERROR_RATE", 0)),
+            error_statuses=[int(s) for s in statuses.split(",") if s.strip()],
+            seed=int(seed) if seed else None,
+        )
+
+    def _draw(self):
+        """Tire la latence et l'éventuelle erreur d'une requête (sous verrou)."""
+        with self._lock:
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            status = None
+            if self.error_rate and self._random.random() < self.error_rate:
+                status = self._random.choice(self.error_statuses)
+                self.injected_errors += 1
+            return delay, status
+
+    def _inject_error(self, status: int):
+        headers = {"content-type": "application/json"}
+        if status == 429:
+            headers.update(
+                {
+                    "x-ratelimit-remaining": 0,
+                    "x-ratelimit-reset": DELAI_QUOTA_INJECTE,
+                }
+            )
+        try:
+            _make_response(status, b'{"detail": "erreur injectee"}', headers)
+        except Exception as e:
+            # Le limiteur de débit relit le délai de réouverture sur l'exception
+            e.headers = {"x_ratelimit_reset": DELAI_QUOTA_INJECTE}
+            raise
+        raise RuntimeError(f"Statut {status} non reconnu comme une erreur")
+
+    def send_request(self, method, url, params, headers):
+        fixture = self.store.load(method, url, params)
+        if fixture is None:
+            with self._lock:
+                self.missing += 1
+            if self.fallback is not None:
+                return self.fallback.send_request(method, url, params, headers)
+            _, key = self.store.request_key(method, url, params)
+            logger.warning(f"Aucune fixture pour {key}")
+            return _make_response(
+                404, b'{"detail": "fixture absente"}', {"content-type": "text/plain"}
+            )
+
+        delay, status = self._draw()
+        if delay > 0:
+            self._sleep(delay)
+        if status is not None:
+            self._inject_error(status)
+
+        with self._lock:
+            self.replayed += 1
+        body = json.dumps(fixture["corps"], ensure_ascii=False).encode("utf-8")
+        return _make_response(fixture["statut"], body, fixture.get("en_tetes", {}))
+
+    def close(self):
+        if self.fallback is not None:
+            self.fallback.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = {
+                "mode": "rejeu" if self.fallback is None else "rejeu_avec_repli",
+                "reponses_rejouees": self.replayed,
+                "fixtures_absentes": self.missing,
+                "erreurs_injectees": self.injected_errors,
+            }
+        if self.fallback is not None and hasattr(self.fallback, "stats"):
+            stats["repli"] = self.fallback.stats()
+        return stats
+
+
+def transport_from_env(create_http_transport: Callable[[], Any]):
+    """
+    Applique les modes USE_SAMPLE_DATA / SAMPLE_DATA_ONLY / SAMPLE_DATA_RECORD.
+
+    Args:
+        create_http_transport: Fabrique du transport HTTP réel, appelée
+            uniquement si le mode choisi a besoin du réseau
+
+    Returns:
+        Le transport à utiliser par les clients OpenAQ.
+    """
+    directory = os.getenv(
+        "SAMPLE_DATA_DIR",
+        os.path.join(os.getenv("DATA_DIR", "./data"), "samples", "openaq"),
+    )
+    store = FixtureStore(directory)
+
+    if sample_data_only():
+        logger.info(f"Rejeu strict des réponses OpenAQ depuis {directory}")
+        return ReplayTransport.from_env(store)
+    if _env_flag("SAMPLE_DATA_RECORD"):
+        logger.info(f"Enregistrement des réponses OpenAQ dans {directory}")
+        return RecordingTransport(create_http_transport(), store)
+    if _env_flag("USE_SAMPLE_DATA"):
+        logger.info(f"Rejeu des réponses OpenAQ depuis {directory} (repli sur l'API)")
+        return ReplayTransport.from_env(
+            store, fallback=RecordingTransport(create_http_transport(), store)
+        )
+    return create_http_transport()
@@ -0,0 +1,248 @@
+"""
+Cache de lecture des réponses de l'API OpenAQ (Redis avec repli sur fichiers)
+
+Les métadonnées des stations évoluent très peu d'un jour à l'autre : ce module
+conserve les réponses brutes de locations.list et locations.sensors, indexées
+par point d'accès et paramètres (ex: iso=SN, station_id), pour que les
+exécutions répétées ne consomment plus de quota API. Les entrées expirent après
+CACHE_MAX_AGE_HOURS. Si Redis n'est pas joignable, un cache local sur disque
+prend le relais.
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+import dataclasses
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PayloadDict(dict):
+    """
+    Dictionnaire accessible aussi par attributs (payload.results, location.country.name).
+
+    Les réponses relues depuis le cache sont reconstruites avec cette classe afin
+    que le code d'extraction existant, écrit pour les objets du SDK, fonctionne
+    sans modification. Les clés absentes lèvent AttributeError pour que hasattr()
+    se comporte comme sur un objet.
+    """
+
+    __slots__ = ()
+
+    def __getattr__(self, name: str):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+def to_payload(obj: Any) -> Any:
+    """
+    Convertit récursivement une réponse du SDK en structure JSON sérialisable.
+
+    Gère les dataclasses (y compris avec __slots__), les objets simples, les
+    dictionnaires, les listes et les dates.
+
+    Args:
+        obj: Objet de réponse OpenAQ ou valeur imbriquée
+
+    Returns:
+        Une structure composée uniquement de dict, list et types primitifs.
+    """
+    if obj is None or isinstance(obj, (str, int, float, bool)):
+        return obj
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, dict):
+        return {str(k): to_payload(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple, set)):
+        return [to_payload(v) for v in obj]
+    if dataclasses.is_dataclass(obj):
+        return {
+            field.name: to_payload(getattr(obj, field.name, None))
+            for field in dataclasses.fields(obj)
+        }
+    if hasattr(obj, "__dict__"):
+        return {k: to_payload(v) for k, v in vars(obj).items() if not k.startswith("_")}
+    return str(obj)
+
+
+def wrap_payload(data: Any) -> Any:
+    """Reconstruit récursivement un payload avec des PayloadDict."""
+    if isinstance(data, dict):
+        return PayloadDict((k, wrap_payload(v)) for k, v in data.items())
+    if isinstance(data, list):
+        return [wrap_payload(v) for v in data]
+    return data
+
+
+class RedisBackend:
+    """Stockage des entrées de cache dans Redis avec expiration native (SETEX)."""
+
+    name = "redis"
+
+    def __init__(self, url: str):
+        import redis
+
+        self.client = redis.Redis.from_url(url, socket_connect_timeout=2)
+        # Vérifie immédiatement la disponibilité pour pouvoir basculer sur le disque
+        self.client.ping()
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.client.get(key)
+        return value.decode("utf-8") if value is not None else None
+
+    def set(self, key: str, value: str, ttl_seconds: int):
+        self.client.setex(key, ttl_seconds, value)
+
+
+class FileBackend:
+    """Stockage des entrées de cache dans des fichiers JSON locaux horodatés."""
+
+    name = "fichier"
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        if entry.get("expire_a", 0) < time.time():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return entry.get("valeur")
+
+    def set(self, key: str, value: str, ttl_seconds: int):
+        path = self._path(key)
+        entry = {"cle": key, "expire_a": time.time() + ttl_seconds, "valeur": value}
+
+        # Écriture atomique : les threads concurrents ne lisent jamais un fichier partiel
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+class ResponseCache:
+    """
+    Cache de lecture (read-through) des réponses OpenAQ.
+
+    Les clés combinent le point d'accès (ex: "Locations.list") et ses paramètres
+    triés, de sorte que deux appels identiques partagent la même entrée.
+    """
+
+    def __init__(self, backend, ttl_seconds: int = 24 * 3600):
+        """
+        Initialise le cache.
+
+        Args:
+            backend: RedisBackend ou FileBackend
+            ttl_seconds: Durée de vie des entrées en secondes
+        """
+        self.backend = backend
+        self.ttl_seconds = int(ttl_seconds)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["ResponseCache"]:
+        """
+        Construit le cache selon CACHE_ENABLED, CACHE_MAX_AGE_HOURS, REDIS_URL et CACHE_DIR.
+
+        Returns:
+            ResponseCache, ou None si le cache est désactivé.
+        """
+        if os.getenv("CACHE_ENABLED", "False").lower() not in ["true", "1"]:
+            return None
+
+        ttl_seconds = float(os.getenv("CACHE_MAX_AGE_HOURS", "24")) * 3600
+        redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+        cache_dir = os.getenv(
+            "CACHE_DIR",
+            os.path.join(os.getenv("DATA_DIR", "./data"), "cache", "openaq"),
+        )
+
+        try:
+            backend = RedisBackend(redis_url)
+            logger.info(f"Cache Redis actif ({redis_url})")
+        except Exception as e:
+            logger.warning(
+                f"Redis indisponible ({type(e).__name__}), repli sur le cache fichier: {cache_dir}"
+            )
+            backend = FileBackend(cache_dir)
+
+        return cls(backend, ttl_seconds)
+
+    @staticmethod
+    def make_key(endpoint: str, params: Dict[str, Any]) -> str:
+        """Construit la clé de cache à partir du point d'accès et des paramètres."""
+        serialized = json.dumps(to_payload(params), sort_keys=True, ensure_ascii=False)
+        return f"openaq:{endpoint}:{serialized}"
+
+    def get(self, endpoint: str, params: Dict[str, Any]) -> Optional[Any]:
+        """
+        Retourne la réponse mise en cache, reconstruite en PayloadDict, ou None.
+
+        Une défaillance du stockage est traitée comme une absence d'entrée pour
+        ne jamais interrompre l'exploration.
+        """
+        try:
+            value = self.backend.get(self.make_key(endpoint, params))
+        except Exception as e:
+            logger.debug(f"Lecture du cache impossible pour {endpoint}: {e}")
+            value = None
+            with self._lock:
+                self.errors += 1
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        return wrap_payload(json.loads(value))
+
+    def set(self, endpoint: str, params: Dict[str, Any], response: Any):
+        """Enregistre la réponse brute sérialisée sous la clé du point d'accès."""
+        try:
+            value = json.dumps(to_payload(response), ensure_ascii=False)
+            self.backend.set(self.make_key(endpoint, params), value, self.ttl_seconds)
+        except Exception as e:
+            logger.debug(f"Écriture du cache impossible pour {endpoint}: {e}")
+            with self._lock:
+                self.errors += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Retourne les statistiques d'utilisation pour le résumé d'exploration."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "stockage": self.backend.name,
+                "entrees_trouvees": self.hits,
+                "entrees_absentes": self.misses,
+                "erreurs": self.errors,
+                "taux_succes": round(self.hits / total, 3) if total else 0,
+            }
@@ -0,0 +1,235 @@
+"""
+Accès direct aux points d'accès REST de l'API OpenAQ v3, sans objets du SDK
+
+Le SDK openaq construit une dataclass par station, capteur, paramètre, période
+de mesure... que l'exploration et la collecte aplatissent aussitôt en
+dictionnaires. Ce client léger interroge les mêmes points d'accès, décode le
+JSON avec orjson lorsqu'il est installé (json de la bibliothèque standard
+sinon) et renvoie des PayloadDict : les clés camelCase de l'API sont converties
+en snake_case comme dans le SDK, si bien que le code d'extraction existant
+(location.country.name, measurement.period.datetime_from.utc...) produit
+exactement les mêmes enregistrements.
+
+Seule la couche HTTP du SDK est réutilisée (transport à connexions keep-alive
+partagé par le pool, et conversion des codes HTTP en exceptions OpenAQ).
+Le client est sélectionné par OPENAQ_TRANSPORT=rest (voir client_pool).
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import re
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from response_cache import PayloadDict
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+    DECODEUR_JSON = "orjson"
+except ImportError:
+    _loads = json.loads
+    DECODEUR_JSON = "json"
+
+_MAJUSCULE = re.compile(r"(?<=[a-z0-9])([A-Z])")
+
+# Correspondance camelCase → snake_case, partagée par toutes les réponses
+_CLES_SNAKE_CASE: Dict[str, str] = {}
+
+# En-têtes de quota relus par le limiteur de débit
+_EN_TETES_QUOTA = (
+    "x-ratelimit-limit",
+    "x-ratelimit-remaining",
+    "x-ratelimit-used",
+    "x-ratelimit-reset",
+)
+
+
+def _snake_case(key: str) -> str:
+    """Convertit une clé de l'API (datetimeFirst) en attribut du SDK (datetime_first)."""
+    converted = _CLES_SNAKE_CASE.get(key)
+    if converted is None:
+        converted = _CLES_SNAKE_CASE[key] = _MAJUSCULE.sub(r"_\1", key).lower()
+    return converted
+
+
+def _convert_dict(data: dict) -> PayloadDict:
+    cles = _CLES_SNAKE_CASE
+    converted = PayloadDict()
+    for key, value in data.items():
+        # Seuls les conteneurs sont parcourus : les scalaires sont repris tels quels
+        kind = type(value)
+        if kind is dict:
+            value = _convert_dict(value)
+        elif kind is list:
+            value = _convert_list(value)
+        converted[cles.get(key) or _snake_case(key)] = value
+    return converted
+
+
+def _convert_list(data: list) -> list:
+    return [
+        (
+            _convert_dict(value)
+            if type(value) is dict
+            else _convert_list(value) if type(value) is list else value
+        )
+        for value in data
+    ]
+
+
+def to_payload_dict(data: Any) -> Any:
+    """Reconstruit récursivement un document JSON décodé en PayloadDict snake_case."""
+    if type(data) is dict:
+        return _convert_dict(data)
+    if type(data) is list:
+        return _convert_list(data)
+    return data
+
+
+@dataclass
+class RestResponse:
+    """Réponse d'un point d'accès, avec la même forme que les réponses du SDK."""
+
+    headers: Dict[str, int]
+    meta: PayloadDict
+    results: List[PayloadDict]
+
+
+class Locations:
+    """Points d'accès /locations (mêmes méthodes que client.locations du SDK)."""
+
+    def __init__(self, client: "RestClient"):
+        self._client = client
+
+    def list(
+        self,
+        page: int = 1,
+        limit: int = 100,
+        iso: Optional[str] = None,
+        bbox=None,
+        coordinates=None,
+        radius: Optional[int] = None,
+        order_by: Optional[str] = None,
+        sort_order: Optional[str] = None,
+        **filters,
+    ) -> RestResponse:
+        """Liste les stations ; filtres identiques à Locations.list du SDK."""
+        return self._client._get(
+            "/locations",
+            page=page,
+            limit=limit,
+            iso=iso,
+            bbox=bbox,
+            coordinates=coordinates,
+            radius=radius,
+            order_by=order_by,
+            sort_order=sort_order,
+            **filters,
+        )
+
+    def sensors(self, locations_id: int) -> RestResponse:
+        """Capteurs d'une station."""
+        return self._client._get(f"/locations/{int(locations_id)}/sensors")
+
+
+class Measurements:
+    """Point d'accès /sensors/{id}/{data} (même méthode que client.measurements)."""
+
+    def __init__(self, client: "RestClient"):
+        self._client = client
+
+    def list(
+        self,
+        sensors_id: int,
+        data: str = "measurements",
+        rollup: Optional[str] = None,
+        datetime_from=None,
+        datetime_to=None,
+        date_from=None,
+        date_to=None,
+        page: int = 1,
+        limit: int = 1000,
+    ) -> RestResponse:
+        """Mesures d'un capteur pour une granularité donnée."""
+        from openaq.core.validators import validate_datetime_params
+
+        # Mêmes contrôles et même normalisation des dates que le SDK : les deux
+        # clients envoient des requêtes identiques (cache et fixtures partagés)
+        datetime_from, datetime_to, date_from, date_to = validate_datetime_params(
+            data, datetime_from, datetime_to, date_from, date_to
+        )
+        path = f"/sensors/{int(sensors_id)}/{data}"
+        if rollup:
+            path += f"/{rollup}"
+        return self._client._get(
+            path,
+            page=page,
+            limit=limit,
+            datetime_from=datetime_from,
+            datetime_to=datetime_to,
+            date_from=date_from,
+            date_to=date_to,
+        )
+
+
+class RestClient:
+    """
+    Client OpenAQ v3 minimal renvoyant des PayloadDict au lieu d'objets du SDK.
+
+    Expose locations.list, locations.sensors et measurements.list avec les
+    mêmes signatures que le SDK ; les noms de classes identiques (Locations,
+    Measurements) font partager au cache de réponses les mêmes entrées.
+    """
+
+    def __init__(self, api_key: str, base_url: str, transport):
+        """
+        Args:
+            api_key: Clé API OpenAQ
+            base_url: URL de base de l'API v3
+            transport: Transport HTTP du SDK (fourni par le pool de connexions)
+        """
+        if not api_key:
+            raise ValueError("Clé API OpenAQ requise pour le transport REST")
+
+        self.base_url = base_url.rstrip("/")
+        self.transport = transport
+        self.headers = {
+            "X-API-Key": api_key,
+            "Accept": "application/json",
+            "User-Agent": f"senegalairwatch-rest ({DECODEUR_JSON})",
+        }
+        self.locations = Locations(self)
+        self.measurements = Measurements(self)
+
+    def _get(self, path: str, **params) -> RestResponse:
+        """Exécute une requête GET et décode la réponse sans objets intermédiaires."""
+        from openaq.core.models import build_query_params
+
+        response = self.transport.send_request(
+            "GET", self.base_url + path, build_query_params(**params), self.headers
+        )
+        # Corps brut : évite un décodage en str avant orjson
+        document = _loads(getattr(response, "_raw_bytes", None) or response.text)
+
+        headers = response.headers
+        quota = {}
+        for name in _EN_TETES_QUOTA:
+            value = headers.get(name)
+            if value is not None and value.isdigit():
+                quota[name.replace("-", "_")] = int(value)
+
+        return RestResponse(
+            headers=quota,
+            meta=to_payload_dict(document.get("meta") or {}),
+            results=to_payload_dict(document.get("results") or []),
+        )
+
+    def close(self):
+        """Sans effet : les connexions appartiennent au pool qui a créé le client."""
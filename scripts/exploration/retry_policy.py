@@ -0,0 +1,138 @@
+"""
+Politique de réessai pour les erreurs transitoires de l'API OpenAQ
+
+Ce module relance automatiquement les appels qui échouent pour des raisons
+passagères (erreurs serveur 5xx, dépassement de quota, coupure réseau) avec un
+délai exponentiel plafonné et aléatoire (jitter), dans la limite d'une échéance
+par appel. Les relances sont comptabilisées pour le résumé d'exploration.
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import os
+import time
+import random
+import logging
+import threading
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class RetryPolicy:
+    """
+    Relance les appels en échec transitoire avec un backoff exponentiel plafonné.
+
+    Le délai avant la tentative n est tiré uniformément entre 0 et
+    min(max_delay, base_delay * 2^n) ("full jitter"), ce qui évite que des
+    requêtes concurrentes ne se relancent toutes au même instant.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 4,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        deadline: float = 300.0,
+    ):
+        """
+        Initialise la politique de réessai.
+
+        Args:
+            max_retries: Nombre maximal de relances par appel
+            base_delay: Délai de base en secondes avant la première relance
+            max_delay: Plafond du délai entre deux tentatives, en secondes
+            deadline: Durée maximale d'un appel, relances comprises, en secondes
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+
+        self._lock = threading.Lock()
+        self.retries_by_operation: Dict[str, int] = {}
+        self.abandoned_calls = 0
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        """Construit une politique à partir des variables API_MAX_RETRIES et associées."""
+        return cls(
+            max_retries=int(os.getenv("API_MAX_RETRIES", "4")),
+            base_delay=float(os.getenv("API_RETRY_BASE_DELAY", "1.0")),
+            max_delay=float(os.getenv("API_RETRY_MAX_DELAY", "30.0")),
+            deadline=float(os.getenv("API_CALL_DEADLINE", "300.0")),
+        )
+
+    def compute_delay(self, attempt: int) -> float:
+        """Calcule le délai avant la relance numéro attempt (à partir de 0)."""
+        ceiling = min(self.max_delay, self.base_delay * (2**attempt))
+        return random.uniform(0, ceiling)
+
+    def call(
+        self,
+        func: Callable[..., Any],
+        *args,
+        is_retryable: Callable[[BaseException], bool] = None,
+        operation: str = None,
+        **kwargs,
+    ) -> Any:
+        """
+        Exécute func et la relance tant que l'erreur est transitoire.
+
+        Args:
+            func: Fonction à exécuter
+            is_retryable: Prédicat indiquant si une exception justifie une relance
+            operation: Nom de l'opération pour les statistiques et les logs
+            *args, **kwargs: Arguments transmis à func
+
+        Returns:
+            Le résultat de func.
+
+        Raises:
+            La dernière exception rencontrée si les relances sont épuisées,
+            si l'échéance est dépassée ou si l'erreur n'est pas transitoire.
+        """
+        operation = operation or getattr(func, "__qualname__", "appel")
+        started = time.monotonic()
+        attempt = 0
+
+        while True:
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                if is_retryable is None or not is_retryable(e):
+                    raise
+
+                delay = self.compute_delay(attempt)
+                elapsed = time.monotonic() - started
+
+                if attempt >= self.max_retries or elapsed + delay > self.deadline:
+                    with self._lock:
+                        self.abandoned_calls += 1
+                    logger.error(
+                        f"{operation}: abandon après {attempt} relance(s) "
+                        f"en {elapsed:.1f}s ({type(e).__name__}: {e})"
+                    )
+                    raise
+
+                attempt += 1
+                with self._lock:
+                    self.retries_by_operation[operation] = (
+                        self.retries_by_operation.get(operation, 0) + 1
+                    )
+
+                logger.warning(
+                    f"{operation}: erreur transitoire ({type(e).__name__}), "
+                    f"relance {attempt}/{self.max_retries} dans {delay:.1f}s"
+                )
+                time.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        """Retourne les compteurs de relances pour le résumé d'exploration."""
+        with self._lock:
+            return {
+                "relances_totales": sum(self.retries_by_operation.values()),
+                "relances_par_operation": dict(self.retries_by_operation),
+                "appels_abandonnes": self.abandoned_calls,
+            }
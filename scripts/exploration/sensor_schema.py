@@ -0,0 +1,277 @@
+"""
+Schéma déclaratif et versionné d'extraction des capteurs OpenAQ
+
+La correspondance entre les objets Sensor renvoyés par locations.sensors et nos
+enregistrements de capteurs est décrite ici sous forme de données : pour chaque
+champ, un chemin d'attribut, ou plusieurs chemins essayés dans l'ordre. Une
+évolution de la structure du SDK se traite en ajoutant une version de schéma,
+sans toucher au code d'extraction.
+
+L'extraction travaille sur une page complète de résultats à la fois, champ par
+champ, avec les accesseurs précompilés du module extraction, et comptabilise
+les champs retombés sur la valeur par défaut ("N/A"). Elle reste en Python pur,
+sans pandas ni NumPy : une page de locations.sensors compte quelques capteurs,
+sous forme d'objets imbriqués (SDK ou PayloadDict). Les convertir en tableaux
+coûterait plus que l'extraction elle-même, puisque l'explorateur valide
+ensuite chaque capteur individuellement.
+
+La structure de la première page extraite est résumée par une empreinte (hachage
+des chemins d'attributs), comparée hors ligne à celle de l'exécution précédente
+et aux chemins du schéma : un changement de structure de l'API est signalé sans
+requête de diagnostic supplémentaire.
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+import dataclasses
+from typing import Any, Dict, List, Optional, Sequence
+
+from extraction import compile_accessor
+
+logger = logging.getLogger(__name__)
+
+# Versions successives du schéma. Un chemin unique ou un tuple de chemins
+# alternatifs : le premier qui fournit une valeur l'emporte.
+SCHEMAS_CAPTEUR: Dict[int, Dict[str, Any]] = {
+    1: {
+        "description": "SDK openaq 0.x/1.x : sensor.parameter est un dictionnaire",
+        "champs": {
+            "capteur_id": "id",
+            "capteur_nom": "name",
+            "parametre_id": "parameter.id",
+            "parametre_nom": "parameter.name",
+            "parametre_nom_affichage": ("parameter.display_name", "parameter.name"),
+            "unite_mesure": "parameter.units",
+        },
+    },
+}
+
+VERSION_SCHEMA_CAPTEUR = max(SCHEMAS_CAPTEUR)
+
+# Profondeur des chemins retenus dans l'empreinte (ex: parameter.units)
+PROFONDEUR_EMPREINTE = 3
+
+
+def _alternatives(paths) -> tuple:
+    """Chemins d'un champ du schéma : un chemin unique ou un tuple d'alternatives."""
+    return (paths,) if isinstance(paths, str) else tuple(paths)
+
+
+def structure_paths(obj, prefix: str = "", depth: int = PROFONDEUR_EMPREINTE):
+    """
+    Chemins d'attributs d'un objet de l'API, quel que soit son type.
+
+    Objets du SDK (dataclasses), dictionnaires et PayloadDict donnent les mêmes
+    chemins pour une même réponse : l'empreinte ne dépend ni du transport ni
+    du cache. Les valeurs nulles sont ignorées, car le SDK expose à None les
+    champs optionnels que le JSON omet.
+    """
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        items = [(f.name, getattr(obj, f.name, None)) for f in dataclasses.fields(obj)]
+    elif isinstance(obj, dict):
+        items = obj.items()
+    elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+        items = [(k, v) for k, v in vars(obj).items() if not k.startswith("_")]
+    else:
+        return []
+
+    paths = []
+    for key, value in items:
+        if value is None:
+            continue
+        path = f"{prefix}{key}"
+        paths.append(path)
+        if depth > 1:
+            paths.extend(structure_paths(value, f"{path}.", depth - 1))
+    return paths
+
+
+def compare_fingerprint(fingerprint: Dict[str, Any], path: str) -> Dict[str, Any]:
+    """
+    Compare une empreinte de structure à celle enregistrée lors de l'exécution
+    précédente, puis enregistre la nouvelle si elle a changé.
+
+    Args:
+        fingerprint: Résultat de SensorExtractor.fingerprint()
+        path: Fichier JSON de l'empreinte de référence
+
+    Returns:
+        Dict: Empreinte, statut de comparaison et chemins ajoutés ou retirés.
+    """
+    previous = None
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+
+    result = {
+        "empreinte": fingerprint["empreinte"],
+        "version_schema": fingerprint["version_schema"],
+        "champs_sans_chemin": fingerprint["champs_sans_chemin"],
+        "statut": "inchangée",
+    }
+    if previous is None:
+        result["statut"] = "nouvelle référence"
+    elif previous.get("empreinte") != fingerprint["empreinte"]:
+        chemins, anciens = set(fingerprint["chemins"]), set(previous.get("chemins", []))
+        result.update(
+            statut="modifiée",
+            empreinte_precedente=previous.get("empreinte"),
+            chemins_ajoutes=sorted(chemins - anciens),
+            chemins_retires=sorted(anciens - chemins),
+        )
+        logger.warning(
+            f"Structure des capteurs modifiée depuis l'exécution précédente: "
+            f"ajoutés {result['chemins_ajoutes']}, retirés {result['chemins_retires']}"
+        )
+
+    if fingerprint["champs_sans_chemin"]:
+        logger.warning(
+            f"Champs du schéma v{fingerprint['version_schema']} absents de la réponse: "
+            f"{fingerprint['champs_sans_chemin']} (EXPLORATION_DIAGNOSTICS=True pour "
+            f"examiner la réponse)"
+        )
+
+    if result["statut"] != "inchangée":
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(fingerprint, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    return result
+
+
+class SensorExtractor:
+    """
+    Extracteur de pages de capteurs piloté par un schéma versionné.
+
+    Les statistiques (capteurs extraits, valeurs par défaut par champ) sont
+    cumulées de manière thread-safe pour le résumé d'exploration.
+    """
+
+    def __init__(self, version: int = VERSION_SCHEMA_CAPTEUR, default="N/A"):
+        """
+        Args:
+            version: Version du schéma dans SCHEMAS_CAPTEUR
+            default: Valeur des champs introuvables
+        """
+        if version not in SCHEMAS_CAPTEUR:
+            raise ValueError(
+                f"Version de schéma capteur inconnue: {version} "
+                f"(disponibles: {sorted(SCHEMAS_CAPTEUR)})"
+            )
+
+        self.version = version
+        self.default = default
+        self._accessors = {
+            name: tuple(compile_accessor(path) for path in _alternatives(paths))
+            for name, paths in SCHEMAS_CAPTEUR[version]["champs"].items()
+        }
+
+        self._lock = threading.Lock()
+        self.extracted = 0
+        self.fallbacks = {name: 0 for name in self._accessors}
+        # Chemins observés sur la première page non vide
+        self.structure: Optional[List[str]] = None
+
+    @classmethod
+    def from_env(cls) -> "SensorExtractor":
+        """Construit l'extracteur selon SENSOR_SCHEMA_VERSION (dernière version par défaut)."""
+        return cls(int(os.getenv("SENSOR_SCHEMA_VERSION", VERSION_SCHEMA_CAPTEUR)))
+
+    @property
+    def fields(self) -> List[str]:
+        """Champs produits, dans l'ordre du schéma."""
+        return list(self._accessors)
+
+    def _extract_column(self, results: Sequence[Any], accessors) -> List[Any]:
+        default = self.default
+        column = [accessors[0](sensor, default) for sensor in results]
+
+        # Chemins alternatifs, uniquement pour les lignes encore sans valeur
+        for accessor in accessors[1:]:
+            column = [
+                accessor(sensor, default) if value is default else value
+                for sensor, value in zip(results, column)
+            ]
+        return column
+
+    def extract_page(self, results: Sequence[Any]) -> Dict[str, List[Any]]:
+        """
+        Extrait une page de capteurs, colonne par colonne (sans vectorisation :
+        voir l'en-tête du module).
+
+        Args:
+            results: Capteurs d'une réponse locations.sensors
+
+        Returns:
+            Dict: Nom du champ → liste des valeurs, dans l'ordre des capteurs.
+        """
+        if self.structure is None and results:
+            self._observe_structure(results)
+
+        columns = {
+            name: self._extract_column(results, accessors)
+            for name, accessors in self._accessors.items()
+        }
+        fallbacks = {
+            name: sum(1 for value in column if value is self.default)
+            for name, column in columns.items()
+        }
+
+        with self._lock:
+            self.extracted += len(results)
+            for name, count in fallbacks.items():
+                self.fallbacks[name] += count
+
+        if any(fallbacks.values()):
+            logger.debug(f"Valeurs par défaut sur la page: {fallbacks}")
+        return columns
+
+    def _observe_structure(self, results: Sequence[Any]):
+        paths = set()
+        for sensor in results:
+            paths.update(structure_paths(sensor))
+        with self._lock:
+            if self.structure is None:
+                self.structure = sorted(paths)
+
+    def fingerprint(self) -> Optional[Dict[str, Any]]:
+        """
+        Empreinte de la structure des capteurs déjà extraits, sans requête.
+
+        Returns:
+            Dict: Hachage des chemins observés, chemins, et champs du schéma
+            dont aucun chemin n'apparaît ; None si aucun capteur n'a été extrait.
+        """
+        with self._lock:
+            structure = self.structure
+        if structure is None:
+            return None
+
+        presents = set(structure)
+        return {
+            "empreinte": hashlib.sha256("\n".join(structure).encode()).hexdigest()[:12],
+            "version_schema": self.version,
+            "chemins": structure,
+            "champs_sans_chemin": [
+                name
+                for name, paths in SCHEMAS_CAPTEUR[self.version]["champs"].items()
+                if not any(path in presents for path in _alternatives(paths))
+            ],
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Retourne les compteurs d'extraction pour le résumé d'exploration."""
+        with self._lock:
+            return {
+                "version_schema": self.version,
+                "capteurs_extraits": self.extracted,
+                "valeurs_par_defaut": dict(self.fallbacks),
+            }
@@ -0,0 +1,154 @@
+"""
+Export JSON en flux (document JSON ou JSON Lines), avec compression optionnelle
+
+Plutôt que d'assembler un grand dictionnaire puis de le sérialiser d'un bloc
+avec indentation, les enregistrements sont écrits un par un au fil de leur
+production. La mémoire utilisée ne dépend donc plus du nombre de stations, de
+capteurs ou de mesures exportés, et chaque enregistrement passe par
+l'encodeur JSON compilé de la bibliothèque standard.
+
+Compression : "gzip" (bibliothèque standard) ou "zstd" (paquet optionnel
+zstandard ; repli sur gzip s'il est absent).
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import io
+import os
+import gzip
+import json
+import logging
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, List, Optional, TextIO
+
+logger = logging.getLogger(__name__)
+
+EXTENSIONS_COMPRESSION = {None: "", "gzip": ".gz", "zstd": ".zst"}
+
+
+def compression_from_env() -> Optional[str]:
+    """Lit EXPORT_COMPRESSION ("gzip", "zstd" ; vide ou "none" pour aucune)."""
+    value = os.getenv("EXPORT_COMPRESSION", "").strip().lower()
+    return value if value in ("gzip", "zstd") else None
+
+
+def resolve_compression(compression: Optional[str]) -> Optional[str]:
+    """Retourne la compression effectivement utilisable (zstd → gzip sans zstandard)."""
+    if compression == "zstd":
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            logger.warning("Paquet zstandard absent : compression gzip utilisée")
+            return "gzip"
+    return compression
+
+
+def compressed_filename(filename: str, compression: Optional[str]) -> str:
+    """Ajoute l'extension de la compression au nom de fichier."""
+    return filename + EXTENSIONS_COMPRESSION[compression]
+
+
+def open_text_output(filename: str, compression: Optional[str] = None) -> TextIO:
+    """
+    Ouvre un fichier texte UTF-8 en écriture, compressé ou non.
+
+    Args:
+        filename: Chemin complet, extension de compression comprise
+        compression: None, "gzip" ou "zstd" (déjà résolue)
+    """
+    if compression == "gzip":
+        return gzip.open(filename, "wt", encoding="utf-8", compresslevel=6)
+    if compression == "zstd":
+        import zstandard
+
+        raw = open(filename, "wb")
+        writer = zstandard.ZstdCompressor(level=3).stream_writer(raw, closefd=True)
+        return io.TextIOWrapper(writer, encoding="utf-8")
+    return open(filename, "w", encoding="utf-8")
+
+
+def _default(value: Any) -> Any:
+    """Sérialise les vues de lignes (RecordRow) comme des objets, le reste en texte."""
+    if isinstance(value, Mapping):
+        return dict(value)
+    return str(value)
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, default=_default)
+
+
+def write_json_document(
+    stream: TextIO,
+    header: Dict[str, Any],
+    sections: Dict[str, Iterable[Dict[str, Any]]],
+) -> Dict[str, int]:
+    """
+    Écrit un document JSON objet dont les tableaux sont produits en flux.
+
+    Le document a la forme {**header, "section": [enregistrement, ...], ...},
+    avec un enregistrement par ligne : il reste lisible par json.load tout en
+    n'étant jamais entièrement présent en mémoire.
+
+    Args:
+        stream: Flux texte ouvert en écriture
+        header: Valeurs scalaires ou petits objets écrits en tête (métadonnées, résumé)
+        sections: Itérables d'enregistrements, consommés un à un
+
+    Returns:
+        Dict: Nombre d'enregistrements écrits par section.
+    """
+    counts = {}
+    stream.write("{\n")
+
+    for index, (key, value) in enumerate(header.items()):
+        stream.write(f"{_dumps(key)}: {_dumps(value)}")
+        stream.write(",\n" if index < len(header) - 1 or sections else "\n")
+
+    for index, (key, records) in enumerate(sections.items()):
+        stream.write(f"{_dumps(key)}: [")
+        count = 0
+        for record in records:
+            stream.write(",\n" if count else "\n")
+            stream.write(_dumps(record))
+            count += 1
+        stream.write("\n]" if count else "]")
+        stream.write(",\n" if index < len(sections) - 1 else "\n")
+        counts[key] = count
+
+    stream.write("}\n")
+    return counts
+
+
+class JsonLinesSink:
+    """
+    Puits de données écrivant les mesures en JSON Lines (un objet par ligne).
+
+    Même interface que les autres puits : write(records) puis close().
+    """
+
+    def __init__(self, filename: str, compression: Optional[str] = None):
+        """
+        Args:
+            filename: Chemin du fichier, sans extension de compression
+            compression: None, "gzip" ou "zstd"
+        """
+        self.compression = resolve_compression(compression)
+        self.filename = compressed_filename(filename, self.compression)
+        self.rows_written = 0
+        self._stream = None
+
+    def write(self, records: List[Dict[str, Any]]):
+        """Ajoute un bloc de mesures au fichier."""
+        if self._stream is None:
+            self._stream = open_text_output(self.filename, self.compression)
+
+        self._stream.writelines(_dumps(record) + "\n" for record in records)
+        self.rows_written += len(records)
+
+    def close(self):
+        """Ferme le fichier (et termine la trame de compression) s'il a été ouvert."""
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
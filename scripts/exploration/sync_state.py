@@ -0,0 +1,132 @@
+"""
+État de synchronisation incrémentale de la collecte des mesures
+
+Ce module conserve, pour chaque capteur, l'horodatage de la dernière mesure
+écrite (high-watermark) et, pour chaque station, la valeur de derniere_mesure
+observée lors de la dernière collecte complète. Une collecte incrémentale ne
+demande ainsi que les mesures plus récentes et ignore entièrement les stations
+qui n'ont rien publié depuis.
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import os
+import json
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """
+    Convertit un horodatage ISO 8601 d'OpenAQ en datetime UTC comparable.
+
+    Les formats "2025-01-01T00:00:00Z" et "2025-01-01T00:00:00+00:00" sont
+    équivalents ; une date sans fuseau est considérée comme UTC.
+
+    Returns:
+        datetime avec fuseau UTC, ou None si la valeur est absente ou invalide.
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+class WatermarkStore:
+    """
+    Stockage persistant (fichier JSON) des high-watermarks de synchronisation.
+
+    Les watermarks de capteurs ne font qu'avancer : une mise à jour avec un
+    horodatage plus ancien est ignorée. Le fichier est réécrit de manière
+    atomique pour qu'une interruption ne le laisse jamais corrompu.
+    """
+
+    def __init__(self, path: str):
+        """
+        Charge l'état existant s'il y en a un.
+
+        Args:
+            path: Chemin du fichier JSON d'état
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._state = {"capteurs": {}, "stations": {}}
+
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self._state.update(json.load(f))
+            logger.info(
+                f"État de synchronisation chargé: {len(self._state['capteurs'])} capteurs"
+            )
+
+    @classmethod
+    def from_env(cls, data: str = "hours") -> "WatermarkStore":
+        """Ouvre l'état désigné par WATERMARK_FILE, un fichier par granularité par défaut."""
+        default_path = os.path.join(
+            os.getenv("DATA_DIR", "./data"), "state", f"watermarks_{data}.json"
+        )
+        return cls(os.getenv("WATERMARK_FILE", default_path))
+
+    def sensor_watermark(self, capteur_id) -> Optional[str]:
+        """Horodatage de la dernière mesure écrite pour ce capteur."""
+        with self._lock:
+            return self._state["capteurs"].get(str(capteur_id))
+
+    def advance_sensor(self, capteur_id, timestamp: str):
+        """Avance le watermark du capteur si timestamp est plus récent."""
+        new_value = parse_timestamp(timestamp)
+        if new_value is None:
+            return
+
+        with self._lock:
+            key = str(capteur_id)
+            current = parse_timestamp(self._state["capteurs"].get(key))
+            if current is None or new_value > current:
+                self._state["capteurs"][key] = timestamp
+
+    def station_last_seen(self, station_id) -> Optional[str]:
+        """Valeur de derniere_mesure lors de la dernière collecte complète de la station."""
+        with self._lock:
+            return self._state["stations"].get(str(station_id))
+
+    def mark_station(self, station_id, derniere_mesure: Optional[str]):
+        """Enregistre la derniere_mesure d'une station entièrement synchronisée."""
+        if derniere_mesure is None:
+            return
+        with self._lock:
+            self._state["stations"][str(station_id)] = derniere_mesure
+
+    def is_station_unchanged(self, station: Dict[str, Any]) -> bool:
+        """
+        Indique si la station n'a publié aucune mesure depuis la dernière synchronisation.
+
+        Args:
+            station: Enregistrement de station avec station_id et derniere_mesure
+        """
+        last_seen = parse_timestamp(self.station_last_seen(station["station_id"]))
+        current = parse_timestamp(station.get("derniere_mesure"))
+        return last_seen is not None and current is not None and current <= last_seen
+
+    def save(self):
+        """Écrit l'état sur disque de manière atomique."""
+        with self._lock:
+            snapshot = json.dumps(self._state, ensure_ascii=False, indent=2)
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(snapshot)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,174 @@
+"""
+Client OpenAQ en mémoire pour les tests et les bancs d'essai
+
+Sert, sans réseau ni quota, un parc synthétique de stations généré par le
+MockDataset du serveur simulé, au format de l'API v3 : locations.list (pages,
+filtres iso, bbox et coordinates/radius), locations.sensors et
+measurements.list. Les réponses ont la forme de celles de RestClient
+(RestResponse de PayloadDict) ; stations et capteurs sont convertis une fois
+pour toutes à la construction du jeu.
+
+Module de test, hors des scripts livrés : utilisé par tests/ (tests
+unitaires) et par benchmarks/ (pytest-benchmark), qui ajoute tests/ à son
+sys.path.
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from mock_openaq_server import CAPTEURS_PAR_STATION_MAX, PAS_DONNEES, MockDataset
+from rate_limiter import TokenBucketRateLimiter
+from replay_transport import CLE_API_FACTICE
+from rest_transport import RestResponse, to_payload_dict
+from sync_state import parse_timestamp
+
+# Date de référence fixe : les jeux sont identiques d'une exécution à l'autre
+REFERENCE = datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+# Débit illimité : le limiteur reste sur le chemin mesuré sans jamais attendre
+DEBIT_ILLIMITE = 1e12
+
+TAILLE_PAGE = 1000
+
+
+def _filtre_texte(valeur):
+    """Filtre tel que l'envoie le client HTTP ("a,b,c") depuis un tuple du SDK."""
+    if isinstance(valeur, (tuple, list)):
+        return ",".join(str(v) for v in valeur)
+    return valeur
+
+
+class JeuSynthetique:
+    """Réponses de l'API pour un parc de stations, converties une fois pour toutes."""
+
+    def __init__(self, stations: int, reference: datetime = REFERENCE):
+        self.dataset = MockDataset(stations=stations, reference=reference)
+        self.taille = stations
+        self.locations = [
+            to_payload_dict(self.dataset.location(i)) for i in range(1, stations + 1)
+        ]
+        self.capteurs = {
+            location.id: to_payload_dict(location.sensors)
+            for location in self.locations
+        }
+        self._selections: Dict[tuple, List] = {}
+
+    def stations(self):
+        """Stations au format produit par la découverte (id et nom)."""
+        return [{"station_id": loc.id, "nom": loc.name} for loc in self.locations]
+
+    def selection(self, iso=None, bbox=None, coordinates=None, radius=None) -> List:
+        """Stations répondant aux filtres de locations.list, dans l'ordre des id."""
+        if bbox is None and coordinates is None and iso in (None, "SN"):
+            return self.locations
+
+        cle = (iso, _filtre_texte(bbox), _filtre_texte(coordinates), radius)
+        if cle not in self._selections:
+            self._selections[cle] = [
+                self.locations[i - 1] for i in self.dataset.location_ids(*cle)
+            ]
+        return self._selections[cle]
+
+
+class _LocationsFactices:
+    def __init__(self, jeu: JeuSynthetique):
+        self._jeu = jeu
+
+    def list(
+        self,
+        page: int = 1,
+        limit: int = TAILLE_PAGE,
+        iso=None,
+        bbox=None,
+        coordinates=None,
+        radius=None,
+        **filters,
+    ):
+        locations = self._jeu.selection(iso, bbox, coordinates, radius)
+        debut = (page - 1) * limit
+        meta = {"page": page, "limit": limit, "found": len(locations)}
+        return RestResponse(
+            headers={},
+            meta=to_payload_dict(meta),
+            results=locations[debut : debut + limit],
+        )
+
+    def sensors(self, locations_id: int):
+        return RestResponse(
+            headers={}, meta={}, results=self._jeu.capteurs.get(locations_id, [])
+        )
+
+
+class _MesuresFactices:
+    def __init__(self, jeu: JeuSynthetique):
+        self._jeu = jeu
+
+    def list(
+        self,
+        sensors_id: int,
+        data: str = "measurements",
+        datetime_from=None,
+        datetime_to=None,
+        date_from=None,
+        date_to=None,
+        page: int = 1,
+        limit: int = TAILLE_PAGE,
+        **filters,
+    ):
+        dataset = self._jeu.dataset
+        station_id, rang = divmod(sensors_id, CAPTEURS_PAR_STATION_MAX)
+        capteurs = (
+            dataset.sensors(station_id) if 1 <= station_id <= dataset.stations else []
+        )
+        if data not in PAS_DONNEES or rang >= len(capteurs):
+            raise ValueError(f"Capteur inconnu: {sensors_id} ({data})")
+
+        debut, pas, nombre = dataset.measurement_periods(
+            sensors_id,
+            data,
+            parse_timestamp(datetime_from or date_from),
+            parse_timestamp(datetime_to or date_to),
+        )
+        premier = (page - 1) * limit
+        meta = {"page": page, "limit": limit, "found": nombre}
+        return RestResponse(
+            headers={},
+            meta=to_payload_dict(meta),
+            results=[
+                to_payload_dict(
+                    dataset.measurement(capteurs[rang], debut + i * pas, pas)
+                )
+                for i in range(premier, min(premier + limit, nombre))
+            ],
+        )
+
+
+class ClientFactice:
+    """Client OpenAQ servant un JeuSynthetique (mêmes méthodes que RestClient)."""
+
+    def __init__(self, jeu: JeuSynthetique):
+        self.locations = _LocationsFactices(jeu)
+        self.measurements = _MesuresFactices(jeu)
+
+
+def nouvel_explorateur(jeu: JeuSynthetique, **options):
+    """
+    Explorateur neuf relié au client factice, sans cache ni réseau.
+
+    Args:
+        jeu: Parc de stations servi par le client
+        **options: Arguments supplémentaires de ExploratorStationsSenegal
+    """
+    from openaq_explorer import ExploratorStationsSenegal
+
+    options.setdefault(
+        "rate_limiter", TokenBucketRateLimiter(requests_per_minute=DEBIT_ILLIMITE)
+    )
+    explorer = ExploratorStationsSenegal(api_key=CLE_API_FACTICE, **options)
+    # Pas de cache même si CACHE_ENABLED est défini : seul le parcours est mesuré
+    explorer.cache = None
+    explorer.client = ClientFactice(jeu)
+    return explorer
@@ -0,0 +1,92 @@
+"""
+Configuration commune des tests unitaires des scripts d'exploration
+
+Les modules de scripts/exploration sont importés directement (même sys.path
+que la suite benchmarks/). Les tests du pipeline utilisent le client OpenAQ en
+mémoire de client_factice : aucun accès réseau, aucune clé API, aucun quota.
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import os
+import sys
+
+import pytest
+
+REPERTOIRE_SCRIPTS = os.path.join(
+    os.path.dirname(__file__), "..", "scripts", "exploration"
+)
+
+sys.path.insert(0, REPERTOIRE_SCRIPTS)
+
+from client_factice import JeuSynthetique, nouvel_explorateur  # noqa: E402
+
+# Parc réduit : plusieurs pages de découverte sans ralentir la suite
+TAILLE_JEU = 40
+
+
+class Horloge:
+    """
+    Horloge simulée remplaçant le module time d'un module testé.
+
+    sleep() avance l'horloge au lieu d'attendre : les délais (quota, relances,
+    expiration du cache) se vérifient exactement et instantanément.
+    """
+
+    def __init__(self, depart: float = 1000.0):
+        self.maintenant = depart
+        self.attentes = []
+
+    def monotonic(self) -> float:
+        return self.maintenant
+
+    def time(self) -> float:
+        return self.maintenant
+
+    def perf_counter(self) -> float:
+        return self.maintenant
+
+    def sleep(self, duree: float):
+        self.attentes.append(duree)
+        self.maintenant += duree
+
+    def avancer(self, duree: float):
+        self.maintenant += duree
+
+
+@pytest.fixture
+def horloge() -> Horloge:
+    return Horloge()
+
+
+@pytest.fixture(autouse=True)
+def environnement_neutre(monkeypatch, tmp_path):
+    """Isole les tests des variables d'un .env local (cache, requêtes, fichiers)."""
+    for variable in (
+        "CACHE_ENABLED",
+        "DISCOVERY_QUERIES",
+        "DISCOVERY_PAGE_SIZE",
+        "API_RATE_LIMIT",
+        "OPENAQ_TRANSPORT",
+        "SENSOR_SCHEMA_VERSION",
+        "WATERMARK_FILE",
+        "OPENAQ_BASE_URL",
+        "USE_SAMPLE_DATA",
+        "SAMPLE_DATA_ONLY",
+        "SAMPLE_DATA_RECORD",
+    ):
+        monkeypatch.delenv(variable, raising=False)
+    monkeypatch.setenv("DATA_DIR", str(tmp_path / "data"))
+
+
+@pytest.fixture(scope="session")
+def jeu() -> JeuSynthetique:
+    """Parc de stations synthétique, construit une seule fois par session."""
+    return JeuSynthetique(TAILLE_JEU)
+
+
+@pytest.fixture
+def explorateur(jeu):
+    """Explorateur neuf relié au client en mémoire."""
+    return nouvel_explorateur(jeu)
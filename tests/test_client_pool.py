@@ -0,0 +1,142 @@
+"""
+Tests du pool de clients OpenAQ partagés (client_pool)
+
+Le transport HTTP du pool est remplacé par un transport factice : aucune
+connexion n'est ouverte.
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from client_pool import CountingTransport, OpenAQClientPool
+
+
+class TransportFactice:
+    def __init__(self, reponse=None):
+        self.reponse = reponse
+        self.ferme = False
+
+    def send_request(self, method, url, params, headers):
+        return self.reponse
+
+    def close(self):
+        self.ferme = True
+
+
+@pytest.fixture
+def transports():
+    return []
+
+
+@pytest.fixture
+def pool(transports) -> OpenAQClientPool:
+    pool = OpenAQClientPool(client_type="rest")
+
+    def creer_transport():
+        transports.append(TransportFactice())
+        return transports[-1]
+
+    pool._create_http_transport = creer_transport
+    return pool
+
+
+def test_client_reutilise_par_cle(pool, transports):
+    premier = pool.acquire("cle-a")
+    second = pool.acquire("cle-a")
+    autre = pool.acquire("cle-b")
+
+    assert premier is second and autre is not premier
+    # Un seul transport HTTP pour tous les clients du pool
+    assert len(transports) == 1
+    assert premier.transport is autre.transport is pool._transport
+    assert pool.stats() == {
+        "transport": "rest",
+        "clients": 2,
+        "clients_crees": 2,
+        "emprunts": 3,
+        "reutilisations": 1,
+        "emprunts_en_cours": 3,
+        "connexions_max": 20,
+        "connexions_keepalive": 10,
+        "reponses_http": 0,
+        "octets_recus": 0,
+    }
+
+
+def test_rendu_des_clients(pool):
+    client = pool.acquire("cle-a")
+    pool.acquire("cle-a")
+
+    pool.release(client)
+    assert pool.stats()["emprunts_en_cours"] == 1
+    pool.release(client)
+    pool.release(object())  # client étranger au pool : ignoré
+    assert pool.stats()["emprunts_en_cours"] == 0
+    # Rendu sans fermeture : le client reste disponible
+    assert pool.acquire("cle-a") is client
+
+
+def test_fermeture(pool, transports):
+    client = pool.acquire("cle-a")
+
+    pool.close()
+
+    assert transports[0].ferme
+    assert pool.stats()["clients"] == 0
+    assert "reponses_http" not in pool.stats()
+    # Après fermeture, un nouvel emprunt repart d'un client et d'un transport neufs
+    assert pool.acquire("cle-a") is not client
+    assert len(transports) == 2
+
+
+def test_transport_inconnu():
+    with pytest.raises(ValueError):
+        OpenAQClientPool(client_type="grpc")
+
+
+def test_comptage_des_reponses(caplog):
+    transport = CountingTransport(TransportFactice(SimpleNamespace(_raw_bytes=b"{}")))
+    transport.send_request("GET", "locations", {}, {})
+    transport.send_request("GET", "locations", {}, {})
+    assert (transport.responses, transport.bytes_received) == (2, 4)
+
+    # Réponse sans _raw_bytes (autre version du SDK) : un seul avertissement
+    transport.inner.reponse = SimpleNamespace(status_code=200)
+    transport.send_request("GET", "locations", {}, {})
+    transport.send_request("GET", "locations", {}, {})
+    assert (transport.responses, transport.bytes_received) == (4, 4)
+    assert caplog.text.count("sans _raw_bytes") == 1
+
+
+@pytest.mark.parametrize("accepte_transport", [True, False])
+def test_client_sdk_sur_le_transport_commun(monkeypatch, caplog, accepte_transport):
+    openaq = pytest.importorskip("openaq")
+
+    class OpenAQFactice:
+        def __init__(self, api_key=None, base_url=None, _transport=None):
+            self.transport = _transport
+
+    class AncienOpenAQ:
+        def __init__(self, api_key=None, base_url=None):
+            self.transport = None
+
+    monkeypatch.setattr(
+        openaq, "OpenAQ", OpenAQFactice if accepte_transport else AncienOpenAQ
+    )
+    pool = OpenAQClientPool()
+    pool._create_http_transport = TransportFactice
+
+    client = pool.acquire("cle-a")
+
+    assert pool.acquire("cle-a") is client
+    if accepte_transport:
+        assert client.transport is pool._transport
+        assert "non testée" not in caplog.text
+    else:
+        # Repli : client créé sans transport partagé, avec un avertissement
+        assert client.transport is None
+        assert "n'accepte plus _transport" in caplog.text
@@ -0,0 +1,195 @@
+"""
+Tests de la découverte des stations : pagination et dédoublonnage entre requêtes
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import time
+
+import anyio
+import pytest
+
+from client_factice import nouvel_explorateur
+from discovery_queries import DiscoveryQuery
+from rest_transport import RestResponse
+
+OUEST = DiscoveryQuery.zone(-17.55, 12.3, -14.45, 16.7)
+EST = DiscoveryQuery.zone(-15.0, 12.3, -11.35, 16.7)
+SENEGAL = DiscoveryQuery.pays("SN")
+
+
+class LocationsComptees:
+    """Enveloppe de client.locations qui note chaque page demandée."""
+
+    def __init__(self, locations, sans_found: bool = False):
+        self._locations = locations
+        self.sans_found = sans_found
+        self.pages = []
+
+    def list(self, **kwargs):
+        self.pages.append(kwargs["page"])
+        reponse = self._locations.list(**kwargs)
+        if self.sans_found:
+            reponse = RestResponse(headers={}, meta={}, results=reponse.results)
+        return reponse
+
+    def sensors(self, locations_id):
+        return self._locations.sensors(locations_id)
+
+
+def compter_pages(explorateur, **options) -> LocationsComptees:
+    compteur = LocationsComptees(explorateur.client.locations, **options)
+    explorateur.client.locations = compteur
+    return compteur
+
+
+def identifiants(stations):
+    return [station["station_id"] for station in stations]
+
+
+def test_arret_sur_le_total_annonce(explorateur, jeu):
+    compteur = compter_pages(explorateur)
+
+    pages = list(explorateur.iter_station_pages(page_size=10))
+
+    # 40 stations, 4 pages pleines : pas de 5e requête pour une page vide
+    assert compteur.pages == [1, 2, 3, 4]
+    assert [len(page) for page in pages] == [10, 10, 10, 10]
+    assert identifiants(s for page in pages for s in page) == list(
+        range(1, jeu.taille + 1)
+    )
+
+
+def test_arret_sur_une_page_incomplete(explorateur):
+    compteur = compter_pages(explorateur)
+
+    pages = list(explorateur.iter_station_pages(page_size=15))
+
+    assert compteur.pages == [1, 2, 3]
+    assert [len(page) for page in pages] == [15, 15, 10]
+
+
+def test_total_inconnu_page_vide_non_transmise(explorateur):
+    compteur = compter_pages(explorateur, sans_found=True)
+
+    pages = list(explorateur.iter_station_pages(page_size=10))
+
+    assert compteur.pages == [1, 2, 3, 4, 5]
+    assert [len(page) for page in pages] == [10, 10, 10, 10]
+
+
+def test_taille_de_page_par_defaut(explorateur, monkeypatch):
+    monkeypatch.setenv("DISCOVERY_PAGE_SIZE", "25")
+    compteur = compter_pages(explorateur)
+
+    assert [len(page) for page in explorateur.iter_station_pages()] == [25, 15]
+    assert compteur.pages == [1, 2]
+
+
+@pytest.mark.parametrize(
+    "found, attendu", [(12, 12), ("12", 12), (">1000", None), (None, None)]
+)
+def test_interpretation_de_found(explorateur, found, attendu):
+    assert explorateur._parse_found(found) == attendu
+
+
+def test_dedoublonnage_dans_l_ordre_des_requetes(explorateur, jeu):
+    ouest = identifiants(
+        {"station_id": loc.id} for loc in jeu.selection(**OUEST.to_filters())
+    )
+    est = identifiants(
+        {"station_id": loc.id} for loc in jeu.selection(**EST.to_filters())
+    )
+    communes = set(ouest) & set(est)
+    assert ouest and est and communes
+
+    explorateur.discover_stations([OUEST, EST, SENEGAL])
+
+    # Chaque station une seule fois, rattachée à la première requête qui la renvoie
+    assert identifiants(explorateur.stations_data) == ouest + [
+        i for i in est if i not in communes
+    ]
+    assert explorateur.discovery_stats == {
+        OUEST.label: {"stations_recues": len(ouest), "doublons": 0},
+        EST.label: {"stations_recues": len(est), "doublons": len(communes)},
+        SENEGAL.label: {"stations_recues": jeu.taille, "doublons": jeu.taille},
+    }
+
+
+@pytest.mark.parametrize("taille_page", ["7", "1000"])
+def test_decouverte_concurrente_identique_a_la_sequentielle(
+    jeu, monkeypatch, taille_page
+):
+    # Petites pages : les pages des trois requêtes arrivent entremêlées
+    monkeypatch.setenv("DISCOVERY_PAGE_SIZE", taille_page)
+    requetes = [OUEST, EST, SENEGAL]
+
+    sequentiel = nouvel_explorateur(jeu)
+    sequentiel.discover_stations(requetes)
+    for station in sequentiel.stations_data:
+        sequentiel.explore_station_sensors(station["station_id"], station["nom"])
+
+    concurrent = nouvel_explorateur(jeu)
+    anyio.run(concurrent.discover_and_explore_async, 4, requetes)
+
+    assert identifiants(concurrent.stations_data) == identifiants(
+        sequentiel.stations_data
+    )
+    assert concurrent.discovery_stats == sequentiel.discovery_stats
+    assert list(
+        zip(
+            concurrent.sensors_data.column("station_id"),
+            concurrent.sensors_data.column("capteur_id"),
+        )
+    ) == list(
+        zip(
+            sequentiel.sensors_data.column("station_id"),
+            sequentiel.sensors_data.column("capteur_id"),
+        )
+    )
+
+
+def test_doublons_attribues_a_la_requete_la_plus_en_aval(jeu):
+    class PagesRetardees:
+        """Pages d'une requête libérées seulement après celles d'une autre."""
+
+        def __init__(self, pages, attendre=None):
+            self.pages = iter(pages)
+            self.epuise = False
+            self.attendre = attendre
+
+        def __iter__(self):
+            return self
+
+        def __next__(self):
+            while self.attendre is not None and not self.attendre.epuise:
+                time.sleep(0.001)
+            try:
+                return next(self.pages)
+            except StopIteration:
+                self.epuise = True
+                raise
+
+    explorateur = nouvel_explorateur(jeu)
+    pages_senegal = list(explorateur.iter_station_pages(**SENEGAL.to_filters()))
+    pages_ouest = list(explorateur.iter_station_pages(**OUEST.to_filters()))
+
+    # La seconde requête (SN) est entièrement lue avant la première (ouest)
+    senegal = PagesRetardees(pages_senegal)
+    ouest = PagesRetardees(pages_ouest, attendre=senegal)
+    anyio.run(
+        explorateur._explore_pages_async,
+        [(OUEST.label, ouest), (SENEGAL.label, senegal)],
+        4,
+        True,
+    )
+
+    ids_ouest = identifiants(s for page in pages_ouest for s in page)
+    nombre_ouest = len(ids_ouest)
+    assert identifiants(explorateur.stations_data)[:nombre_ouest] == ids_ouest
+    assert explorateur.discovery_stats == {
+        OUEST.label: {"stations_recues": nombre_ouest, "doublons": 0},
+        SENEGAL.label: {"stations_recues": jeu.taille, "doublons": nombre_ouest},
+    }
+    assert len(explorateur.stations_data) == jeu.taille
@@ -0,0 +1,86 @@
+"""
+Tests de l'interprétation des requêtes de découverte (discovery_queries)
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import pytest
+
+from discovery_queries import (
+    CODES_ISO_AFRIQUE_OUEST,
+    RAYON_MAX_METRES,
+    DiscoveryQuery,
+    parse_queries,
+    queries_from_env,
+)
+
+
+def test_formats_combines():
+    requetes = parse_queries("SN,mr;bbox:-17.6,14.6,-17.1,14.9;rayon:16.5,-15.0,25000")
+
+    assert requetes == [
+        DiscoveryQuery(iso="SN"),
+        DiscoveryQuery(iso="MR"),
+        DiscoveryQuery(bbox=(-17.6, 14.6, -17.1, 14.9)),
+        DiscoveryQuery(coordinates=(16.5, -15.0), radius=25000),
+    ]
+
+
+def test_afrique_de_l_ouest():
+    requetes = parse_queries("afrique_ouest")
+    assert [requete.iso for requete in requetes] == list(CODES_ISO_AFRIQUE_OUEST)
+
+
+def test_elements_vides_ignores():
+    assert parse_queries(" ; SN, ,;") == [DiscoveryQuery(iso="SN")]
+    assert parse_queries("") == []
+
+
+def test_filtres_et_libelles():
+    pays, zone, rayon = parse_queries(
+        "SN;bbox:-17.6,14.6,-17.1,14.9;rayon:14.7,-17.4,5000"
+    )
+
+    assert pays.to_filters() == {"iso": "SN"}
+    assert zone.to_filters() == {"bbox": (-17.6, 14.6, -17.1, 14.9)}
+    assert rayon.to_filters() == {"coordinates": (14.7, -17.4), "radius": 5000}
+    assert pays.label == "iso=SN"
+    assert zone.label == "bbox=-17.6,14.6,-17.1,14.9"
+    assert rayon.label == "rayon=5000m autour de 14.7,-17.4"
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        f"rayon:14.7,-17.4,{RAYON_MAX_METRES + 1}",
+        "rayon:14.7,-17.4,0",
+        "rayon:14.7,-17.4",
+        "bbox:-17.6,14.6,-17.1",
+        "bbox:a,b,c,d",
+    ],
+)
+def test_specifications_invalides(spec):
+    with pytest.raises((ValueError, TypeError)):
+        parse_queries(spec)
+
+
+@pytest.mark.parametrize(
+    "criteres",
+    [
+        {},
+        {"iso": "SN", "bbox": (0, 0, 1, 1)},
+        {"coordinates": (14.7, -17.4)},
+        {"iso": "SN", "radius": 1000},
+    ],
+)
+def test_un_seul_critere_par_requete(criteres):
+    with pytest.raises(ValueError):
+        DiscoveryQuery(**criteres)
+
+
+def test_senegal_par_defaut(monkeypatch):
+    assert queries_from_env() == [DiscoveryQuery(iso="SN")]
+
+    monkeypatch.setenv("DISCOVERY_QUERIES", "SN;ML")
+    assert [requete.iso for requete in queries_from_env()] == ["SN", "ML"]
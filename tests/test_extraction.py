@@ -0,0 +1,78 @@
+"""
+Tests des accesseurs précompilés (extraction)
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from extraction import compile_accessor, compile_extractor
+from response_cache import PayloadDict
+
+
+class ProprieteEnEchec:
+    @property
+    def name(self):
+        raise RuntimeError("attribut illisible")
+
+
+@pytest.mark.parametrize(
+    "objet",
+    [
+        SimpleNamespace(parameter={"name": "pm25"}),
+        SimpleNamespace(parameter=SimpleNamespace(name="pm25")),
+        {"parameter": {"name": "pm25"}},
+        PayloadDict(parameter=PayloadDict(name="pm25")),
+    ],
+    ids=["objet-dict", "objet-objet", "dict", "payload"],
+)
+def test_attribut_puis_cle(objet):
+    assert compile_accessor("parameter.name")(objet) == "pm25"
+
+
+@pytest.mark.parametrize(
+    "objet",
+    [
+        SimpleNamespace(parameter=None),
+        SimpleNamespace(parameter={"name": None}),
+        SimpleNamespace(),
+        {"parameter": {}},
+        SimpleNamespace(parameter=ProprieteEnEchec()),
+    ],
+    ids=["none", "feuille-none", "absent", "cle-absente", "exception"],
+)
+def test_valeur_par_defaut(objet):
+    accesseur = compile_accessor("parameter.name")
+    assert accesseur(objet) == "N/A"
+    assert accesseur(objet, default=None) is None
+
+
+def test_valeurs_fausses_conservees():
+    accesseur = compile_accessor("value")
+    assert accesseur({"value": 0}) == 0
+    assert accesseur(SimpleNamespace(value="")) == ""
+    assert accesseur(PayloadDict(value=False)) is False
+
+
+def test_cle_homonyme_d_une_methode_de_dictionnaire():
+    # Attribut d'abord, comme _safe_get_value : "items" désigne la méthode
+    accesseur = compile_accessor("items")
+    for objet in ({"items": [1, 2]}, PayloadDict(items=[1, 2])):
+        assert accesseur(objet) == objet.items
+
+
+def test_accesseur_compile_une_seule_fois():
+    assert compile_accessor("parameter.units") is compile_accessor("parameter.units")
+
+
+def test_extracteur_d_enregistrement():
+    extraire = compile_extractor(
+        {"capteur_id": "id", "unite_mesure": "parameter.units"}, default="?"
+    )
+    assert extraire(PayloadDict(id=7, parameter={"name": "pm25"})) == {
+        "capteur_id": 7,
+        "unite_mesure": "?",
+    }
@@ -0,0 +1,144 @@
+"""
+Tests des mesures par phase de l'exploration (PhaseInstrumentation)
+
+Les durées sont relevées sur l'horloge simulée ; les mesures de ressources
+(psutil) ne sont vérifiées que dans leur forme.
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import json
+
+import pytest
+
+import instrumentation
+from instrumentation import PhaseInstrumentation, _centile
+from logging_setup import current_phase
+
+
+class Compteurs:
+    """Compteurs cumulés du limiteur et du pool, modifiables par le test."""
+
+    def __init__(self):
+        self.valeurs = {"appels_api": 0, "octets_recus": 0, "relances": 0}
+
+    def __call__(self):
+        return dict(self.valeurs)
+
+
+@pytest.fixture
+def compteurs() -> Compteurs:
+    return Compteurs()
+
+
+@pytest.fixture
+def mesures(monkeypatch, horloge, compteurs) -> PhaseInstrumentation:
+    monkeypatch.setattr(instrumentation, "time", horloge)
+    monkeypatch.setattr(instrumentation, "_process", lambda: None)
+    return PhaseInstrumentation(counters=compteurs)
+
+
+def test_variation_des_compteurs_par_phase(mesures, compteurs, horloge):
+    compteurs.valeurs["appels_api"] = 5
+    with mesures.phase("decouverte"):
+        assert current_phase() == "decouverte"
+        horloge.avancer(2.0)
+        compteurs.valeurs.update(appels_api=17, octets_recus=4096, relances=1)
+    with mesures.phase("capteurs"):
+        horloge.avancer(0.5)
+        compteurs.valeurs["appels_api"] = 20
+
+    assert current_phase() is None
+    phases = mesures.stats()["phases"]
+    # Seule la part de chaque phase est retenue, pas le cumul depuis le début
+    assert phases["decouverte"] == {
+        "executions": 1,
+        "duree_s": 2.0,
+        "appels_api": 12,
+        "octets_recus": 4096,
+        "relances": 1,
+    }
+    assert phases["capteurs"]["appels_api"] == 3
+    assert phases["capteurs"]["relances"] == 0
+    assert mesures.stats()["duree_totale_s"] == 2.5
+    assert mesures.stats()["psutil"] is False
+
+
+def test_phase_repetee_cumulee(mesures, compteurs, horloge):
+    for appels in (2, 5):
+        with mesures.phase("export"):
+            horloge.avancer(1.0)
+            compteurs.valeurs["appels_api"] += appels
+
+    phase = mesures.stats()["phases"]["export"]
+    assert phase["executions"] == 2
+    assert phase["duree_s"] == 2.0
+    assert phase["appels_api"] == 7
+
+
+def test_exception_notee_puis_propagee(mesures, horloge):
+    with pytest.raises(KeyError):
+        with mesures.phase("agregation"):
+            horloge.avancer(0.25)
+            raise KeyError("station_id")
+
+    phase = mesures.stats()["phases"]["agregation"]
+    assert phase["erreur"] == "KeyError"
+    assert phase["duree_s"] == 0.25
+
+
+def test_sans_compteurs(monkeypatch):
+    monkeypatch.setattr(instrumentation, "_process", lambda: None)
+    mesures = PhaseInstrumentation()
+    with mesures.phase("connexion"):
+        pass
+    assert set(mesures.stats()["phases"]["connexion"]) == {"executions", "duree_s"}
+
+
+def test_durees_par_station(mesures):
+    assert mesures.stats()["capteurs_par_station"] == {"nombre": 0}
+    for station_id, duree in enumerate([0.1, 0.4, 0.2, 0.3], start=1):
+        mesures.record_station(station_id, duree)
+
+    assert mesures.stats()["capteurs_par_station"] == {
+        "nombre": 4,
+        "moyenne_s": 0.25,
+        "p50_s": 0.2,
+        "p95_s": 0.4,
+        "max_s": 0.4,
+        "station_la_plus_lente": 2,
+    }
+
+
+@pytest.mark.parametrize("rang, attendu", [(0, 1), (50, 5), (95, 10), (100, 10)])
+def test_centile_au_plus_proche_rang(rang, attendu):
+    assert _centile(list(range(1, 11)), rang) == attendu
+
+
+def test_ressources_du_processus():
+    pytest.importorskip("psutil")
+    mesures = PhaseInstrumentation(sample_interval=0.01)
+    with mesures.phase("export"):
+        tampon = bytearray(8 * 1024 * 1024)
+        del tampon
+
+    phase = mesures.stats()["phases"]["export"]
+    assert {"cpu_s", "cpu_moyen_pct", "memoire_rss_mo", "memoire_pic_mo"} <= set(phase)
+    assert phase["memoire_pic_mo"] > 0 and phase["memoire_rss_mo"] > 0
+
+
+def test_ecriture_du_fichier(mesures, tmp_path, horloge):
+    with mesures.phase("connexion"):
+        horloge.avancer(1.5)
+
+    fichier = mesures.write(str(tmp_path / "metriques.json"), {"exploration": "nuit"})
+    with open(fichier, encoding="utf-8") as f:
+        document = json.load(f)
+    assert document["exploration"] == "nuit"
+    assert document["phases"]["connexion"]["duree_s"] == 1.5
+
+
+def test_intervalle_d_echantillonnage(monkeypatch):
+    monkeypatch.setenv("METRICS_SAMPLE_INTERVAL", "2")
+    assert PhaseInstrumentation.from_env().sample_interval == 2.0
@@ -0,0 +1,165 @@
+"""
+Tests de la journalisation non bloquante et des niveaux par phase (logging_setup)
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import sys
+import json
+import queue
+import logging
+
+import pytest
+
+from logging_setup import (
+    EnqueueHandler,
+    JsonFormatter,
+    PhaseLevelFilter,
+    configure_logging,
+    current_phase,
+    log_phase,
+    parse_level,
+    parse_phase_levels,
+    stop_logging,
+)
+
+
+def enregistrement(niveau=logging.INFO, message="station %s", *args):
+    return logging.LogRecord("explorateur", niveau, __file__, 1, message, args, None)
+
+
+@pytest.fixture
+def journal_isole(monkeypatch):
+    """Rend au logger racine son niveau et ses gestionnaires après le test."""
+    for variable in ("LOG_LEVEL", "LOG_PHASE_LEVELS", "LOG_FORMAT"):
+        monkeypatch.delenv(variable, raising=False)
+    racine = logging.getLogger()
+    niveau = racine.level
+    yield
+    stop_logging()
+    racine.setLevel(niveau)
+
+
+@pytest.mark.parametrize(
+    "valeur, attendu",
+    [("debug", logging.DEBUG), (" WARNING ", logging.WARNING), (15, 15)],
+)
+def test_lecture_d_un_niveau(valeur, attendu):
+    assert parse_level(valeur) == attendu
+
+
+def test_niveau_inconnu():
+    with pytest.raises(ValueError):
+        parse_level("bavard")
+
+
+def test_niveaux_par_phase():
+    assert parse_phase_levels("capteurs=WARNING, export=debug,") == {
+        "capteurs": logging.WARNING,
+        "export": logging.DEBUG,
+    }
+    assert parse_phase_levels("") == {}
+    with pytest.raises(ValueError):
+        parse_phase_levels("capteurs")
+
+
+def test_phases_imbriquees():
+    assert current_phase() is None
+    with log_phase("decouverte"):
+        with log_phase("capteurs"):
+            assert current_phase() == "capteurs"
+        assert current_phase() == "decouverte"
+    assert current_phase() is None
+
+
+def test_filtre_selon_la_phase_courante():
+    filtre = PhaseLevelFilter(
+        logging.INFO, {"capteurs": logging.WARNING, "export": logging.DEBUG}
+    )
+
+    # Hors phase : niveau global
+    debug = enregistrement(logging.DEBUG)
+    assert not filtre.filter(debug)
+    assert filtre.filter(enregistrement(logging.INFO))
+    assert debug.phase is None
+
+    with log_phase("capteurs"):
+        info = enregistrement(logging.INFO)
+        assert not filtre.filter(info)
+        assert filtre.filter(enregistrement(logging.WARNING))
+        assert info.phase == "capteurs"
+    with log_phase("export"):
+        assert filtre.filter(enregistrement(logging.DEBUG))
+    # Phase sans niveau propre : niveau global
+    with log_phase("agregation"):
+        assert not filtre.filter(enregistrement(logging.DEBUG))
+        assert filtre.filter(enregistrement(logging.INFO))
+
+
+def test_message_fige_au_depot():
+    file_journal = queue.SimpleQueue()
+    gestionnaire = EnqueueHandler(file_journal)
+    capteurs = [101]
+
+    try:
+        raise RuntimeError("quota")
+    except RuntimeError:
+        record = enregistrement(logging.ERROR, "capteurs %s", capteurs)
+        record.exc_info = sys.exc_info()
+    gestionnaire.emit(record)
+    capteurs.append(102)
+
+    depose = file_journal.get_nowait()
+    assert depose.getMessage() == "capteurs [101]"
+    assert depose.args is None and depose.exc_info is None
+    assert "RuntimeError: quota" in depose.exc_text
+
+
+def test_format_json():
+    record = enregistrement(logging.WARNING, "station %s", 7)
+    record.created = 0
+    record.phase = "capteurs"
+
+    assert json.loads(JsonFormatter().format(record)) == {
+        "horodatage": "1970-01-01T00:00:00.000Z",
+        "niveau": "WARNING",
+        "logger": "explorateur",
+        "phase": "capteurs",
+        "message": "station 7",
+    }
+
+
+def test_format_invalide(journal_isole, monkeypatch):
+    monkeypatch.setenv("LOG_FORMAT", "xml")
+    with pytest.raises(ValueError):
+        configure_logging(log_file=None)
+
+
+def test_journal_par_phase_en_fichier(journal_isole, tmp_path, monkeypatch):
+    monkeypatch.setenv("LOG_PHASE_LEVELS", "capteurs=WARNING,export=DEBUG")
+    monkeypatch.setenv("LOG_FORMAT", "json")
+    fichier = tmp_path / "exploration.log"
+    journal = logging.getLogger("exploration.test")
+
+    ecouteur = configure_logging(log_file=str(fichier), level="INFO")
+    assert configure_logging(log_file=None) is ecouteur
+    # Le logger racine laisse passer le niveau le plus bavard des phases
+    assert logging.getLogger().level == logging.DEBUG
+
+    journal.debug("ignoré hors phase")
+    journal.info("démarrage")
+    with log_phase("capteurs"):
+        journal.info("ignoré : capteurs en WARNING")
+        journal.warning("station 12 sans capteur")
+    with log_phase("export"):
+        journal.debug("export détaillé")
+    stop_logging()
+
+    with open(fichier, encoding="utf-8") as f:
+        lignes = [json.loads(ligne) for ligne in f]
+    assert [(ligne["phase"], ligne["message"]) for ligne in lignes] == [
+        (None, "démarrage"),
+        ("capteurs", "station 12 sans capteur"),
+        ("export", "export détaillé"),
+    ]
@@ -0,0 +1,280 @@
+"""
+Tests de la collecte incrémentale des mesures (measurement_collector)
+
+Le client en mémoire sert, pour chaque capteur, une série horaire qui se
+termine à la derniere_mesure de sa station. La période collectée est bornée
+à deux jours pour garder des séries courtes.
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import time
+from datetime import timedelta
+
+import pytest
+
+from client_factice import REFERENCE, JeuSynthetique, nouvel_explorateur
+from measurement_collector import MeasurementCollector
+from rest_transport import RestResponse
+from sync_state import WatermarkStore, parse_timestamp
+
+DEBUT = (REFERENCE - timedelta(days=2)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class PuitsMemoire:
+    """Puits de données conservant les blocs reçus."""
+
+    def __init__(self):
+        self.blocs = []
+        self.ferme = False
+
+    @property
+    def mesures(self):
+        return [mesure for bloc in self.blocs for mesure in bloc]
+
+    def write(self, records):
+        self.blocs.append(list(records))
+
+    def close(self):
+        self.ferme = True
+
+
+@pytest.fixture(scope="module")
+def petit_jeu() -> JeuSynthetique:
+    return JeuSynthetique(5)
+
+
+@pytest.fixture
+def explorateur_rempli(petit_jeu):
+    explorer = nouvel_explorateur(petit_jeu)
+    explorer.discover_senegal_stations()
+    for station in explorer.stations_data:
+        explorer.explore_station_sensors(station["station_id"], station["nom"])
+    return explorer
+
+
+@pytest.fixture
+def etat(tmp_path) -> WatermarkStore:
+    return WatermarkStore(str(tmp_path / "watermarks_hours.json"))
+
+
+def collecteur(explorer, etat=None, **options) -> MeasurementCollector:
+    options.setdefault("max_concurrency", 4)
+    return MeasurementCollector(explorer, PuitsMemoire(), watermarks=etat, **options)
+
+
+def capteurs_par_station(explorer):
+    stations = {}
+    for capteur in explorer.sensors_data:
+        stations.setdefault(capteur["station_id"], []).append(capteur)
+    return stations
+
+
+def test_collecte_complete(explorateur_rempli):
+    collecte = collecteur(explorateur_rempli, chunk_size=100)
+    stats = collecte.collect(datetime_from=DEBUT)
+
+    mesures = collecte.sink.mesures
+    assert collecte.sink.ferme
+    assert stats["capteurs_collectes"] == len(explorateur_rempli.sensors_data)
+    assert stats["mesures_ecrites"] == len(mesures) > 0
+    # Blocs bornés, sauf le dernier
+    assert all(len(bloc) >= 100 for bloc in collecte.sink.blocs[:-1])
+    assert {m["capteur_id"] for m in mesures} == set(
+        explorateur_rempli.sensors_data.column("capteur_id")
+    )
+
+
+def test_watermarks_avances_puis_stations_inchangees_ignorees(explorateur_rempli, etat):
+    premiere = collecteur(explorateur_rempli, etat)
+    premiere.collect(datetime_from=DEBUT)
+
+    for capteur_id in explorateur_rempli.sensors_data.column("capteur_id"):
+        dernieres = [
+            parse_timestamp(m["date_debut"])
+            for m in premiere.sink.mesures
+            if m["capteur_id"] == capteur_id
+        ]
+        assert parse_timestamp(etat.sensor_watermark(capteur_id)) == max(dernieres)
+    for station in explorateur_rempli.stations_data:
+        assert (
+            etat.station_last_seen(station["station_id"]) == station["derniere_mesure"]
+        )
+
+    seconde = collecteur(explorateur_rempli, WatermarkStore(etat.path))
+    stats = seconde.collect(datetime_from=DEBUT)
+
+    assert stats["capteurs_ignores"] == len(explorateur_rempli.sensors_data)
+    assert stats["pages_recues"] == 0
+    assert seconde.sink.mesures == []
+
+
+def test_reprise_au_watermark_sans_doublon(explorateur_rempli, etat):
+    collecteur(explorateur_rempli, etat).collect(datetime_from=DEBUT)
+
+    # La station 1 annonce une nouvelle mesure : ses capteurs repartent de leur
+    # watermark, dont la mesure (borne inclusive) a déjà été écrite
+    station = explorateur_rempli.stations_data[0]
+    station["derniere_mesure"] = (
+        parse_timestamp(station["derniere_mesure"]) + timedelta(hours=1)
+    ).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    reprise = collecteur(explorateur_rempli, WatermarkStore(etat.path))
+    stats = reprise.collect(datetime_from=DEBUT)
+
+    capteurs = capteurs_par_station(explorateur_rempli)
+    assert stats["capteurs_collectes"] == len(capteurs[station["station_id"]])
+    assert stats["capteurs_ignores"] == len(explorateur_rempli.sensors_data) - len(
+        capteurs[station["station_id"]]
+    )
+    assert reprise.sink.mesures == []
+
+
+def test_station_collectee_partiellement_non_marquee(explorateur_rempli, etat):
+    capteurs = capteurs_par_station(explorateur_rempli)
+    multiple = next(i for i, liste in capteurs.items() if len(liste) > 1)
+    complete = next(i for i in capteurs if i != multiple)
+
+    # Un seul paramètre de la station multiple (ex: COLLECTION_PARAMETERS=pm25)
+    selection = capteurs[multiple][:1] + capteurs[complete]
+    collecteur(explorateur_rempli, etat).collect(selection, datetime_from=DEBUT)
+
+    assert etat.station_last_seen(multiple) is None
+    assert etat.station_last_seen(complete) is not None
+
+    # Au passage suivant, les autres capteurs de la station sont collectés
+    suivante = collecteur(explorateur_rempli, WatermarkStore(etat.path))
+    stats = suivante.collect(datetime_from=DEBUT)
+    restants = {c["capteur_id"] for c in capteurs[multiple][1:]}
+    assert restants <= {m["capteur_id"] for m in suivante.sink.mesures}
+    assert stats["capteurs_ignores"] == len(capteurs[complete])
+
+
+def test_station_en_echec_non_marquee(explorateur_rempli, etat):
+    capteurs = capteurs_par_station(explorateur_rempli)
+    en_echec, autre = list(capteurs)[:2]
+
+    # Capteur inconnu de l'API : sa collecte échoue
+    fantome = dict(capteurs[en_echec][0], capteur_id=en_echec * 100 + 99)
+    explorateur_rempli.sensors_data.append(fantome)
+
+    stats = collecteur(explorateur_rempli, etat).collect(datetime_from=DEBUT)
+
+    assert stats["capteurs_en_echec"] == 1
+    assert etat.station_last_seen(en_echec) is None
+    assert etat.station_last_seen(autre) is not None
+
+
+def test_borne_de_fin_explicite_sans_marquage(explorateur_rempli, etat):
+    fin = (REFERENCE - timedelta(days=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    collecteur(explorateur_rempli, etat).collect(datetime_from=DEBUT, datetime_to=fin)
+
+    assert all(
+        etat.station_last_seen(station["station_id"]) is None
+        for station in explorateur_rempli.stations_data
+    )
+    # Les watermarks des capteurs avancent malgré tout
+    assert all(
+        etat.sensor_watermark(capteur_id) is not None
+        for capteur_id in explorateur_rempli.sensors_data.column("capteur_id")
+    )
+
+
+def test_watermark_avance_en_fin_de_capteur(explorateur_rempli, etat):
+    class MesuresAntichronologiques:
+        """Enveloppe de client.measurements : pages du plus récent au plus ancien."""
+
+        def __init__(self, measurements):
+            self._measurements = measurements
+
+        def list(self, page=1, limit=1000, **kwargs):
+            reponse = self._measurements.list(page=1, limit=1000, **kwargs)
+            mesures = list(reversed(reponse.results))
+            debut = (page - 1) * limit
+            return RestResponse(
+                headers={}, meta=reponse.meta, results=mesures[debut : debut + limit]
+            )
+
+    class PuitsInterrompu(PuitsMemoire):
+        def write(self, records):
+            if self.blocs:
+                raise OSError("disque plein")
+            super().write(records)
+
+    explorateur_rempli.client.measurements = MesuresAntichronologiques(
+        explorateur_rempli.client.measurements
+    )
+    capteur = explorateur_rempli.sensors_data[0]
+
+    # Interruption après la page la plus récente : les plus anciennes n'ont pas
+    # été écrites, le watermark ne doit pas les enjamber
+    interrompue = MeasurementCollector(
+        explorateur_rempli,
+        PuitsInterrompu(),
+        page_size=10,
+        chunk_size=1,
+        watermarks=etat,
+    )
+    with pytest.raises(Exception):
+        interrompue.collect([capteur], datetime_from=DEBUT)
+    assert len(interrompue.sink.mesures) == 10
+    assert etat.sensor_watermark(capteur["capteur_id"]) is None
+
+    complete = MeasurementCollector(
+        explorateur_rempli, PuitsMemoire(), page_size=10, chunk_size=1, watermarks=etat
+    )
+    complete.collect([capteur], datetime_from=DEBUT)
+    assert parse_timestamp(etat.sensor_watermark(capteur["capteur_id"])) == max(
+        parse_timestamp(m["date_debut"]) for m in complete.sink.mesures
+    )
+
+
+def test_bornes_journalieres(explorateur_rempli):
+    collecte = collecteur(explorateur_rempli, data="days")
+    assert collecte._range_params("2025-01-01T06:00:00Z", None) == {
+        "date_from": "2025-01-01",
+        "date_to": None,
+    }
+
+
+def test_pages_en_memoire_bornees_par_la_concurrence(explorateur_rempli):
+    class MesuresComptees:
+        """Enveloppe de client.measurements qui compte les pages reçues."""
+
+        def __init__(self, measurements):
+            self._measurements = measurements
+            self.pages = 0
+
+        def list(self, **kwargs):
+            reponse = self._measurements.list(**kwargs)
+            self.pages += 1
+            return reponse
+
+    class PuitsLent(PuitsMemoire):
+        """Puits bloqué le temps que les téléchargements saturent les files."""
+
+        def write(self, records):
+            if not self.blocs:
+                time.sleep(0.2)
+                self.pages_avant_ecriture = compteur.pages
+            super().write(records)
+
+    compteur = MesuresComptees(explorateur_rempli.client.measurements)
+    explorateur_rempli.client.measurements = compteur
+    collecte = MeasurementCollector(
+        explorateur_rempli,
+        PuitsLent(),
+        page_size=10,
+        chunk_size=1,
+        max_concurrency=2,
+        queue_size=1,
+    )
+    assert len(explorateur_rempli.sensors_data) > 10
+
+    collecte.collect(datetime_from=DEBUT)
+
+    # Une page en écriture, queue_size en file, une page retenue et une en
+    # cours de téléchargement par travailleur : indépendant du nombre de capteurs
+    assert collecte.sink.pages_avant_ecriture <= 1 + 1 + 2 * 2
+    assert compteur.pages == collecte.stats["pages_recues"]
@@ -0,0 +1,178 @@
+"""
+Tests des métriques Prometheus des explorations et collectes (metrics_exporter)
+
+Chaque test enregistre ses métriques dans un registre prometheus_client neuf,
+jamais dans le registre global du processus ; seuls ces tests nécessitent
+prometheus_client.
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import inspect
+
+import pytest
+
+import metrics_exporter
+from metrics_exporter import (
+    NoopMetrics,
+    PrometheusMetrics,
+    error_status,
+    start_server_from_env,
+)
+
+
+@pytest.fixture
+def metriques() -> PrometheusMetrics:
+    prometheus_client = pytest.importorskip("prometheus_client")
+    return PrometheusMetrics(registry=prometheus_client.CollectorRegistry())
+
+
+def valeur(metriques, nom, **etiquettes):
+    return metriques.registry.get_sample_value(nom, etiquettes)
+
+
+def methodes_publiques(classe):
+    return {
+        nom: inspect.signature(membre)
+        for nom, membre in inspect.getmembers(classe, inspect.isfunction)
+        if not nom.startswith("_")
+    }
+
+
+def test_memes_methodes_avec_ou_sans_prometheus():
+    # Les appelants ne testent jamais enabled : toute méthode doit exister
+    # avec la même signature dans la version sans effet
+    assert methodes_publiques(PrometheusMetrics) == methodes_publiques(NoopMetrics)
+    assert NoopMetrics.enabled is False and PrometheusMetrics.enabled is True
+
+
+def test_metriques_sans_effet(caplog):
+    noop = NoopMetrics()
+    noop.record_api_request("/v3/locations", "200", 0.1)
+    noop.record_rate_limit_wait(1.0)
+    noop.record_cache_lookup(True)
+    noop.record_rows("csv", 10)
+    noop.set_queue_depth("pages", 3)
+
+    assert noop.start_server(9100) is False
+    assert "prometheus_client non installé" in caplog.text
+
+
+def test_requetes_et_latences(metriques):
+    metriques.record_api_request("/v3/locations", "200", 0.2)
+    metriques.record_api_request("/v3/locations", "200", 3.0)
+    metriques.record_api_request("/v3/locations", "429", 0.01)
+
+    assert (
+        valeur(
+            metriques,
+            "openaq_api_requests_total",
+            endpoint="/v3/locations",
+            status="200",
+        )
+        == 2
+    )
+    assert (
+        valeur(
+            metriques,
+            "openaq_api_requests_total",
+            endpoint="/v3/locations",
+            status="429",
+        )
+        == 1
+    )
+    assert (
+        valeur(
+            metriques,
+            "openaq_api_request_duration_seconds_bucket",
+            endpoint="/v3/locations",
+            le="0.25",
+        )
+        == 2
+    )
+    assert (
+        valeur(
+            metriques,
+            "openaq_api_request_duration_seconds_count",
+            endpoint="/v3/locations",
+        )
+        == 3
+    )
+
+
+def test_attente_du_limiteur(metriques):
+    metriques.record_rate_limit_wait(1.5)
+    metriques.record_rate_limit_wait(0)
+    metriques.record_rate_limit_wait(0.5)
+    assert valeur(metriques, "openaq_rate_limit_wait_seconds_total") == 2.0
+
+
+def test_taux_de_succes_du_cache(metriques):
+    for succes in (True, False, True, True):
+        metriques.record_cache_lookup(succes)
+
+    assert valeur(metriques, "openaq_cache_lookups_total", result="hit") == 3
+    assert valeur(metriques, "openaq_cache_lookups_total", result="miss") == 1
+    assert valeur(metriques, "openaq_cache_hit_ratio") == 0.75
+
+
+def test_lignes_ecrites_et_files(metriques):
+    metriques.record_rows("csv", 100)
+    metriques.record_rows("csv", 20)
+    metriques.record_rows("parquet", 5)
+    metriques.set_queue_depth("pages", 4)
+    metriques.set_queue_depth("pages", 1)
+
+    assert valeur(metriques, "openaq_rows_ingested_total", sink="csv") == 120
+    assert valeur(metriques, "openaq_rows_ingested_total", sink="parquet") == 5
+    assert valeur(metriques, "openaq_queue_depth", queue="pages") == 1
+
+
+def test_serveur_demarre_une_seule_fois(metriques, monkeypatch):
+    demarrages = []
+    monkeypatch.setattr(
+        "prometheus_client.start_http_server",
+        lambda port, addr, registry: demarrages.append((port, addr, registry)),
+    )
+
+    assert metriques.start_server(9100) is True
+    assert metriques.start_server(9100) is True
+    assert demarrages == [(9100, "127.0.0.1", metriques.registry)]
+
+
+class ErreurHttp(Exception):
+    status_code = 503
+
+
+@pytest.mark.parametrize(
+    "erreur, attendu",
+    [(ErreurHttp(), "503"), (TimeoutError(), "TimeoutError")],
+)
+def test_statut_d_une_requete_en_echec(erreur, attendu):
+    assert error_status(erreur) == attendu
+
+
+def test_repli_sans_prometheus_client(monkeypatch):
+    def absent(*args, **kwargs):
+        raise ImportError("prometheus_client")
+
+    monkeypatch.setattr(metrics_exporter, "_metrics", None)
+    monkeypatch.setattr(metrics_exporter, "PrometheusMetrics", absent)
+
+    commun = metrics_exporter.metrics()
+    assert type(commun) is NoopMetrics
+    assert metrics_exporter.metrics() is commun
+
+
+def test_serveur_selon_metrics_port(monkeypatch):
+    class PortOccupe(NoopMetrics):
+        def start_server(self, port, addr="127.0.0.1"):
+            raise OSError("Address already in use")
+
+    monkeypatch.delenv("METRICS_PORT", raising=False)
+    assert start_server_from_env() is False
+
+    monkeypatch.setenv("METRICS_PORT", "9100")
+    monkeypatch.setattr(metrics_exporter, "_metrics", PortOccupe())
+    assert start_server_from_env() is False
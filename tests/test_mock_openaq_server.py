@@ -0,0 +1,183 @@
+"""
+Tests du serveur OpenAQ v3 simulé (mock_openaq_server)
+
+Les requêtes sont adressées directement à l'application ASGI, sans socket
+ni client HTTP ; ces tests nécessitent fastapi.
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import anyio
+import pytest
+
+import mock_openaq_server
+from mock_openaq_server import (
+    CAPTEURS_PAR_STATION_MAX,
+    MockBehaviour,
+    MockDataset,
+    create_app,
+)
+
+REFERENCE = datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+
+def appeler(app, chemin, requete="", cle="cle-test"):
+    """Exécute une requête GET sur l'application ; retourne (statut, en-têtes, corps)."""
+    messages = []
+    en_tetes = [(b"x-api-key", cle.encode())] if cle else []
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": chemin,
+        "raw_path": chemin.encode(),
+        "root_path": "",
+        "query_string": requete.encode(),
+        "headers": en_tetes,
+        "server": ("127.0.0.1", 8765),
+        "client": ("127.0.0.1", 50000),
+    }
+
+    async def recevoir():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def envoyer(message):
+        messages.append(message)
+
+    anyio.run(app, scope, recevoir, envoyer)
+    debut = messages[0]
+    corps = b"".join(m.get("body", b"") for m in messages[1:])
+    return (
+        debut["status"],
+        {k.decode(): v.decode() for k, v in debut["headers"]},
+        json.loads(corps),
+    )
+
+
+@pytest.fixture
+def jeu() -> MockDataset:
+    return MockDataset(stations=30, reference=REFERENCE)
+
+
+def test_donnees_deterministes(jeu):
+    autre = MockDataset(stations=30, reference=REFERENCE)
+    assert jeu.location(7) == autre.location(7)
+    assert jeu.location(7) != MockDataset(30, seed=1, reference=REFERENCE).location(7)
+
+    capteurs = jeu.sensors(7)
+    assert 1 <= len(capteurs) <= 6
+    assert [c["id"] for c in capteurs] == [
+        7 * CAPTEURS_PAR_STATION_MAX + rang for rang in range(len(capteurs))
+    ]
+
+
+def test_filtres_des_stations(jeu):
+    assert jeu.location_ids() == list(range(1, 31))
+    assert jeu.location_ids(iso="sn") == list(range(1, 31))
+    assert jeu.location_ids(iso="ML") == []
+
+    ouest = jeu.location_ids(bbox="-17.55,12.3,-14.45,16.7")
+    assert 0 < len(ouest) < 30
+    assert all(jeu.location(i)["coordinates"]["longitude"] <= -14.45 for i in ouest)
+
+    station = jeu.location(1)["coordinates"]
+    centre = f"{station['latitude']},{station['longitude']}"
+    assert 1 in jeu.location_ids(coordinates=centre, radius=1)
+
+
+def test_periodes_de_mesures_bornees_par_la_station(jeu):
+    premiere, derniere = jeu.period(1)
+    capteur = CAPTEURS_PAR_STATION_MAX
+
+    debut, pas, nombre = jeu.measurement_periods(
+        capteur, "hours", derniere - timedelta(days=2), None
+    )
+    assert (debut, pas, nombre) == (
+        derniere - timedelta(days=2),
+        timedelta(hours=1),
+        48,
+    )
+
+    debut, pas, nombre = jeu.measurement_periods(
+        capteur, "days", premiere - timedelta(days=10), derniere
+    )
+    assert debut == premiere and pas == timedelta(days=1)
+    assert nombre == (derniere - premiere).days
+
+
+def test_quota_par_cle_et_par_minute(monkeypatch):
+    maintenant = [120.0]
+    monkeypatch.setattr(mock_openaq_server.time, "time", lambda: maintenant[0])
+    comportement = MockBehaviour(rate_limit=2)
+
+    assert comportement.quota("a")[0] and comportement.quota("a")[0]
+    autorise, en_tetes = comportement.quota("a")
+    assert not autorise
+    assert en_tetes["x-ratelimit-remaining"] == "0"
+    assert en_tetes["x-ratelimit-reset"] == "60"
+    # Quota distinct par clé, renouvelé à la minute suivante
+    assert comportement.quota("b")[0]
+    maintenant[0] = 180.0
+    assert comportement.quota("a")[0]
+
+
+def test_erreurs_5xx_injectees():
+    comportement = MockBehaviour(error_rate=1.0, seed=3)
+    assert {comportement.injected_error() for _ in range(50)} == {500, 502, 503}
+    assert MockBehaviour().injected_error() is None
+
+
+def test_pages_de_stations(jeu):
+    pytest.importorskip("fastapi")
+    app = create_app(jeu, MockBehaviour(rate_limit=100))
+
+    statut, en_tetes, corps = appeler(app, "/v3/locations", "limit=20&page=2")
+
+    assert statut == 200
+    assert corps["meta"]["found"] == 30
+    assert [loc["id"] for loc in corps["results"]] == list(range(21, 31))
+    assert en_tetes["x-ratelimit-used"] == "1"
+
+
+def test_mesures_et_capteur_inconnu(jeu):
+    pytest.importorskip("fastapi")
+    app = create_app(jeu, MockBehaviour(rate_limit=100))
+    capteur = jeu.sensors(1)[0]["id"]
+
+    statut, _, corps = appeler(app, f"/v3/sensors/{capteur}/hours", "limit=5")
+    assert statut == 200
+    assert len(corps["results"]) == 5
+    assert corps["results"][0]["period"]["datetimeFrom"]["utc"].endswith("Z")
+
+    statut, _, _ = appeler(app, f"/v3/sensors/{capteur + 50}/hours")
+    assert statut == 404
+
+
+def test_reponses_429_et_5xx_comptees(jeu):
+    pytest.importorskip("fastapi")
+    comportement = MockBehaviour(rate_limit=1)
+    app = create_app(jeu, comportement)
+
+    assert appeler(app, "/v3/locations")[0] == 200
+    statut, en_tetes, _ = appeler(app, "/v3/locations")
+    assert statut == 429 and en_tetes["x-ratelimit-remaining"] == "0"
+    assert appeler(app, "/v3/locations", cle="")[0] == 401
+
+    comportement.rate_limit = 100
+    comportement.error_rate = 1.0
+    assert appeler(app, "/v3/locations")[0] in (500, 502, 503)
+
+    _, _, stats = appeler(app, "/__stats")
+    assert stats == {
+        "stations": 30,
+        "requetes": 4,
+        "reponses_429": 1,
+        "erreurs_5xx": 1,
+        "non_autorisees": 1,
+    }
@@ -0,0 +1,141 @@
+"""
+Tests de l'export Parquet typé et du jeu de données partitionné (parquet_export)
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import os
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from parquet_export import (  # noqa: E402
+    ParquetSink,
+    sensor_schema,
+    station_schema,
+    write_table,
+)
+from records import RecordTable  # noqa: E402
+
+
+def station(station_id, **champs):
+    return {
+        "station_id": station_id,
+        "nom": "Dakar Plateau",
+        "pays": "Sénégal",
+        "latitude": 14.67,
+        "longitude": -17.43,
+        "est_mobile": False,
+        "premiere_mesure": "2024-03-01T00:00:00Z",
+        "derniere_mesure": "2025-01-31T23:00:00+00:00",
+        "nombre_capteurs": 2,
+        "types_instruments": ["Capteur bas coût"],
+        "date_exploration": "2026-10-01T10:30:00.123456",
+        **champs,
+    }
+
+
+def mesure(capteur_id, parametre, date_debut, valeur=1.0):
+    return {
+        "capteur_id": capteur_id,
+        "station_id": 1,
+        "parametre_nom": parametre,
+        "unite_mesure": "µg/m³",
+        "valeur": valeur,
+        "date_debut": date_debut,
+        "date_fin": None,
+        "intervalle": "01:00:00",
+        "couverture_pct": 100.0,
+    }
+
+
+def test_schema_des_stations(tmp_path):
+    fichier = str(tmp_path / "stations.parquet")
+    write_table(
+        [station(1), station(2, nom="N/A", latitude="N/A", types_instruments=[])],
+        station_schema(),
+        fichier,
+    )
+
+    table = pq.read_table(fichier)
+    assert table.schema.equals(station_schema())
+    assert table.schema.field("derniere_mesure").type == pa.timestamp("us", tz="UTC")
+    assert pa.types.is_dictionary(table.schema.field("nom").type)
+
+    lignes = table.to_pylist()
+    assert lignes[0]["station_id"] == 1
+    assert lignes[0]["derniere_mesure"].isoformat() == "2025-01-31T23:00:00+00:00"
+    assert lignes[0]["types_instruments"] == ["Capteur bas coût"]
+    # "N/A" de l'explorateur devient une valeur manquante typée
+    assert lignes[1]["nom"] is None and lignes[1]["latitude"] is None
+    assert lignes[1]["proprietaire"] is None
+
+
+def test_capteurs_lus_en_colonnes_depuis_une_record_table(tmp_path):
+    capteurs = RecordTable([field.name for field in sensor_schema()])
+    capteurs.extend(
+        [
+            {"station_id": 1, "capteur_id": 101, "parametre_id": 2},
+            {"station_id": 1, "capteur_id": 102, "parametre_id": "N/A"},
+        ]
+    )
+    fichier = str(tmp_path / "capteurs.parquet")
+
+    write_table(capteurs, sensor_schema(), fichier)
+
+    table = pq.read_table(fichier)
+    assert table.column("capteur_id").to_pylist() == [101, 102]
+    assert table.column("parametre_id").to_pylist() == [2, None]
+
+
+def test_partitions_hive_par_parametre_et_par_mois(tmp_path):
+    repertoire = str(tmp_path / "mesures")
+    puits = ParquetSink(repertoire, batch_size=3)
+
+    puits.write(
+        [
+            mesure(101, "pm25", "2025-01-31T23:00:00Z"),
+            mesure(102, "pm10", "2025-01-31T23:00:00Z"),
+        ]
+    )
+    # Lot incomplet : rien n'est encore écrit
+    assert not os.path.exists(repertoire)
+
+    puits.write([mesure(101, "pm25", "2025-02-01T00:00:00Z", 2.0)])
+    puits.write([mesure(101, "pm25", "2025-02-01T01:00:00Z", 3.0)])
+    puits.close()
+
+    assert puits.rows_written == 4
+    fichiers = sorted(
+        os.path.relpath(os.path.join(dossier, nom), repertoire)
+        for dossier, _, noms in os.walk(repertoire)
+        for nom in noms
+    )
+    assert [os.path.dirname(f) for f in fichiers] == [
+        "parametre_nom=pm10/mois=2025-01",
+        "parametre_nom=pm25/mois=2025-01",
+        "parametre_nom=pm25/mois=2025-02",
+        "parametre_nom=pm25/mois=2025-02",
+    ]
+
+    jeu = pq.read_table(repertoire, partitioning="hive")
+    valeurs = {
+        (ligne["parametre_nom"], ligne["mois"], ligne["valeur"])
+        for ligne in jeu.to_pylist()
+    }
+    assert valeurs == {
+        ("pm10", "2025-01", 1.0),
+        ("pm25", "2025-01", 1.0),
+        ("pm25", "2025-02", 2.0),
+        ("pm25", "2025-02", 3.0),
+    }
+
+
+def test_fermeture_sans_mesure(tmp_path):
+    puits = ParquetSink(str(tmp_path / "mesures"))
+    puits.close()
+    assert puits.rows_written == 0
+    assert not os.path.exists(tmp_path / "mesures")
@@ -0,0 +1,319 @@
+"""
+Tests du chargement PostgreSQL par COPY et upsert (postgres_loader)
+
+Les instructions SQL sont vérifiées sur une connexion factice qui les
+enregistre. Les tests de la fixture base s'exécutent en plus contre une vraie
+base si TEST_DATABASE_URL est défini (base jetable : les tables du chargeur y
+sont supprimées avant et après chaque test).
+
+Variables d'environnement :
+- TEST_DATABASE_URL : base PostgreSQL de test, ex:
+  postgresql://postgres@localhost:5432/senegalairwatch_test
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import io
+import os
+import csv
+from datetime import date
+
+import pytest
+
+from postgres_loader import NULL_COPY, PostgresLoader
+
+
+class CurseurFactice:
+    def __init__(self, connexion):
+        self.connexion = connexion
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.connexion.instructions.append(" ".join(sql.split()))
+
+    def copy_expert(self, sql, fichier):
+        self.connexion.instructions.append(" ".join(sql.split()))
+        self.connexion.copies.append(list(csv.reader(io.StringIO(fichier.read()))))
+
+
+class ConnexionFactice:
+    """Connexion psycopg2 simulée : enregistre SQL et flux COPY, par transaction."""
+
+    def __init__(self):
+        self.instructions = []
+        self.copies = []
+        self.transactions = 0
+
+    def __enter__(self):
+        self.transactions += 1
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def cursor(self):
+        return CurseurFactice(self)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def chargeur():
+    chargeur = PostgresLoader("postgresql://factice")
+    chargeur._connection = ConnexionFactice()
+    chargeur._schema_ready = True
+    return chargeur
+
+
+def mesure(capteur_id, date_debut, valeur=1.0, **champs):
+    return {
+        "capteur_id": capteur_id,
+        "date_debut": date_debut,
+        "date_fin": None,
+        "valeur": valeur,
+        "intervalle": "01:00:00",
+        "couverture_pct": 100.0,
+        **champs,
+    }
+
+
+def test_copy_puis_upsert_des_mesures(chargeur):
+    connexion = chargeur._connection
+    lignes = chargeur.load_measurements(
+        [
+            mesure(101, "2025-01-31T23:00:00Z", 4.5),
+            mesure(101, "2025-02-01T00:00:00Z", None, couverture_pct="N/A"),
+            mesure(102, None),
+        ]
+    )
+
+    assert lignes == 2
+    creation, copie, insertion = connexion.instructions[-3:]
+    assert creation == (
+        "CREATE TEMP TABLE IF NOT EXISTS staging_measurements "
+        "(LIKE measurements INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+    )
+    assert copie == (
+        "COPY staging_measurements (capteur_id, date_debut, date_fin, valeur, "
+        f"intervalle, couverture_pct) FROM STDIN WITH (FORMAT csv, NULL '{NULL_COPY}')"
+    )
+    assert insertion == (
+        "INSERT INTO measurements (capteur_id, date_debut, date_fin, valeur, "
+        "intervalle, couverture_pct) "
+        "SELECT DISTINCT ON (capteur_id, date_debut) capteur_id, date_debut, "
+        "date_fin, valeur, intervalle, couverture_pct FROM staging_measurements "
+        "ORDER BY capteur_id, date_debut "
+        "ON CONFLICT (capteur_id, date_debut) DO UPDATE SET "
+        "date_fin = EXCLUDED.date_fin, valeur = EXCLUDED.valeur, "
+        "intervalle = EXCLUDED.intervalle, couverture_pct = EXCLUDED.couverture_pct"
+    )
+    # None et "N/A" deviennent NULL ; la mesure sans horodatage est ignorée
+    assert connexion.copies == [
+        [
+            ["101", "2025-01-31T23:00:00Z", NULL_COPY, "4.5", "01:00:00", "100.0"],
+            [
+                "101",
+                "2025-02-01T00:00:00Z",
+                NULL_COPY,
+                NULL_COPY,
+                "01:00:00",
+                NULL_COPY,
+            ],
+        ]
+    ]
+
+
+def test_partitions_mensuelles_creees_une_fois(chargeur):
+    connexion = chargeur._connection
+    chargeur.load_measurements(
+        [mesure(101, "2024-12-31T23:30:00Z"), mesure(101, "2025-01-01T00:30:00+00:00")]
+    )
+
+    partitions = [i for i in connexion.instructions if "PARTITION OF" in i]
+    assert partitions == [
+        "CREATE TABLE IF NOT EXISTS measurements_2024_12 PARTITION OF measurements "
+        "FOR VALUES FROM ('2024-12-01 00:00:00+00') TO ('2025-01-01 00:00:00+00')",
+        "CREATE TABLE IF NOT EXISTS measurements_2025_01 PARTITION OF measurements "
+        "FOR VALUES FROM ('2025-01-01 00:00:00+00') TO ('2025-02-01 00:00:00+00')",
+    ]
+
+    connexion.instructions.clear()
+    chargeur.ensure_partitions({date(2025, 1, 1)})
+    assert connexion.instructions == []
+
+
+def test_horodatage_illisible_ignore(chargeur, caplog):
+    connexion = chargeur._connection
+    lignes = chargeur.load_measurements(
+        [mesure(101, "2025-01-31T23:00:00Z"), mesure(101, "hier soir")]
+    )
+
+    # Aucune partition ne l'accepterait : la ligne n'entre pas dans le COPY
+    assert lignes == 1
+    assert [ligne[1] for ligne in connexion.copies[0]] == ["2025-01-31T23:00:00Z"]
+    assert "1 mesure(s) ignorée(s)" in caplog.text
+
+
+def test_parametres_charges_avant_les_capteurs(chargeur):
+    connexion = chargeur._connection
+    capteurs = [
+        {
+            "capteur_id": 101,
+            "station_id": 1,
+            "parametre_id": 2,
+            "parametre_nom": "pm25",
+        },
+        {
+            "capteur_id": 102,
+            "station_id": 1,
+            "parametre_id": 2,
+            "parametre_nom": "pm25",
+        },
+        {"capteur_id": 103, "station_id": 1, "parametre_id": "N/A"},
+        {"capteur_id": "N/A", "station_id": 1, "parametre_id": 7},
+    ]
+
+    assert chargeur.load_sensors(capteurs) == 3
+
+    insertions = [i for i in connexion.instructions if i.startswith("INSERT INTO")]
+    assert [i.split()[2] for i in insertions] == ["parameters", "sensors"]
+    parametres, lignes_capteurs = connexion.copies
+    assert sorted(ligne[0] for ligne in parametres) == ["2", "7"]
+    assert [ligne[0] for ligne in lignes_capteurs] == ["101", "102", "103"]
+    assert lignes_capteurs[2][2] == NULL_COPY
+
+
+def test_listes_serialisees_en_json(chargeur):
+    chargeur.load_stations(
+        [{"station_id": 1, "nom": "Dakar", "types_instruments": ["Capteur bas coût"]}]
+    )
+    (ligne,) = chargeur._connection.copies[0]
+    assert ligne[14] == '["Capteur bas coût"]'
+
+
+def test_lot_vide_sans_requete(chargeur):
+    assert chargeur.load_measurements([]) == 0
+    assert chargeur.load_stations([]) == 0
+    assert chargeur._connection.instructions == []
+
+
+def test_puits_de_donnees(chargeur):
+    chargeur.write([mesure(101, "2025-01-01T00:00:00Z")])
+    chargeur.write([mesure(101, "2025-01-01T01:00:00Z")])
+    assert chargeur.rows_written == 2
+
+    chargeur.close()
+    assert chargeur._connection is None
+
+
+def test_sans_database_url(monkeypatch):
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    assert PostgresLoader.from_env() is None
+
+
+# --- Base réelle -------------------------------------------------------------
+
+TABLES = ("measurements", "sensors", "parameters", "stations")
+
+
+@pytest.fixture
+def base():
+    """URL d'une base PostgreSQL vidée des tables du chargeur."""
+    url = os.getenv("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL non défini")
+    psycopg2 = pytest.importorskip("psycopg2")
+
+    def vider():
+        connexion = psycopg2.connect(url)
+        with connexion, connexion.cursor() as curseur:
+            curseur.execute(f"DROP TABLE IF EXISTS {', '.join(TABLES)} CASCADE")
+        connexion.close()
+
+    vider()
+    yield url
+    vider()
+
+
+def requete(url, sql):
+    import psycopg2
+
+    connexion = psycopg2.connect(url)
+    try:
+        with connexion, connexion.cursor() as curseur:
+            curseur.execute(sql)
+            return curseur.fetchall()
+    finally:
+        connexion.close()
+
+
+def test_upsert_sans_doublon(base):
+    chargeur = PostgresLoader(base)
+    try:
+        chargeur.load_measurements(
+            [
+                mesure(101, "2025-01-31T23:00:00Z", 1.0),
+                mesure(101, "2025-02-01T00:00:00Z"),
+            ]
+        )
+        # Même clé deux fois dans un lot, puis une seconde exécution ; la
+        # mesure sans horodatage lisible ne fait pas échouer le COPY
+        chargeur.load_measurements(
+            [
+                mesure(101, "2025-01-31T23:00:00+00:00", 2.0),
+                mesure(101, "2025-01-31T23:00:00Z", 2.0),
+                mesure(101, "horodatage illisible", 3.0),
+            ]
+        )
+    finally:
+        chargeur.close()
+
+    assert requete(
+        base,
+        "SELECT tableoid::regclass::text, valeur FROM measurements ORDER BY date_debut",
+    ) == [("measurements_2025_01", 2.0), ("measurements_2025_02", 1.0)]
+
+
+def test_migration_d_une_table_non_partitionnee(base):
+    requete(
+        base,
+        "CREATE TABLE measurements (capteur_id integer NOT NULL, "
+        "date_debut timestamptz NOT NULL, date_fin timestamptz, "
+        "valeur double precision, intervalle text, couverture_pct double precision, "
+        "PRIMARY KEY (capteur_id, date_debut)); "
+        "INSERT INTO measurements VALUES "
+        "(101, '2025-01-05T00:00:00Z', NULL, 3.5, '01:00:00', 100), "
+        "(102, '2024-12-31T23:30:00Z', NULL, 1.0, '01:00:00', 50) "
+        "RETURNING capteur_id",
+    )
+
+    chargeur = PostgresLoader(base)
+    try:
+        chargeur.load_measurements([mesure(101, "2025-01-05T00:00:00Z", 9.0)])
+    finally:
+        chargeur.close()
+
+    assert requete(
+        base, "SELECT relkind::text FROM pg_class WHERE oid = 'measurements'::regclass"
+    ) == [("p",)]
+    # Lignes conservées, rangées dans les partitions de leur mois (UTC)
+    assert requete(
+        base,
+        "SELECT tableoid::regclass::text, capteur_id, valeur, couverture_pct "
+        "FROM measurements ORDER BY date_debut",
+    ) == [
+        ("measurements_2024_12", 102, 1.0, 50.0),
+        ("measurements_2025_01", 101, 9.0, 100.0),
+    ]
+    assert requete(
+        base,
+        "SELECT conname::text FROM pg_constraint "
+        "WHERE conrelid = 'measurements'::regclass AND contype = 'p'",
+    ) == [("measurements_pkey",)]
@@ -0,0 +1,151 @@
+"""
+Tests du limiteur de débit à seau de jetons (rate_limiter)
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import time
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import rate_limiter
+from rate_limiter import PAUSE_PAR_DEFAUT_SECONDES, TokenBucketRateLimiter
+
+
+@pytest.fixture
+def limiteur(monkeypatch, horloge):
+    """Limiteur à 60 requêtes par minute (un jeton par seconde), rafale de 3."""
+    monkeypatch.setattr(rate_limiter, "time", horloge)
+    return TokenBucketRateLimiter(requests_per_minute=60, burst=3)
+
+
+def test_debit_invalide():
+    with pytest.raises(ValueError):
+        TokenBucketRateLimiter(requests_per_minute=0)
+
+
+def test_rafale_par_defaut_un_dixieme_du_debit():
+    assert TokenBucketRateLimiter(requests_per_minute=600).capacity == 60
+    assert TokenBucketRateLimiter(requests_per_minute=5).capacity == 1
+
+
+def test_from_env(monkeypatch):
+    monkeypatch.setenv("API_RATE_LIMIT", "120")
+    assert TokenBucketRateLimiter.from_env().requests_per_minute == 120
+
+
+def test_rafale_puis_regulation(limiteur, horloge):
+    assert [limiteur.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+
+    # Seau vide : le jeton suivant arrive une seconde plus tard
+    assert limiteur.acquire() == pytest.approx(1.0)
+    assert horloge.attentes == [pytest.approx(1.0)]
+
+    stats = limiteur.stats()
+    assert stats["requetes_regulees"] == 4
+    assert stats["attente_totale_secondes"] == pytest.approx(1.0)
+    assert stats["attente_cumulee_threads_secondes"] == pytest.approx(1.0)
+
+
+def test_regeneration_plafonnee_a_la_rafale(limiteur, horloge):
+    for _ in range(3):
+        limiteur.acquire()
+    horloge.avancer(3600)
+
+    assert [limiteur.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiteur.acquire() == pytest.approx(1.0)
+
+
+def test_quota_epuise_annonce_par_les_entetes(limiteur):
+    reponse = SimpleNamespace(
+        headers={
+            "x-ratelimit-limit": "60",
+            "x-ratelimit-remaining": "0",
+            "x-ratelimit-reset": "30",
+        },
+        meta=None,
+    )
+    limiteur.update_from_response(reponse)
+
+    assert limiteur.acquire() == pytest.approx(30.0)
+
+
+def test_entetes_du_sdk_sous_forme_d_objet(limiteur):
+    entetes = SimpleNamespace(
+        x_ratelimit_limit=60, x_ratelimit_remaining=1, x_ratelimit_reset=10
+    )
+    limiteur.update_from_response(SimpleNamespace(headers=entetes, meta=None))
+
+    # Un seul jeton restant malgré la rafale de 3
+    assert limiteur.acquire() == 0.0
+    assert limiteur.acquire() == pytest.approx(1.0)
+
+
+def test_limite_nulle_ignoree(limiteur):
+    reponse = SimpleNamespace(
+        headers={"x-ratelimit-limit": 0, "x-ratelimit-remaining": 0},
+        meta=None,
+    )
+    limiteur.update_from_response(reponse)
+
+    assert limiteur.acquire() == 0.0
+
+
+def test_penalite_sans_delai_connu(limiteur):
+    limiteur.penalize()
+
+    assert limiteur.acquire() == pytest.approx(PAUSE_PAR_DEFAUT_SECONDES)
+    assert limiteur.stats()["limites_atteintes"] == 1
+
+
+def test_refus_de_quota_suspend_les_requetes(limiteur):
+    class ErreurQuota(Exception):
+        headers = {"x-ratelimit-reset": 7}
+
+    def appel():
+        raise ErreurQuota()
+
+    with pytest.raises(ErreurQuota):
+        limiteur.call(appel, is_rate_limit_error=lambda e: True)
+
+    assert limiteur.rate_limit_hits == 1
+    assert limiteur.acquire() == pytest.approx(7.0)
+
+
+def test_autre_erreur_sans_penalite(limiteur):
+    def appel():
+        raise RuntimeError("panne")
+
+    with pytest.raises(RuntimeError):
+        limiteur.call(appel, is_rate_limit_error=lambda e: False)
+
+    assert limiteur.rate_limit_hits == 0
+    assert limiteur.acquire() == 0.0
+
+
+def test_attente_reelle_comptee_une_fois_pour_les_threads_simultanes():
+    # 60 requêtes par seconde, sans rafale : 8 threads simultanés attendent
+    # chacun leur tour pendant environ 7/60 s au total
+    limiteur = TokenBucketRateLimiter(requests_per_minute=3600, burst=1)
+    depart = threading.Barrier(8)
+
+    def travailleur():
+        depart.wait()
+        limiteur.acquire()
+
+    threads = [threading.Thread(target=travailleur) for _ in range(8)]
+    debut = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duree = time.monotonic() - debut
+
+    bloque = limiteur.blocked_time()
+    assert 0 < bloque <= duree
+    # Somme des attentes par thread : plusieurs fois la durée réelle de blocage
+    assert limiteur.total_wait_seconds > 2 * bloque
+    assert limiteur.stats()["attente_totale_secondes"] == round(bloque, 3)
@@ -0,0 +1,126 @@
+"""
+Tests du stockage colonnaire des enregistrements (RecordTable, RecordRow)
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import pytest
+
+from records import RecordTable
+
+HORODATAGE = "2026-10-01T00:00:00"
+
+
+@pytest.fixture
+def table() -> RecordTable:
+    table = RecordTable(
+        ("station_id", "nom", "date_exploration"),
+        constants={"date_exploration": HORODATAGE},
+    )
+    table.extend(
+        [
+            {"station_id": 1, "nom": "Dakar"},
+            {"station_id": 2, "nom": "Thiès", "date_exploration": HORODATAGE},
+            {"station_id": 3},
+        ]
+    )
+    return table
+
+
+def test_lignes_lues_comme_des_dictionnaires(table):
+    assert len(table) == 3
+    assert [dict(ligne) for ligne in table] == [
+        {"station_id": 1, "nom": "Dakar", "date_exploration": HORODATAGE},
+        {"station_id": 2, "nom": "Thiès", "date_exploration": HORODATAGE},
+        {"station_id": 3, "nom": None, "date_exploration": HORODATAGE},
+    ]
+
+    ligne = table[0]
+    assert list(ligne) == ["station_id", "nom", "date_exploration"]
+    assert len(ligne) == 3
+    assert "nom" in ligne and "pays" not in ligne
+    assert ligne.get("pays", "N/A") == "N/A"
+    assert ligne == {"station_id": 1, "nom": "Dakar", "date_exploration": HORODATAGE}
+    with pytest.raises(KeyError):
+        ligne["pays"]
+
+
+def test_indexation(table):
+    assert table[-1]["station_id"] == 3
+    assert [ligne["station_id"] for ligne in table[1:]] == [2, 3]
+    with pytest.raises(IndexError):
+        table[3]
+    with pytest.raises(IndexError):
+        table[-4]
+
+
+def test_colonnes(table):
+    assert table.column("station_id") == [1, 2, 3]
+    assert table.column("date_exploration") == [HORODATAGE] * 3
+    with pytest.raises(KeyError):
+        table.column("pays")
+
+
+def test_constante_stockee_une_seule_fois(table):
+    assert "date_exploration" not in table._columns
+
+
+def test_valeur_differente_materialise_la_constante(table):
+    table.append({"station_id": 4, "date_exploration": "2026-10-02T00:00:00"})
+
+    assert table.column("date_exploration") == [HORODATAGE] * 3 + [
+        "2026-10-02T00:00:00"
+    ]
+    # Les lignes suivantes sans valeur valent None, comme tout champ absent
+    table.append({"station_id": 5})
+    assert table[-1]["date_exploration"] is None
+
+
+def test_ecriture_par_la_vue(table):
+    table[1]["nom"] = "Thiès Centre"
+    assert table.column("nom") == ["Dakar", "Thiès Centre", None]
+
+    # Même valeur que la constante : rien à matérialiser
+    table[0]["date_exploration"] = HORODATAGE
+    assert "date_exploration" not in table._columns
+
+    table[0]["date_exploration"] = "2026-10-02T00:00:00"
+    assert table.column("date_exploration") == [
+        "2026-10-02T00:00:00",
+        HORODATAGE,
+        HORODATAGE,
+    ]
+
+    with pytest.raises(KeyError):
+        table[0]["pays"] = "Sénégal"
+
+
+def test_chaines_identiques_partagees():
+    table = RecordTable(("parametre_nom",))
+    for suffixe in ("25", "25"):
+        table.append({"parametre_nom": "pm" + suffixe})
+
+    premiere, seconde = table.column("parametre_nom")
+    assert premiere is seconde
+
+
+def test_vidage(table):
+    table.clear()
+    assert len(table) == 0
+    assert list(table) == []
+    table.append({"station_id": 9})
+    assert dict(table[0]) == {
+        "station_id": 9,
+        "nom": None,
+        "date_exploration": HORODATAGE,
+    }
+
+
+def test_conversion_en_dataframe(table):
+    pytest.importorskip("pandas")
+
+    df = table.to_dataframe()
+    assert list(df.columns) == ["station_id", "nom", "date_exploration"]
+    assert df["station_id"].tolist() == [1, 2, 3]
+    assert (df["date_exploration"] == HORODATAGE).all()
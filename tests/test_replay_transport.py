@@ -0,0 +1,183 @@
+"""
+Tests de l'enregistrement et du rejeu des réponses OpenAQ (replay_transport)
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import os
+import json
+
+import pytest
+
+openaq = pytest.importorskip("openaq")
+
+from replay_transport import (  # noqa: E402
+    DELAI_QUOTA_INJECTE,
+    FixtureStore,
+    RecordingTransport,
+    ReplayTransport,
+    _make_response,
+    transport_from_env,
+)
+
+URL = "https://api.openaq.org/v3/locations"
+PARAMETRES = {"iso": "SN", "limit": 1000, "page": 1}
+CORPS = {"meta": {"found": 1}, "results": [{"id": 1, "name": "Dakar"}]}
+
+
+class TransportApi:
+    """Transport HTTP factice : compte les requêtes et renvoie CORPS."""
+
+    def __init__(self):
+        self.requetes = []
+        self.ferme = False
+
+    def send_request(self, method, url, params, headers):
+        self.requetes.append((method, url, params))
+        return _make_response(
+            200,
+            json.dumps(CORPS).encode("utf-8"),
+            {
+                "content-type": "application/json",
+                "x-ratelimit-remaining": 59,
+                "set-cookie": "session=secret",
+            },
+        )
+
+    def close(self):
+        self.ferme = True
+
+
+@pytest.fixture
+def stockage(tmp_path) -> FixtureStore:
+    return FixtureStore(str(tmp_path / "fixtures"))
+
+
+def test_enregistrement_puis_rejeu(stockage):
+    api = TransportApi()
+    enregistreur = RecordingTransport(api, stockage)
+    enregistreur.send_request("GET", URL, PARAMETRES, {"X-API-Key": "cle-secrete"})
+
+    (fichier,) = os.listdir(stockage.directory)
+    assert fichier.startswith("locations_") and fichier.endswith(".json")
+    with open(os.path.join(stockage.directory, fichier), encoding="utf-8") as f:
+        contenu = f.read()
+    assert "cle-secrete" not in contenu and "session=secret" not in contenu
+
+    # Rejeu strict, paramètres dans un autre ordre et autre clé API
+    rejeu = ReplayTransport(stockage)
+    reponse = rejeu.send_request(
+        "get", URL, dict(reversed(list(PARAMETRES.items()))), {"X-API-Key": "autre"}
+    )
+
+    assert reponse.status_code == 200
+    assert reponse.json() == CORPS
+    assert reponse.headers.get("x-ratelimit-remaining") == "59"
+    assert len(api.requetes) == 1
+    assert rejeu.stats() == {
+        "mode": "rejeu",
+        "reponses_rejouees": 1,
+        "fixtures_absentes": 0,
+        "erreurs_injectees": 0,
+    }
+
+
+def test_fixture_absente_en_rejeu_strict(stockage):
+    rejeu = ReplayTransport(stockage)
+    with pytest.raises(openaq.NotFoundError):
+        rejeu.send_request("GET", URL, PARAMETRES, {})
+    assert rejeu.stats()["fixtures_absentes"] == 1
+
+
+def test_repli_sur_l_api_puis_rejeu(stockage):
+    api = TransportApi()
+    rejeu = ReplayTransport(stockage, fallback=RecordingTransport(api, stockage))
+
+    for _ in range(3):
+        assert rejeu.send_request("GET", URL, PARAMETRES, {}).json() == CORPS
+
+    # Seule la première requête atteint l'API ; les suivantes sont rejouées
+    assert len(api.requetes) == 1
+    stats = rejeu.stats()
+    assert (stats["fixtures_absentes"], stats["reponses_rejouees"]) == (1, 2)
+    assert stats["repli"]["reponses_enregistrees"] == 1
+
+    rejeu.close()
+    assert api.ferme
+
+
+def test_latence_simulee(stockage):
+    RecordingTransport(TransportApi(), stockage).send_request("GET", URL, {}, {})
+    attentes = []
+    rejeu = ReplayTransport(
+        stockage, latency=0.05, jitter=0.02, seed=1, sleep=attentes.append
+    )
+
+    for _ in range(20):
+        rejeu.send_request("GET", URL, {}, {})
+
+    assert len(attentes) == 20
+    assert all(0.05 <= attente <= 0.07 for attente in attentes)
+    assert len(set(attentes)) > 1
+
+
+@pytest.mark.parametrize(
+    "statut, exception",
+    [(429, openaq.HTTPRateLimitError), (503, openaq.ServiceUnavailableError)],
+)
+def test_erreurs_injectees(stockage, statut, exception):
+    RecordingTransport(TransportApi(), stockage).send_request("GET", URL, {}, {})
+    rejeu = ReplayTransport(stockage, error_rate=1.0, error_statuses=[statut])
+
+    with pytest.raises(exception) as erreur:
+        rejeu.send_request("GET", URL, {}, {})
+
+    # Délai de réouverture relu par le limiteur de débit
+    assert erreur.value.headers == {"x_ratelimit_reset": DELAI_QUOTA_INJECTE}
+    assert rejeu.stats()["erreurs_injectees"] == 1
+    assert rejeu.stats()["reponses_rejouees"] == 0
+
+
+def test_taux_d_erreur_reproductible(stockage):
+    RecordingTransport(TransportApi(), stockage).send_request("GET", URL, {}, {})
+
+    def tirages():
+        rejeu = ReplayTransport(stockage, error_rate=0.3, seed=7)
+        resultats = []
+        for _ in range(50):
+            try:
+                rejeu.send_request("GET", URL, {}, {})
+                resultats.append(True)
+            except openaq.ServerError:
+                resultats.append(False)
+        return resultats
+
+    premier = tirages()
+    assert premier == tirages()
+    assert 0 < premier.count(False) < 50
+
+
+@pytest.mark.parametrize(
+    "variable, mode, reseau",
+    [
+        ("SAMPLE_DATA_ONLY", "rejeu", False),
+        ("USE_SAMPLE_DATA", "rejeu_avec_repli", True),
+        ("SAMPLE_DATA_RECORD", "enregistrement", True),
+    ],
+)
+def test_modes_depuis_l_environnement(monkeypatch, tmp_path, variable, mode, reseau):
+    monkeypatch.setenv(variable, "True")
+    monkeypatch.setenv("SAMPLE_DATA_DIR", str(tmp_path))
+    fabrications = []
+
+    transport = transport_from_env(lambda: fabrications.append(1) or TransportApi())
+
+    assert transport.stats()["mode"] == mode
+    # Le rejeu strict n'ouvre jamais de transport réseau
+    assert bool(fabrications) is reseau
+
+
+def test_sans_mode_le_transport_reel():
+    api = TransportApi()
+    assert transport_from_env(lambda: api) is api
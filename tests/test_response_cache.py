@@ -0,0 +1,121 @@
+"""
+Tests du cache des réponses OpenAQ : clés, expiration et repli en cas de panne
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import os
+
+import pytest
+
+import response_cache
+from response_cache import FileBackend, PayloadDict, ResponseCache
+
+
+class StockageEnPanne:
+    name = "panne"
+
+    def get(self, key):
+        raise ConnectionError("stockage injoignable")
+
+    def set(self, key, value, ttl_seconds):
+        raise ConnectionError("stockage injoignable")
+
+
+@pytest.fixture
+def stockage(tmp_path, monkeypatch, horloge):
+    monkeypatch.setattr(response_cache, "time", horloge)
+    return FileBackend(str(tmp_path / "cache"))
+
+
+def test_cle_independante_de_l_ordre_des_parametres():
+    assert ResponseCache.make_key(
+        "Locations.list", {"iso": "SN", "page": 1, "limit": 1000}
+    ) == ResponseCache.make_key(
+        "Locations.list", {"limit": 1000, "page": 1, "iso": "SN"}
+    )
+
+
+def test_cle_distingue_point_d_acces_et_valeurs():
+    cles = {
+        ResponseCache.make_key("Locations.list", {"iso": "SN", "page": 1}),
+        ResponseCache.make_key("Locations.list", {"iso": "SN", "page": 2}),
+        ResponseCache.make_key("Locations.list", {"iso": "ML", "page": 1}),
+        ResponseCache.make_key("Locations.sensors", {"iso": "SN", "page": 1}),
+    }
+    assert len(cles) == 4
+
+
+def test_cle_tuple_et_liste_equivalents():
+    # Les bbox du SDK sont des tuples, celles relues du cache des listes
+    assert ResponseCache.make_key(
+        "Locations.list", {"bbox": (-17.6, 14.6, -17.1, 14.9)}
+    ) == ResponseCache.make_key("Locations.list", {"bbox": [-17.6, 14.6, -17.1, 14.9]})
+
+
+def test_expiration_des_entrees_fichier(stockage, horloge):
+    stockage.set("cle", "valeur", ttl_seconds=10)
+    horloge.avancer(9)
+    assert stockage.get("cle") == "valeur"
+
+    horloge.avancer(2)
+    assert stockage.get("cle") is None
+    # L'entrée périmée est supprimée du disque
+    assert not os.listdir(stockage.directory)
+
+
+def test_entree_absente_ou_illisible(stockage):
+    assert stockage.get("inconnue") is None
+
+    with open(stockage._path("corrompue"), "w", encoding="utf-8") as f:
+        f.write("{pas du json")
+    assert stockage.get("corrompue") is None
+
+
+def test_lecture_reconstruit_les_attributs(stockage):
+    cache = ResponseCache(stockage, ttl_seconds=60)
+    reponse = {
+        "meta": {"found": 1},
+        "results": [{"id": 7, "name": "Dakar", "country": {"code": "SN"}}],
+    }
+
+    assert cache.get("Locations.list", {"iso": "SN"}) is None
+    cache.set("Locations.list", {"iso": "SN"}, reponse)
+    relue = cache.get("Locations.list", {"iso": "SN"})
+
+    assert isinstance(relue, PayloadDict)
+    assert relue.results[0].country.code == "SN"
+    assert not hasattr(relue.results[0], "inconnu")
+    assert cache.stats() == {
+        "stockage": "fichier",
+        "entrees_trouvees": 1,
+        "entrees_absentes": 1,
+        "erreurs": 0,
+        "taux_succes": 0.5,
+    }
+
+
+def test_ttl_du_cache_transmis_au_stockage(stockage, horloge):
+    cache = ResponseCache(stockage, ttl_seconds=3600)
+    cache.set("Locations.sensors", {"args": [1]}, {"results": []})
+
+    horloge.avancer(3599)
+    assert cache.get("Locations.sensors", {"args": [1]}) == {"results": []}
+    horloge.avancer(2)
+    assert cache.get("Locations.sensors", {"args": [1]}) is None
+
+
+def test_panne_du_stockage_traitee_comme_absence():
+    cache = ResponseCache(StockageEnPanne())
+
+    assert cache.get("Locations.list", {"iso": "SN"}) is None
+    cache.set("Locations.list", {"iso": "SN"}, {"results": []})
+
+    stats = cache.stats()
+    assert stats["erreurs"] == 2
+    assert stats["entrees_absentes"] == 1
+
+
+def test_cache_desactive_par_defaut():
+    assert ResponseCache.from_env() is None
@@ -0,0 +1,116 @@
+"""
+Tests du client REST léger (rest_transport)
+
+Le transport HTTP est remplacé par un transport factice qui enregistre les
+requêtes et renvoie des réponses construites comme celles du SDK.
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import io
+import json
+import http.client
+
+import pytest
+
+from rest_transport import RestClient, to_payload_dict
+
+
+class TransportFactice:
+    def __init__(self, document, en_tetes=b""):
+        self.document = document
+        self.en_tetes = en_tetes
+        self.requetes = []
+
+    def send_request(self, method, url, params, headers):
+        from openaq.core.transport import Response
+
+        self.requetes.append((method, url, params, headers))
+        return Response(
+            200,
+            json.dumps(self.document).encode("utf-8"),
+            http.client.parse_headers(io.BytesIO(self.en_tetes + b"\r\n")),
+        )
+
+
+LOCATION = {
+    "id": 1,
+    "name": "Dakar Plateau",
+    "isMobile": False,
+    "country": {"id": 130, "code": "SN", "name": "Senegal"},
+    "datetimeFirst": {"utc": "2024-03-01T00:00:00Z", "local": "2024-03-01T00:00:00"},
+    "sensors": [{"id": 101, "parameter": {"id": 2, "displayName": "PM2.5"}}],
+    "bounds": [-17.43, 14.67, -17.43, 14.67],
+}
+
+
+def test_cles_camel_case_converties_en_snake_case():
+    location = to_payload_dict(LOCATION)
+
+    assert location.is_mobile is False
+    assert location.country.name == "Senegal"
+    assert location.datetime_first.utc == "2024-03-01T00:00:00Z"
+    assert location.sensors[0].parameter.display_name == "PM2.5"
+    assert location.bounds == [-17.43, 14.67, -17.43, 14.67]
+    assert sorted(location) == sorted(
+        ["id", "name", "is_mobile", "country", "datetime_first", "sensors", "bounds"]
+    )
+
+
+@pytest.mark.parametrize(
+    "cle, attendu",
+    [
+        ("datetimeLast", "datetime_last"),
+        ("percentCoverage", "percent_coverage"),
+        ("pm25", "pm25"),
+        ("already_snake", "already_snake"),
+    ],
+)
+def test_conversion_d_une_cle(cle, attendu):
+    assert list(to_payload_dict({cle: 1})) == [attendu]
+
+
+def test_scalaires_et_listes_de_scalaires_inchanges():
+    assert to_payload_dict([1, "a", None, [2.5]]) == [1, "a", None, [2.5]]
+    assert to_payload_dict("texte") == "texte"
+
+
+def test_liste_des_stations():
+    pytest.importorskip("openaq")
+    transport = TransportFactice(
+        {"meta": {"found": 1, "page": 1}, "results": [LOCATION]},
+        b"x-ratelimit-remaining: 59\r\nx-ratelimit-reset: 42\r\n",
+    )
+    client = RestClient("cle", "https://api.openaq.org/v3/", transport)
+
+    reponse = client.locations.list(iso="SN", limit=1000)
+
+    ((methode, url, parametres, en_tetes),) = transport.requetes
+    assert (methode, url) == ("GET", "https://api.openaq.org/v3/locations")
+    assert parametres["iso"] == "SN" and parametres["limit"] == 1000
+    assert "bbox" not in parametres
+    assert en_tetes["X-API-Key"] == "cle"
+    assert reponse.headers == {"x_ratelimit_remaining": 59, "x_ratelimit_reset": 42}
+    assert reponse.meta.found == 1
+    assert reponse.results[0].country.code == "SN"
+
+
+def test_mesures_et_agregats():
+    pytest.importorskip("openaq")
+    transport = TransportFactice({"meta": {}, "results": []})
+    client = RestClient("cle", "https://api.openaq.org/v3", transport)
+
+    client.measurements.list(101, data="hours", rollup="daily", page=2)
+    client.locations.sensors(1)
+
+    assert [url for _, url, _, _ in transport.requetes] == [
+        "https://api.openaq.org/v3/sensors/101/hours/daily",
+        "https://api.openaq.org/v3/locations/1/sensors",
+    ]
+    assert transport.requetes[0][2]["page"] == 2
+
+
+def test_cle_api_obligatoire():
+    with pytest.raises(ValueError):
+        RestClient("", "https://api.openaq.org/v3/", transport=None)
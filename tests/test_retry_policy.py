@@ -0,0 +1,131 @@
+"""
+Tests de la politique de réessai à backoff exponentiel et full jitter (retry_policy)
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import random
+from types import SimpleNamespace
+
+import pytest
+
+import retry_policy
+from retry_policy import RetryPolicy
+
+
+class ErreurTransitoire(Exception):
+    pass
+
+
+@pytest.fixture
+def tirage_maximal(monkeypatch, horloge):
+    """Horloge simulée et tirage aléatoire toujours égal au plafond."""
+    monkeypatch.setattr(retry_policy, "time", horloge)
+    monkeypatch.setattr(
+        retry_policy, "random", SimpleNamespace(uniform=lambda bas, haut: haut)
+    )
+    return horloge
+
+
+def echoue(fois: int, resultat="ok"):
+    """Fonction qui lève ErreurTransitoire fois fois avant de réussir."""
+    appels = []
+
+    def appel():
+        appels.append(1)
+        if len(appels) <= fois:
+            raise ErreurTransitoire()
+        return resultat
+
+    appel.appels = appels
+    return appel
+
+
+def transitoire(erreur):
+    return isinstance(erreur, ErreurTransitoire)
+
+
+def test_plafond_exponentiel(tirage_maximal):
+    politique = RetryPolicy(base_delay=1.0, max_delay=5.0)
+    assert [politique.compute_delay(n) for n in range(5)] == [1, 2, 4, 5, 5]
+
+
+def test_full_jitter_entre_zero_et_le_plafond():
+    politique = RetryPolicy(base_delay=0.5, max_delay=3.0)
+    random.seed(1)
+    for tentative in range(6):
+        plafond = min(3.0, 0.5 * 2**tentative)
+        delais = [politique.compute_delay(tentative) for _ in range(200)]
+        assert all(0 <= delai <= plafond for delai in delais)
+        # Tirage uniforme : les délais ne sont pas tous collés au plafond
+        assert min(delais) < plafond / 4
+
+
+def test_relance_jusqu_au_succes(tirage_maximal):
+    politique = RetryPolicy(max_retries=4, base_delay=1.0, max_delay=30.0)
+    appel = echoue(2)
+
+    assert politique.call(appel, is_retryable=transitoire, operation="op") == "ok"
+    assert len(appel.appels) == 3
+    assert tirage_maximal.attentes == [1.0, 2.0]
+    assert politique.stats() == {
+        "relances_totales": 2,
+        "relances_par_operation": {"op": 2},
+        "appels_abandonnes": 0,
+    }
+
+
+def test_erreur_non_transitoire_sans_relance(tirage_maximal):
+    politique = RetryPolicy()
+    appel = echoue(1)
+
+    with pytest.raises(ErreurTransitoire):
+        politique.call(appel, is_retryable=lambda e: False)
+    assert len(appel.appels) == 1
+    assert tirage_maximal.attentes == []
+
+
+def test_sans_predicat_aucune_relance(tirage_maximal):
+    appel = echoue(1)
+    with pytest.raises(ErreurTransitoire):
+        RetryPolicy().call(appel)
+    assert len(appel.appels) == 1
+
+
+def test_abandon_apres_max_retries(tirage_maximal):
+    politique = RetryPolicy(max_retries=2, base_delay=1.0)
+    appel = echoue(10)
+
+    with pytest.raises(ErreurTransitoire):
+        politique.call(appel, is_retryable=transitoire, operation="op")
+    assert len(appel.appels) == 3
+    assert politique.stats()["appels_abandonnes"] == 1
+    assert politique.stats()["relances_totales"] == 2
+
+
+def test_abandon_si_la_relance_depasserait_l_echeance(tirage_maximal):
+    # Délais 1 s puis 2 s : la seconde relance finirait à 3 s > 2,5 s
+    politique = RetryPolicy(max_retries=10, base_delay=1.0, deadline=2.5)
+    appel = echoue(10)
+
+    with pytest.raises(ErreurTransitoire):
+        politique.call(appel, is_retryable=transitoire)
+    assert len(appel.appels) == 2
+    assert tirage_maximal.attentes == [1.0]
+    assert politique.abandoned_calls == 1
+
+
+def test_from_env(monkeypatch):
+    monkeypatch.setenv("API_MAX_RETRIES", "7")
+    monkeypatch.setenv("API_RETRY_BASE_DELAY", "0.25")
+    monkeypatch.setenv("API_RETRY_MAX_DELAY", "9")
+    monkeypatch.setenv("API_CALL_DEADLINE", "60")
+
+    politique = RetryPolicy.from_env()
+    assert (
+        politique.max_retries,
+        politique.base_delay,
+        politique.max_delay,
+        politique.deadline,
+    ) == (7, 0.25, 9.0, 60.0)
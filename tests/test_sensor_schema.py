@@ -0,0 +1,103 @@
+"""
+Tests de l'extraction déclarative des capteurs et de l'empreinte de structure
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import json
+
+import pytest
+
+from rest_transport import to_payload_dict
+from sensor_schema import SensorExtractor, compare_fingerprint, structure_paths
+
+
+def capteur(identifiant=1, **parametre):
+    parametre = parametre or {
+        "id": 2,
+        "name": "pm25",
+        "units": "µg/m³",
+        "displayName": "PM2.5",
+    }
+    return to_payload_dict(
+        {"id": identifiant, "name": f"capteur {identifiant}", "parameter": parametre}
+    )
+
+
+def test_extraction_par_colonnes():
+    extracteur = SensorExtractor()
+    colonnes = extracteur.extract_page([capteur(1), capteur(2)])
+
+    assert extracteur.fields == list(colonnes)
+    assert colonnes["capteur_id"] == [1, 2]
+    assert colonnes["parametre_nom"] == ["pm25", "pm25"]
+    assert colonnes["parametre_nom_affichage"] == ["PM2.5", "PM2.5"]
+    assert colonnes["unite_mesure"] == ["µg/m³", "µg/m³"]
+
+
+def test_chemin_alternatif_et_valeurs_par_defaut():
+    extracteur = SensorExtractor()
+    colonnes = extracteur.extract_page([capteur(1, id=1, name="pm10")])
+
+    # Pas de display_name : repli sur parameter.name ; pas d'unité : "N/A"
+    assert colonnes["parametre_nom_affichage"] == ["pm10"]
+    assert colonnes["unite_mesure"] == ["N/A"]
+    assert extracteur.stats()["valeurs_par_defaut"]["unite_mesure"] == 1
+    assert extracteur.stats()["valeurs_par_defaut"]["parametre_nom_affichage"] == 0
+
+
+def test_version_inconnue():
+    with pytest.raises(ValueError):
+        SensorExtractor(version=999)
+
+
+def test_chemins_de_structure_independants_de_la_representation():
+    brut = {"id": 1, "parameter": {"name": "pm25", "units": None}}
+    assert sorted(structure_paths(brut)) == sorted(
+        structure_paths(to_payload_dict(brut))
+    )
+    assert sorted(structure_paths(brut)) == ["id", "parameter", "parameter.name"]
+
+
+def test_empreinte_sans_capteur():
+    assert SensorExtractor().fingerprint() is None
+
+
+def test_champs_sans_chemin():
+    extracteur = SensorExtractor()
+    extracteur.extract_page([capteur(1, id=1, name="pm10")])
+
+    assert extracteur.fingerprint()["champs_sans_chemin"] == ["unite_mesure"]
+
+
+def test_comparaison_d_empreintes(tmp_path):
+    chemin = str(tmp_path / "state" / "empreinte_capteurs.json")
+
+    reference = SensorExtractor()
+    reference.extract_page([capteur(1)])
+    empreinte = reference.fingerprint()
+
+    resultat = compare_fingerprint(empreinte, chemin)
+    assert resultat["statut"] == "nouvelle référence"
+    with open(chemin, encoding="utf-8") as f:
+        assert json.load(f) == empreinte
+
+    assert compare_fingerprint(empreinte, chemin)["statut"] == "inchangée"
+
+    # L'API ne renvoie plus les unités mais ajoute un champ
+    modifie = SensorExtractor()
+    modifie.extract_page(
+        [capteur(1, id=2, name="pm25", displayName="PM2.5", isCore=True)]
+    )
+    nouvelle = modifie.fingerprint()
+
+    resultat = compare_fingerprint(nouvelle, chemin)
+    assert resultat["statut"] == "modifiée"
+    assert resultat["empreinte_precedente"] == empreinte["empreinte"]
+    assert resultat["chemins_ajoutes"] == ["parameter.is_core"]
+    assert resultat["chemins_retires"] == ["parameter.units"]
+    assert resultat["champs_sans_chemin"] == ["unite_mesure"]
+
+    # La nouvelle structure devient la référence
+    assert compare_fingerprint(nouvelle, chemin)["statut"] == "inchangée"
@@ -0,0 +1,130 @@
+"""
+Tests de l'export JSON en flux et de sa compression (streaming_export)
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import io
+import sys
+import gzip
+import json
+
+import pytest
+
+from records import RecordTable
+from streaming_export import (
+    JsonLinesSink,
+    compressed_filename,
+    compression_from_env,
+    open_text_output,
+    resolve_compression,
+    write_json_document,
+)
+
+COMPRESSIONS = [None, "gzip", "zstd"]
+
+
+def lire(fichier, compression):
+    """Contenu texte d'un fichier écrit par open_text_output."""
+    if compression == "gzip":
+        with gzip.open(fichier, "rt", encoding="utf-8") as f:
+            return f.read()
+    if compression == "zstd":
+        zstandard = pytest.importorskip("zstandard")
+        with open(fichier, "rb") as brut:
+            lecteur = zstandard.ZstdDecompressor().stream_reader(brut)
+            return io.TextIOWrapper(lecteur, encoding="utf-8").read()
+    with open(fichier, encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("compression", COMPRESSIONS)
+def test_document_relu_a_l_identique(tmp_path, compression):
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+    stations = RecordTable(("station_id", "nom"))
+    stations.extend([{"station_id": 1, "nom": "Dakar"}, {"station_id": 2}])
+    fichier = compressed_filename(str(tmp_path / "export.json"), compression)
+
+    with open_text_output(fichier, compression) as flux:
+        comptes = write_json_document(
+            flux,
+            {"metadata": {"pays": "Sénégal"}, "resume": {"stations": 2}},
+            {
+                "stations": iter(stations),
+                "capteurs": (c for c in [{"capteur_id": 101}]),
+                "mesures": [],
+            },
+        )
+
+    assert comptes == {"stations": 2, "capteurs": 1, "mesures": 0}
+    assert fichier.endswith({None: ".json", "gzip": ".gz", "zstd": ".zst"}[compression])
+    assert json.loads(lire(fichier, compression)) == {
+        "metadata": {"pays": "Sénégal"},
+        "resume": {"stations": 2},
+        "stations": [{"station_id": 1, "nom": "Dakar"}, {"station_id": 2, "nom": None}],
+        "capteurs": [{"capteur_id": 101}],
+        "mesures": [],
+    }
+
+
+@pytest.mark.parametrize(
+    "header, sections",
+    [({}, {"stations": [{"station_id": 1}]}), ({"version": 2}, {}), ({}, {})],
+)
+def test_document_valide_sans_en_tete_ou_sans_section(header, sections):
+    flux = io.StringIO()
+    write_json_document(flux, header, sections)
+    assert json.loads(flux.getvalue()) == {**header, **sections}
+
+
+def test_un_enregistrement_par_ligne():
+    flux = io.StringIO()
+    write_json_document(flux, {}, {"stations": [{"id": 1}, {"id": 2}]})
+    assert flux.getvalue().splitlines() == [
+        "{",
+        '"stations": [',
+        '{"id": 1},',
+        '{"id": 2}',
+        "]",
+        "}",
+    ]
+
+
+@pytest.mark.parametrize("compression", COMPRESSIONS)
+def test_puits_json_lines(tmp_path, compression):
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+    puits = JsonLinesSink(str(tmp_path / "mesures.jsonl"), compression)
+    puits.write([{"capteur_id": 101, "valeur": 4.5}])
+    puits.write([{"capteur_id": 102, "valeur": None}])
+    puits.close()
+
+    assert puits.rows_written == 2
+    lignes = lire(puits.filename, compression).splitlines()
+    assert [json.loads(ligne) for ligne in lignes] == [
+        {"capteur_id": 101, "valeur": 4.5},
+        {"capteur_id": 102, "valeur": None},
+    ]
+
+
+def test_puits_ferme_sans_ecriture(tmp_path):
+    puits = JsonLinesSink(str(tmp_path / "mesures.jsonl"))
+    puits.close()
+    assert not (tmp_path / "mesures.jsonl").exists()
+
+
+def test_repli_sur_gzip_sans_zstandard(monkeypatch):
+    monkeypatch.setitem(sys.modules, "zstandard", None)
+    assert resolve_compression("zstd") == "gzip"
+    assert resolve_compression(None) is None
+
+
+@pytest.mark.parametrize(
+    "valeur, attendu",
+    [("gzip", "gzip"), (" ZSTD ", "zstd"), ("none", None), ("", None), ("lz4", None)],
+)
+def test_compression_depuis_l_environnement(monkeypatch, valeur, attendu):
+    monkeypatch.setenv("EXPORT_COMPRESSION", valeur)
+    assert compression_from_env() == attendu
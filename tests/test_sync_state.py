@@ -0,0 +1,103 @@
+"""
+Tests des watermarks de synchronisation incrémentale (sync_state)
+
+Auteur: Équipe SenegalAirWatch
+Date: Octobre 2026
+"""
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from sync_state import WatermarkStore, parse_timestamp
+
+
+@pytest.fixture
+def etat(tmp_path) -> WatermarkStore:
+    return WatermarkStore(str(tmp_path / "state" / "watermarks_hours.json"))
+
+
+@pytest.mark.parametrize(
+    "valeur",
+    ["2025-01-01T12:00:00Z", "2025-01-01T12:00:00+00:00", "2025-01-01T13:00:00+01:00"],
+)
+def test_formats_utc_equivalents(valeur):
+    assert parse_timestamp(valeur) == datetime(2025, 1, 1, 12, tzinfo=timezone.utc)
+
+
+def test_date_sans_fuseau_consideree_utc():
+    assert parse_timestamp("2025-01-01T12:00:00").tzinfo == timezone.utc
+
+
+@pytest.mark.parametrize("valeur", [None, "", "hier", "2025-13-01T00:00:00Z"])
+def test_horodatage_absent_ou_invalide(valeur):
+    assert parse_timestamp(valeur) is None
+
+
+def test_watermark_ne_fait_qu_avancer(etat):
+    assert etat.sensor_watermark(101) is None
+
+    etat.advance_sensor(101, "2025-01-01T10:00:00Z")
+    etat.advance_sensor(101, "2025-01-01T09:00:00Z")
+    assert etat.sensor_watermark(101) == "2025-01-01T10:00:00Z"
+
+    # Même instant dans un autre format : pas d'avancée
+    etat.advance_sensor(101, "2025-01-01T10:00:00+00:00")
+    assert etat.sensor_watermark(101) == "2025-01-01T10:00:00Z"
+
+    etat.advance_sensor(101, "2025-01-01T11:00:00+00:00")
+    assert etat.sensor_watermark(101) == "2025-01-01T11:00:00+00:00"
+
+
+def test_horodatage_invalide_ignore(etat):
+    etat.advance_sensor(101, "2025-01-01T10:00:00Z")
+    etat.advance_sensor(101, None)
+    etat.advance_sensor(101, "invalide")
+    assert etat.sensor_watermark(101) == "2025-01-01T10:00:00Z"
+
+
+def test_station_inchangee(etat):
+    station = {"station_id": 7, "derniere_mesure": "2025-01-01T10:00:00Z"}
+    assert not etat.is_station_unchanged(station)
+
+    etat.mark_station(7, "2025-01-01T10:00:00Z")
+    assert etat.is_station_unchanged(station)
+    assert etat.is_station_unchanged(
+        {"station_id": 7, "derniere_mesure": "2025-01-01T09:00:00Z"}
+    )
+    assert not etat.is_station_unchanged(
+        {"station_id": 7, "derniere_mesure": "2025-01-01T11:00:00Z"}
+    )
+    assert not etat.is_station_unchanged({"station_id": 7, "derniere_mesure": None})
+
+
+def test_station_sans_derniere_mesure_non_marquee(etat):
+    etat.mark_station(7, None)
+    assert etat.station_last_seen(7) is None
+
+
+def test_sauvegarde_et_rechargement(etat):
+    etat.advance_sensor(101, "2025-01-01T10:00:00Z")
+    etat.mark_station(1, "2025-01-01T10:00:00Z")
+    etat.save()
+
+    with open(etat.path, encoding="utf-8") as f:
+        assert json.load(f) == {
+            "capteurs": {"101": "2025-01-01T10:00:00Z"},
+            "stations": {"1": "2025-01-01T10:00:00Z"},
+        }
+
+    relu = WatermarkStore(etat.path)
+    assert relu.sensor_watermark("101") == "2025-01-01T10:00:00Z"
+    assert relu.station_last_seen(1) == "2025-01-01T10:00:00Z"
+
+
+def test_fichier_par_granularite(monkeypatch, tmp_path):
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    assert WatermarkStore.from_env("days").path == str(
+        tmp_path / "state" / "watermarks_days.json"
+    )
+
+    monkeypatch.setenv("WATERMARK_FILE", str(tmp_path / "etat.json"))
+    assert WatermarkStore.from_env("days").path == str(tmp_path / "etat.json")